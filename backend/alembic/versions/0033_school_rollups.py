@@ -0,0 +1,36 @@
+"""add school rollups and unread notification index
+
+Revision ID: 0033_school_rollups
+Revises: 0032_cache_versions
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0033_school_rollups'
+down_revision = '0032_cache_versions'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('school_rollups',
+    sa.Column('school_id', sa.Uuid(), nullable=False),
+    sa.Column('student_count', sa.Integer(), nullable=False),
+    sa.Column('staff_count', sa.Integer(), nullable=False),
+    sa.Column('total_due_amount', sa.BigInteger(), nullable=False),
+    sa.Column('total_paid_amount', sa.BigInteger(), nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['school_id'], ['schools.id'], ),
+    sa.PrimaryKeyConstraint('school_id')
+    )
+    op.create_index('ix_notifications_user_school_unread', 'notifications', ['user_id', 'school_id', 'is_read'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_notifications_user_school_unread', table_name='notifications')
+    op.drop_table('school_rollups')
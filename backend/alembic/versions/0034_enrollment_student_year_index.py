@@ -0,0 +1,24 @@
+"""add composite enrollment index for per-year student lookups
+
+Revision ID: 0034_enrollment_student_year
+Revises: 0033_school_rollups
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0034_enrollment_student_year'
+down_revision = '0033_school_rollups'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_enrollments_student_year', 'enrollments', ['student_id', 'academic_year_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_enrollments_student_year', table_name='enrollments')
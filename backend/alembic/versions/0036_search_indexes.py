@@ -0,0 +1,33 @@
+"""add trigram/full-text search indexes (FTS5 tables on SQLite)
+
+Revision ID: 0036_search_indexes
+Revises: 0035_jobs
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+
+from app.core.search import SEARCH_INDEXES, drop_search_ddl, search_ddl
+
+
+# revision identifiers, used by Alembic.
+revision = '0036_search_indexes'
+down_revision = '0035_jobs'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    for index in SEARCH_INDEXES.values():
+        for statement in search_ddl(dialect, index):
+            op.execute(statement)
+        if dialect == "sqlite":
+            op.execute(f"INSERT INTO {index.fts_table}({index.fts_table}) VALUES ('rebuild')")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    for index in SEARCH_INDEXES.values():
+        for statement in drop_search_ddl(dialect, index):
+            op.execute(statement)
@@ -0,0 +1,30 @@
+"""add composite indexes backing keyset pagination
+
+Revision ID: 0037_keyset_indexes
+Revises: 0036_search_indexes
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0037_keyset_indexes'
+down_revision = '0036_search_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_students_school_first_name_id', 'students', ['school_id', 'first_name', 'id'], unique=False)
+    op.create_index('ix_staff_school_full_name_id', 'staff', ['school_id', 'full_name', 'id'], unique=False)
+    op.create_index('ix_notifications_user_school_created', 'notifications', ['user_id', 'school_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_audit_logs_school_created', 'audit_logs', ['school_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_audit_logs_school_created', table_name='audit_logs')
+    op.drop_index('ix_notifications_user_school_created', table_name='notifications')
+    op.drop_index('ix_staff_school_full_name_id', table_name='staff')
+    op.drop_index('ix_students_school_first_name_id', table_name='students')
@@ -0,0 +1,31 @@
+"""add per-school admission number sequences
+
+Revision ID: 0038_admission_sequences
+Revises: 0037_keyset_indexes
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0038_admission_sequences'
+down_revision = '0037_keyset_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('admission_sequences',
+    sa.Column('school_id', sa.Uuid(), nullable=False),
+    sa.Column('prefix', sa.String(length=32), nullable=False),
+    sa.Column('next_value', sa.BigInteger(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['school_id'], ['schools.id'], ),
+    sa.PrimaryKeyConstraint('school_id', 'prefix')
+    )
+
+
+def downgrade():
+    op.drop_table('admission_sequences')
@@ -0,0 +1,41 @@
+"""one attendance row per student or staff member per day
+
+Revision ID: 0039_attendance_unique_days
+Revises: 0038_admission_sequences
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0039_attendance_unique_days'
+down_revision = '0038_admission_sequences'
+branch_labels = None
+depends_on = None
+
+
+def _dedupe(table, owner):
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(
+            f"DELETE FROM {table} a USING {table} b WHERE a.{owner} = b.{owner} "
+            f"AND a.attendance_date = b.attendance_date AND (a.created_at, a.id::text) < (b.created_at, b.id::text)"
+        )
+    else:
+        op.execute(
+            f"DELETE FROM {table} WHERE rowid NOT IN "
+            f"(SELECT MAX(rowid) FROM {table} GROUP BY {owner}, attendance_date)"
+        )
+
+
+def upgrade():
+    _dedupe('student_attendance', 'student_id')
+    _dedupe('staff_attendance', 'staff_id')
+    op.create_index('uq_student_attendance_student_date', 'student_attendance', ['student_id', 'attendance_date'], unique=True)
+    op.create_index('uq_staff_attendance_staff_date', 'staff_attendance', ['staff_id', 'attendance_date'], unique=True)
+
+
+def downgrade():
+    op.drop_index('uq_staff_attendance_staff_date', table_name='staff_attendance')
+    op.drop_index('uq_student_attendance_student_date', table_name='student_attendance')
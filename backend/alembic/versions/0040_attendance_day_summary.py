@@ -0,0 +1,66 @@
+"""attendance day and school columns with a monthly summary table
+
+Revision ID: 0040_attendance_day_summary
+Revises: 0039_attendance_unique_days
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0040_attendance_day_summary'
+down_revision = '0039_attendance_unique_days'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    postgres = op.get_bind().dialect.name == 'postgresql'
+    op.add_column('student_attendance', sa.Column('attendance_day', sa.Date(), nullable=True))
+    op.add_column('student_attendance', sa.Column('school_id', sa.Uuid(), nullable=True))
+    day = "(attendance_date AT TIME ZONE 'UTC')::date" if postgres else "date(attendance_date)"
+    op.execute(f"UPDATE student_attendance SET attendance_day = {day}")
+    op.execute(
+        "UPDATE student_attendance SET school_id = "
+        "(SELECT students.school_id FROM students WHERE students.id = student_attendance.student_id)"
+    )
+    with op.batch_alter_table('student_attendance') as batch_op:
+        batch_op.alter_column('attendance_day', existing_type=sa.Date(), nullable=False)
+        batch_op.alter_column('school_id', existing_type=sa.Uuid(), nullable=False)
+        batch_op.create_foreign_key('fk_student_attendance_school_id', 'schools', ['school_id'], ['id'])
+    op.create_index(
+        'ix_student_attendance_school_day_status', 'student_attendance', ['school_id', 'attendance_day', 'status']
+    )
+
+    op.create_table(
+        'student_attendance_monthly',
+        sa.Column('student_id', sa.Uuid(), nullable=False),
+        sa.Column('month', sa.Date(), nullable=False),
+        sa.Column('status', sa.String(length=32), nullable=False),
+        sa.Column('school_id', sa.Uuid(), nullable=False),
+        sa.Column('days', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['school_id'], ['schools.id']),
+        sa.ForeignKeyConstraint(['student_id'], ['students.id']),
+        sa.PrimaryKeyConstraint('student_id', 'month', 'status'),
+    )
+    op.create_index(
+        'ix_student_attendance_monthly_school_month', 'student_attendance_monthly', ['school_id', 'month']
+    )
+    month = "date_trunc('month', attendance_day)::date" if postgres else "date(attendance_day, 'start of month')"
+    op.execute(
+        "INSERT INTO student_attendance_monthly (student_id, month, status, school_id, days) "
+        f"SELECT student_id, {month}, status, school_id, COUNT(*) FROM student_attendance "
+        f"GROUP BY student_id, {month}, status, school_id"
+    )
+
+
+def downgrade():
+    op.drop_index('ix_student_attendance_monthly_school_month', table_name='student_attendance_monthly')
+    op.drop_table('student_attendance_monthly')
+    op.drop_index('ix_student_attendance_school_day_status', table_name='student_attendance')
+    with op.batch_alter_table('student_attendance') as batch_op:
+        batch_op.drop_constraint('fk_student_attendance_school_id', type_='foreignkey')
+        batch_op.drop_column('school_id')
+        batch_op.drop_column('attendance_day')
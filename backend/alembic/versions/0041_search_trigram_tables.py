@@ -0,0 +1,36 @@
+"""substring search tables (FTS5 trigram on SQLite)
+
+Revision ID: 0041_search_trigram_tables
+Revises: 0040_attendance_day_summary
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+
+from app.core.search import SEARCH_INDEXES, search_ddl
+
+
+# revision identifiers, used by Alembic.
+revision = '0041_search_trigram_tables'
+down_revision = '0040_attendance_day_summary'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Postgres already serves substrings from the pg_trgm index added in 0036.
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for index in SEARCH_INDEXES.values():
+        for statement in search_ddl("sqlite", index):
+            op.execute(statement)
+        op.execute(f"INSERT INTO {index.trigram_table}({index.trigram_table}) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for index in SEARCH_INDEXES.values():
+        for suffix in ("ai", "ad", "au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {index.trigram_table}_{suffix}")
+        op.execute(f"DROP TABLE IF EXISTS {index.trigram_table}")
@@ -0,0 +1,29 @@
+"""dedupe key on communication logs so automated alerts are sent once
+
+Revision ID: 0042_communication_log_dedupe_key
+Revises: 0041_search_trigram_tables
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0042_communication_log_dedupe_key'
+down_revision = '0041_search_trigram_tables'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('communication_logs', sa.Column('dedupe_key', sa.String(length=320), nullable=True))
+    op.create_index(
+        'uq_communication_logs_school_dedupe_key', 'communication_logs', ['school_id', 'dedupe_key'], unique=True
+    )
+
+
+def downgrade():
+    op.drop_index('uq_communication_logs_school_dedupe_key', table_name='communication_logs')
+    with op.batch_alter_table('communication_logs') as batch_op:
+        batch_op.drop_column('dedupe_key')
@@ -1,12 +1,14 @@
 import uuid
 from collections.abc import Callable
+from dataclasses import dataclass, field
 from typing import Optional
 
 from fastapi import Depends, Header, Request
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy import select
+from sqlalchemy import and_, select
 from sqlalchemy.orm import Session
 
+from app.core.permission_cache import SchoolGrant, get_or_load
 from app.core.problems import forbidden, unauthorized
 from app.core.security import decode_access_token
 from app.db.session import get_db
@@ -37,6 +39,7 @@ def get_current_user(request: Request, db: Session = Depends(get_db), token: str
     elif tenant_id is not None:
         if user.tenant_id != tenant_id:
             raise unauthorized("Invalid tenant context")
+    request.state.user_id = user.id
     return user
 
 
@@ -73,17 +76,23 @@ def require_saas_admin_host() -> Callable:
     return dependency
 
 
+def _allowed(permission_sets: list[Optional[dict]]) -> frozenset[str]:
+    allow: set[str] = set()
+    for p in permission_sets:
+        allow.update((p or {}).get("allow", []))
+    return frozenset(allow)
+
+
 def is_super_admin(db: Session, user_id: uuid.UUID) -> bool:
-    perms = db.execute(
-        select(Role.permissions)
-        .join(Membership, Membership.role_id == Role.id)
-        .where(Membership.user_id == user_id, Membership.is_active.is_(True))
-    ).scalars().all()
-    for p in perms:
-        allow = set((p or {}).get("allow", []))
-        if "super:*" in allow:
-            return True
-    return False
+    def load() -> bool:
+        perms = db.execute(
+            select(Role.permissions)
+            .join(Membership, Membership.role_id == Role.id)
+            .where(Membership.user_id == user_id, Membership.is_active.is_(True))
+        ).scalars().all()
+        return "super:*" in _allowed(perms)
+
+    return get_or_load(("super", user_id), load)
 
 
 def require_platform_admin() -> Callable:
@@ -108,44 +117,99 @@ def require_platform_admin() -> Callable:
     return dependency
 
 
-def has_permission(db: Session, *, user_id: uuid.UUID, school_id: uuid.UUID, permission: str) -> bool:
-    membership = db.scalar(
-        select(Membership).where(
-            Membership.user_id == user_id,
-            Membership.school_id == school_id,
-            Membership.is_active.is_(True),
+def _load_school_grant(db: Session, user_id: uuid.UUID, school_id: uuid.UUID) -> Optional[SchoolGrant]:
+    rows = db.execute(
+        select(School.tenant_id, Membership.id.label("membership_id"), Role.permissions)
+        .select_from(School)
+        .outerjoin(
+            Membership,
+            and_(
+                Membership.school_id == School.id,
+                Membership.user_id == user_id,
+                Membership.is_active.is_(True),
+            ),
         )
+        .outerjoin(Role, Role.id == Membership.role_id)
+        .where(School.id == school_id)
+    ).all()
+    if not rows:
+        return None
+    return SchoolGrant(
+        school_tenant_id=rows[0].tenant_id,
+        permissions=_allowed([r.permissions for r in rows]),
+        is_member=any(r.membership_id is not None for r in rows),
     )
-    if not membership:
+
+
+def get_school_grant(db: Session, *, user_id: uuid.UUID, school_id: uuid.UUID) -> Optional[SchoolGrant]:
+    return get_or_load((user_id, school_id), lambda: _load_school_grant(db, user_id, school_id))
+
+
+def has_permission(db: Session, *, user_id: uuid.UUID, school_id: uuid.UUID, permission: str) -> bool:
+    grant = get_school_grant(db, user_id=user_id, school_id=school_id)
+    if grant is None:
         return False
-    role = db.get(Role, membership.role_id)
-    allow = set(((role.permissions if role else None) or {}).get("allow", []))
-    return permission in allow or "super:*" in allow
+    return permission in grant.permissions or "super:*" in grant.permissions
 
 
-def require_permission(permission: str) -> Callable:
-    def dependency(
-        *,
-        db: Session = Depends(get_db),
-        user: User = Depends(get_current_user),
-        request: Request,
-        x_school_id: Optional[str] = Header(default=None),
-    ) -> None:
-        if not x_school_id:
-            raise forbidden("X-School-Id header is required for this endpoint")
-        try:
-            school_id = uuid.UUID(x_school_id)
-        except Exception as exc:
-            raise forbidden("Invalid X-School-Id") from exc
+@dataclass
+class Principal:
+    user: User
+    tenant_id: Optional[uuid.UUID]
+    is_saas_admin: bool
+    school_id: Optional[uuid.UUID] = None
+    permissions: frozenset[str] = field(default_factory=frozenset)
+    school_error: Optional[str] = None
+
+    def has_permission(self, permission: str) -> bool:
+        return permission in self.permissions or "super:*" in self.permissions
 
-        tenant_id = getattr(request.state, "tenant_id", None)
-        if tenant_id is None:
-            raise forbidden("Tenant is required")
-        school = db.get(School, school_id)
-        if not school or school.tenant_id != tenant_id:
-            raise forbidden("Invalid school for tenant")
 
-        if not has_permission(db, user_id=user.id, school_id=school_id, permission=permission):
+def _resolve_school_scope(db: Session, principal: Principal, x_school_id: Optional[str]) -> None:
+    if not x_school_id:
+        principal.school_error = "X-School-Id header is required for this endpoint"
+        return
+    try:
+        school_id = uuid.UUID(x_school_id)
+    except Exception:
+        principal.school_error = "Invalid X-School-Id"
+        return
+    if principal.tenant_id is None:
+        principal.school_error = "Tenant is required"
+        return
+
+    grant = get_school_grant(db, user_id=principal.user.id, school_id=school_id)
+    if grant is None or grant.school_tenant_id != principal.tenant_id:
+        principal.school_error = "Invalid school for tenant"
+        return
+    principal.school_id = school_id
+    principal.permissions = grant.permissions
+
+
+def get_principal(
+    request: Request,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+    x_school_id: Optional[str] = Header(default=None),
+) -> Principal:
+    principal = getattr(request.state, "principal", None)
+    if principal is not None and principal.user.id == user.id:
+        return principal
+    principal = Principal(
+        user=user,
+        tenant_id=getattr(request.state, "tenant_id", None),
+        is_saas_admin=bool(getattr(request.state, "is_saas_admin", False)),
+    )
+    _resolve_school_scope(db, principal, x_school_id)
+    request.state.principal = principal
+    return principal
+
+
+def require_permission(permission: str) -> Callable:
+    def dependency(principal: Principal = Depends(get_principal)) -> None:
+        if principal.school_error:
+            raise forbidden(principal.school_error)
+        if not principal.has_permission(permission):
             raise forbidden("Missing required permission")
 
     return dependency
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends
 
-from app.api.v1.endpoints import academic_calendar_settings, academic_years, analytics, attendance_staff, attendance_students, audit_logs, auth, backup, batch, certificates, classes, communication_logs, curriculum, discounts, documents, enrollments, events, exam_schedules, exams, online_exams, fee_dues, fee_payments, fee_structures, grades, guardians, health, holidays, import_export, leaves, library_books, library_issues, logistics, marks, messages, notices, notifications, parent_portal, payroll, platform_tenants, reports, results, roles, schools, sections, settings, staff, staff_extended, staff_leave, streams, students, subject_groups, subjects, teacher_assignments, terms, time_slots, timetable, transport_assignments, transport_route_stops, transport_routes, transport_vehicles, users
+from app.api.v1.endpoints import academic_calendar_settings, academic_years, analytics, attendance_staff, attendance_students, audit_logs, auth, backup, batch, certificates, classes, communication_logs, curriculum, discounts, documents, enrollments, events, exam_schedules, exams, online_exams, fee_dues, fee_payments, fee_structures, grades, guardians, health, holidays, import_export, jobs, leaves, library_books, library_issues, logistics, marks, messages, notices, notifications, parent_portal, payroll, platform_tenants, reports, results, roles, schools, sections, settings, staff, staff_extended, staff_leave, streams, students, subject_groups, subjects, teacher_assignments, terms, time_slots, timetable, transport_assignments, transport_route_stops, transport_routes, transport_vehicles, users
 from app.api.deps import require_tenant
 
 api_router = APIRouter()
@@ -65,6 +65,7 @@ tenant_router.include_router(settings.router, prefix="/settings", tags=["setting
 tenant_router.include_router(backup.router, prefix="/backup", tags=["backup"])
 tenant_router.include_router(import_export.router, prefix="/import-export", tags=["import-export"])
 tenant_router.include_router(batch.router, prefix="/batch", tags=["batch"])
+tenant_router.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
 tenant_router.include_router(logistics.router, prefix="/logistics", tags=["logistics"])
 
 api_router.include_router(tenant_router)
@@ -1,22 +1,22 @@
 import uuid
 from datetime import date, datetime, timedelta, timezone
+from typing import Optional
 
 from fastapi import APIRouter, Depends
-from sqlalchemy import func, select
+from sqlalchemy import and_, func, select
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_active_school_id, get_current_user, require_permission
-from app.core.problems import not_found
+from app.api.deps import get_active_school_id, get_current_user, get_school_grant, require_permission
+from app.core.problems import not_found, problem
+from app.core.jobs import JobContext, job_handler
+from app.core.rollups import get_school_rollup, refresh_school_rollup
 from app.db.session import get_db
 from app.models.academic_year import AcademicYear
 from app.models.enrollment import Enrollment
 from app.models.exam import Exam
-from app.models.fee_due import FeeDue
-from app.models.membership import Membership
 from app.models.notification import Notification
 from app.models.result import Result
 from app.models.staff import Staff
-from app.models.student import Student
 from app.models.teacher_assignment import StaffAttendance, StudentAttendance
 from app.models.user import User
 
@@ -24,82 +24,54 @@ router = APIRouter(dependencies=[Depends(require_permission("analytics:read"))])
 
 
 def _ensure_membership(db: Session, user_id: uuid.UUID, school_id: uuid.UUID) -> None:
-    m = db.scalar(
-        select(Membership).where(Membership.user_id == user_id, Membership.school_id == school_id, Membership.is_active.is_(True))
-    )
-    if not m:
+    grant = get_school_grant(db, user_id=user_id, school_id=school_id)
+    if grant is None or not grant.is_member:
         raise not_found("School not found")
 
 
 def _overview(db: Session, school_id: uuid.UUID) -> dict:
-    students = db.scalar(select(func.count()).select_from(Student).where(Student.school_id == school_id)) or 0
-    staff = db.scalar(select(func.count()).select_from(Staff).where(Staff.school_id == school_id)) or 0
-    dues = db.scalar(
-        select(func.coalesce(func.sum(FeeDue.due_amount), 0))
-        .join(Student, Student.id == FeeDue.student_id)
-        .where(Student.school_id == school_id)
-    ) or 0
-    return {"students": int(students), "staff": int(staff), "total_due_amount": int(dues)}
+    rollup = get_school_rollup(db, school_id)
+    return {"students": rollup.student_count, "staff": rollup.staff_count, "total_due_amount": rollup.total_due_amount}
 
 
-@router.get("/dashboard/admin")
-def get_admin_dashboard(
-    db: Session = Depends(get_db), user: User = Depends(get_current_user), school_id=Depends(get_active_school_id)
-) -> dict:
+def _dashboard(db: Session, user: User, school_id: uuid.UUID) -> dict:
     _ensure_membership(db, user.id, school_id)
-    overview = _overview(db, school_id)
+    data = _overview(db, school_id)
     unread_notifications = db.scalar(
         select(func.count()).select_from(Notification).where(
-            Notification.school_id == school_id, Notification.user_id == user.id, Notification.is_read.is_(False)
+            Notification.user_id == user.id, Notification.school_id == school_id, Notification.is_read.is_(False)
         )
     ) or 0
-    overview["my_unread_notifications"] = int(unread_notifications)
-    return overview
+    data["my_unread_notifications"] = int(unread_notifications)
+    return data
+
+
+@router.get("/dashboard/admin")
+def get_admin_dashboard(
+    db: Session = Depends(get_db), user: User = Depends(get_current_user), school_id=Depends(get_active_school_id)
+) -> dict:
+    return _dashboard(db, user, school_id)
 
 
 @router.get("/dashboard/teacher")
 def get_teacher_dashboard(
     db: Session = Depends(get_db), user: User = Depends(get_current_user), school_id=Depends(get_active_school_id)
 ) -> dict:
-    _ensure_membership(db, user.id, school_id)
-    data = _overview(db, school_id)
-    unread_notifications = db.scalar(
-        select(func.count()).select_from(Notification).where(
-            Notification.school_id == school_id, Notification.user_id == user.id, Notification.is_read.is_(False)
-        )
-    ) or 0
-    data["my_unread_notifications"] = int(unread_notifications)
-    return data
+    return _dashboard(db, user, school_id)
 
 
 @router.get("/dashboard/student")
 def get_student_dashboard(
     db: Session = Depends(get_db), user: User = Depends(get_current_user), school_id=Depends(get_active_school_id)
 ) -> dict:
-    _ensure_membership(db, user.id, school_id)
-    data = _overview(db, school_id)
-    unread_notifications = db.scalar(
-        select(func.count()).select_from(Notification).where(
-            Notification.school_id == school_id, Notification.user_id == user.id, Notification.is_read.is_(False)
-        )
-    ) or 0
-    data["my_unread_notifications"] = int(unread_notifications)
-    return data
+    return _dashboard(db, user, school_id)
 
 
 @router.get("/dashboard/parent")
 def get_parent_dashboard(
     db: Session = Depends(get_db), user: User = Depends(get_current_user), school_id=Depends(get_active_school_id)
 ) -> dict:
-    _ensure_membership(db, user.id, school_id)
-    data = _overview(db, school_id)
-    unread_notifications = db.scalar(
-        select(func.count()).select_from(Notification).where(
-            Notification.school_id == school_id, Notification.user_id == user.id, Notification.is_read.is_(False)
-        )
-    ) or 0
-    data["my_unread_notifications"] = int(unread_notifications)
-    return data
+    return _dashboard(db, user, school_id)
 
 
 @router.get("/statistics/overview")
@@ -110,39 +82,204 @@ def get_overview_statistics(
     return _overview(db, school_id)
 
 
-@router.get("/statistics/attendance")
-def get_attendance_statistics(
-    db: Session = Depends(get_db), user: User = Depends(get_current_user), school_id=Depends(get_active_school_id)
+def _check_breakdown(breakdown: Optional[str]) -> None:
+    if breakdown not in (None, "class"):
+        raise problem(status_code=400, title="Bad Request", detail="breakdown must be 'class'")
+
+
+def _day_start(d: date) -> datetime:
+    return datetime.combine(d, datetime.min.time(), tzinfo=timezone.utc)
+
+
+def _attendance_statistics(
+    db: Session, school_id: uuid.UUID, start: date, end: date, class_id: Optional[uuid.UUID] = None
 ) -> dict:
-    _ensure_membership(db, user.id, school_id)
-    end = date.today()
-    start = end - timedelta(days=7)
-    student_total = db.scalar(
+    student_q = (
         select(func.count())
         .select_from(StudentAttendance)
-        .join(Student, Student.id == StudentAttendance.student_id)
-        .where(Student.school_id == school_id, StudentAttendance.attendance_date >= datetime.combine(start, datetime.min.time(), tzinfo=timezone.utc))
-    ) or 0
-    staff_total = db.scalar(
+        .where(
+            StudentAttendance.school_id == school_id,
+            StudentAttendance.attendance_day >= start,
+            StudentAttendance.attendance_day <= end,
+        )
+    )
+    if class_id:
+        student_q = student_q.where(StudentAttendance.class_id == class_id)
+    staff_q = (
         select(func.count())
         .select_from(StaffAttendance)
         .join(Staff, Staff.id == StaffAttendance.staff_id)
-        .where(Staff.school_id == school_id, StaffAttendance.attendance_date >= datetime.combine(start, datetime.min.time(), tzinfo=timezone.utc))
-    ) or 0
-    return {"window_days": 7, "student_records": int(student_total), "staff_records": int(staff_total)}
+        .where(
+            Staff.school_id == school_id,
+            StaffAttendance.attendance_date >= _day_start(start),
+            StaffAttendance.attendance_date < _day_start(end + timedelta(days=1)),
+        )
+    )
+    student_total, staff_total = db.execute(select(student_q.scalar_subquery(), staff_q.scalar_subquery())).one()
+    return {"window_days": (end - start).days, "student_records": int(student_total or 0), "staff_records": int(staff_total or 0)}
+
+
+def _academic_statistics(db: Session, school_id: uuid.UUID, academic_year_id: Optional[uuid.UUID] = None) -> dict:
+    q = (
+        select(func.count(func.distinct(Exam.id)), func.count(Result.id))
+        .select_from(AcademicYear)
+        .join(Exam, Exam.academic_year_id == AcademicYear.id)
+        .outerjoin(Result, Result.exam_id == Exam.id)
+        .where(AcademicYear.school_id == school_id)
+    )
+    if academic_year_id:
+        q = q.where(AcademicYear.id == academic_year_id)
+    else:
+        q = q.where(AcademicYear.is_current.is_(True))
+    exams, results_count = db.execute(q).one()
+    return {"current_year_exams": int(exams or 0), "results_count": int(results_count or 0)}
+
+
+def _enrollment_trends(
+    db: Session,
+    school_id: uuid.UUID,
+    *,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    class_id: Optional[uuid.UUID] = None,
+    by_class: bool = False,
+) -> list[dict]:
+    on = Enrollment.academic_year_id == AcademicYear.id
+    if class_id:
+        on = and_(on, Enrollment.class_id == class_id)
+    columns = [AcademicYear.id, AcademicYear.name, AcademicYear.start_date]
+    if by_class:
+        columns.append(Enrollment.class_id)
+    q = (
+        select(*columns, func.count(Enrollment.id))
+        .select_from(AcademicYear)
+        .outerjoin(Enrollment, on)
+        .where(AcademicYear.school_id == school_id)
+        .group_by(*columns)
+        .order_by(AcademicYear.start_date.asc(), AcademicYear.id.asc())
+    )
+    if start_date:
+        q = q.where(AcademicYear.end_date >= start_date)
+    if end_date:
+        q = q.where(AcademicYear.start_date <= end_date)
+
+    out: dict[uuid.UUID, dict] = {}
+    for row in db.execute(q).all():
+        year_id, name, count = row[0], row[1], int(row[-1] or 0)
+        item = out.get(year_id)
+        if item is None:
+            item = out[year_id] = {"academic_year_id": str(year_id), "name": name, "enrollments": 0}
+            if by_class:
+                item["classes"] = []
+        item["enrollments"] += count
+        if by_class and row[3] is not None:
+            item["classes"].append({"class_id": str(row[3]), "enrollments": count})
+    return list(out.values())
+
+
+def _performance_trends(
+    db: Session,
+    school_id: uuid.UUID,
+    *,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    class_id: Optional[uuid.UUID] = None,
+    by_class: bool = False,
+    limit: int = 50,
+) -> list[dict]:
+    def in_class(academic_year_id):
+        return (
+            select(Enrollment.id)
+            .where(
+                Enrollment.student_id == Result.student_id,
+                Enrollment.academic_year_id == academic_year_id,
+                Enrollment.status == "active",
+                Enrollment.class_id == class_id,
+            )
+            .exists()
+        )
+
+    scored = select(Result.id).where(Result.exam_id == Exam.id)
+    if class_id:
+        scored = scored.where(in_class(Exam.academic_year_id))
+    exams_q = (
+        select(Exam.id, Exam.name, Exam.created_at, Exam.academic_year_id)
+        .join(AcademicYear, AcademicYear.id == Exam.academic_year_id)
+        .where(AcademicYear.school_id == school_id, scored.exists())
+        .order_by(Exam.created_at.asc(), Exam.id.asc())
+        .limit(limit)
+    )
+    if start_date:
+        exams_q = exams_q.where(Exam.start_date >= start_date)
+    if end_date:
+        exams_q = exams_q.where(Exam.start_date <= end_date)
+    exams = exams_q.subquery("exams")
+    order = (exams.c.created_at.asc(), exams.c.id.asc())
+
+    q = (
+        select(exams.c.id, exams.c.name, func.sum(Result.percentage), func.count(Result.id))
+        .join(Result, Result.exam_id == exams.c.id)
+        .group_by(exams.c.id, exams.c.name, exams.c.created_at)
+        .order_by(*order)
+    )
+    if class_id:
+        q = q.where(in_class(exams.c.academic_year_id))
+    out: dict[uuid.UUID, dict] = {}
+    for exam_id, name, total, count in db.execute(q).all():
+        out[exam_id] = {"exam_id": str(exam_id), "exam_name": name, "avg_pct": float(total or 0) / count if count else 0.0}
+    if not by_class:
+        return list(out.values())
+
+    # Only active enrollments count, so a student moved between classes mid-year lands in one class only.
+    classes_q = (
+        select(exams.c.id, Enrollment.class_id, func.sum(Result.percentage), func.count(Result.id))
+        .join(Result, Result.exam_id == exams.c.id)
+        .join(
+            Enrollment,
+            and_(
+                Enrollment.student_id == Result.student_id,
+                Enrollment.academic_year_id == exams.c.academic_year_id,
+                Enrollment.status == "active",
+            ),
+        )
+        .group_by(exams.c.id, exams.c.created_at, Enrollment.class_id)
+        .order_by(*order)
+    )
+    if class_id:
+        classes_q = classes_q.where(Enrollment.class_id == class_id)
+    for item in out.values():
+        item["classes"] = []
+    for exam_id, cls, total, count in db.execute(classes_q).all():
+        out[exam_id]["classes"].append({"class_id": str(cls), "avg_pct": float(total or 0) / count if count else 0.0})
+    return list(out.values())
+
+
+@router.get("/statistics/attendance")
+def get_attendance_statistics(
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+    school_id=Depends(get_active_school_id),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    class_id: Optional[uuid.UUID] = None,
+) -> dict:
+    _ensure_membership(db, user.id, school_id)
+    end = end_date or date.today()
+    start = start_date or (end - timedelta(days=7))
+    if start > end:
+        raise problem(status_code=400, title="Bad Request", detail="start_date must be on or before end_date")
+    return _attendance_statistics(db, school_id, start, end, class_id)
 
 
 @router.get("/statistics/academic")
 def get_academic_statistics(
-    db: Session = Depends(get_db), user: User = Depends(get_current_user), school_id=Depends(get_active_school_id)
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+    school_id=Depends(get_active_school_id),
+    academic_year_id: Optional[uuid.UUID] = None,
 ) -> dict:
     _ensure_membership(db, user.id, school_id)
-    year = db.scalar(select(AcademicYear).where(AcademicYear.school_id == school_id, AcademicYear.is_current.is_(True)))
-    if not year:
-        return {"current_year_exams": 0, "results_count": 0}
-    exams = db.scalar(select(func.count()).select_from(Exam).where(Exam.academic_year_id == year.id)) or 0
-    results_count = db.scalar(select(func.count()).select_from(Result).join(Exam, Exam.id == Result.exam_id).where(Exam.academic_year_id == year.id)) or 0
-    return {"current_year_exams": int(exams), "results_count": int(results_count)}
+    return _academic_statistics(db, school_id, academic_year_id)
 
 
 @router.get("/statistics/financial")
@@ -150,43 +287,47 @@ def get_financial_statistics(
     db: Session = Depends(get_db), user: User = Depends(get_current_user), school_id=Depends(get_active_school_id)
 ) -> dict:
     _ensure_membership(db, user.id, school_id)
-    total_due = db.scalar(
-        select(func.coalesce(func.sum(FeeDue.due_amount), 0)).join(Student, Student.id == FeeDue.student_id).where(Student.school_id == school_id)
-    ) or 0
-    total_paid = db.scalar(
-        select(func.coalesce(func.sum(FeeDue.paid_amount), 0)).join(Student, Student.id == FeeDue.student_id).where(Student.school_id == school_id)
-    ) or 0
-    return {"due": int(total_due), "paid": int(total_paid)}
+    rollup = get_school_rollup(db, school_id)
+    return {"due": rollup.total_due_amount, "paid": rollup.total_paid_amount}
 
 
 @router.get("/trends/enrollment")
 def get_enrollment_trends(
-    db: Session = Depends(get_db), user: User = Depends(get_current_user), school_id=Depends(get_active_school_id)
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+    school_id=Depends(get_active_school_id),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    class_id: Optional[uuid.UUID] = None,
+    breakdown: Optional[str] = None,
 ) -> list[dict]:
     _ensure_membership(db, user.id, school_id)
-    years = db.execute(select(AcademicYear).where(AcademicYear.school_id == school_id).order_by(AcademicYear.start_date.asc())).scalars().all()
-    out: list[dict] = []
-    for y in years:
-        count = db.scalar(
-            select(func.count()).select_from(Enrollment).where(Enrollment.academic_year_id == y.id)
-        ) or 0
-        out.append({"academic_year_id": str(y.id), "name": y.name, "enrollments": int(count)})
-    return out
+    _check_breakdown(breakdown)
+    return _enrollment_trends(
+        db, school_id, start_date=start_date, end_date=end_date, class_id=class_id, by_class=breakdown == "class"
+    )
 
 
 @router.get("/trends/performance")
 def get_performance_trends(
-    db: Session = Depends(get_db), user: User = Depends(get_current_user), school_id=Depends(get_active_school_id)
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+    school_id=Depends(get_active_school_id),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    class_id: Optional[uuid.UUID] = None,
+    breakdown: Optional[str] = None,
 ) -> list[dict]:
     _ensure_membership(db, user.id, school_id)
-    rows = db.execute(
-        select(Exam.id, Exam.name, func.avg(Result.percentage))
-        .join(Result, Result.exam_id == Exam.id)
-        .join(AcademicYear, AcademicYear.id == Exam.academic_year_id)
-        .where(AcademicYear.school_id == school_id)
-        .group_by(Exam.id, Exam.name)
-        .order_by(Exam.created_at.asc())
-        .limit(50)
-    ).all()
-    return [{"exam_id": str(eid), "exam_name": name, "avg_pct": float(avg or 0)} for eid, name, avg in rows]
+    _check_breakdown(breakdown)
+    return _performance_trends(
+        db, school_id, start_date=start_date, end_date=end_date, class_id=class_id, by_class=breakdown == "class"
+    )
+
 
+@job_handler("analytics.refresh_rollup", permission="analytics:read")
+def _refresh_rollup_job(ctx: JobContext) -> dict[str, int]:
+    """Reconcile the dashboard rollup with source tables after writes that bypass the rollup hooks."""
+    rollup = refresh_school_rollup(ctx.db, ctx.school_id)
+    ctx.db.commit()
+    return {"students": rollup.student_count, "staff": rollup.staff_count}
@@ -6,6 +6,7 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_active_school_id, require_permission
+from app.core.attendance import upsert_staff_attendance
 from app.core.problems import not_found, problem
 from app.db.session import get_db
 from app.models.school import School
@@ -54,23 +55,11 @@ def mark_staff_attendance(
     db: Session = Depends(get_db),
     school_id=Depends(get_active_school_id),
 ) -> dict[str, int]:
-    d = _dt(payload.attendance_date)
-    now = datetime.now(timezone.utc)
-    upserts = 0
-    for item in payload.items:
-        staff = db.get(Staff, item.staff_id)
-        if not staff or staff.school_id != school_id:
-            raise not_found("Staff not found")
-        existing = db.scalar(
-            select(StaffAttendance).where(StaffAttendance.staff_id == item.staff_id, StaffAttendance.attendance_date == d)
-        )
-        if existing:
-            existing.status = item.status
-        else:
-            db.add(StaffAttendance(attendance_date=d, staff_id=item.staff_id, status=item.status, created_at=now))
-        upserts += 1
+    upsert_staff_attendance(
+        db, school_id, attendance_date=payload.attendance_date, statuses=[(item.staff_id, item.status) for item in payload.items]
+    )
     db.commit()
-    return {"marked": upserts}
+    return {"marked": len(payload.items)}
 
 
 @router.get("/date/{attendance_date}", response_model=list[StaffAttendanceOut])
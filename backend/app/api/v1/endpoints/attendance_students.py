@@ -1,5 +1,5 @@
 import uuid
-from datetime import date, datetime, time, timezone
+from datetime import date, datetime, timezone
 from typing import Optional
 
 from fastapi import APIRouter, Depends
@@ -7,6 +7,18 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_active_school_id, get_current_user, require_permission
+from app.api.v1.endpoints.jobs import JobLauncher, get_job_launcher
+from app.core.attendance import refresh_attendance_summary, upsert_student_attendance
+from app.core.attendance_alerts import dispatch_attendance_alerts
+from app.core.attendance_stats import (
+    attendance_defaulters,
+    attendance_rates,
+    attendance_statistics,
+    attendance_window,
+    invalidate_attendance_stats,
+)
+from app.core.config import settings as app_settings
+from app.core.jobs import JobContext, job_handler
 from app.core.problems import not_found, not_implemented
 from app.db.session import get_db
 from app.models.attendance_excuse import AttendanceExcuse
@@ -15,15 +27,11 @@ from app.models.section import Section
 from app.models.student import Student
 from app.models.teacher_assignment import StudentAttendance
 from app.models.user import User
-from app.schemas.attendance import MarkStudentAttendanceRequest, StudentAttendanceOut
+from app.schemas.attendance import MarkStudentAttendanceRequest, SendAttendanceAlertsRequest, StudentAttendanceOut
 
 router = APIRouter(dependencies=[Depends(require_permission("attendance:read"))])
 
 
-def _dt(d: date) -> datetime:
-    return datetime.combine(d, time.min, tzinfo=timezone.utc)
-
-
 def _out(r: StudentAttendance) -> StudentAttendanceOut:
     return StudentAttendanceOut(
         id=r.id,
@@ -53,37 +61,17 @@ def mark_student_attendance(
         if not cls or cls.school_id != school_id:
             raise not_found("Class not found")
 
-    d = _dt(payload.attendance_date)
-    now = datetime.now(timezone.utc)
-    upserts = 0
-    for item in payload.items:
-        student = db.get(Student, item.student_id)
-        if not student or student.school_id != school_id:
-            raise not_found("Student not found")
-        existing = db.scalar(
-            select(StudentAttendance).where(
-                StudentAttendance.student_id == item.student_id,
-                StudentAttendance.attendance_date == d,
-            )
-        )
-        if existing:
-            existing.status = item.status
-            existing.class_id = payload.class_id
-            existing.section_id = payload.section_id
-        else:
-            db.add(
-                StudentAttendance(
-                    attendance_date=d,
-                    student_id=item.student_id,
-                    class_id=payload.class_id,
-                    section_id=payload.section_id,
-                    status=item.status,
-                    created_at=now,
-                )
-            )
-        upserts += 1
+    upsert_student_attendance(
+        db,
+        school_id,
+        attendance_date=payload.attendance_date,
+        statuses=[(item.student_id, item.status) for item in payload.items],
+        class_id=payload.class_id,
+        section_id=payload.section_id,
+    )
     db.commit()
-    return {"marked": upserts}
+    invalidate_attendance_stats(school_id)
+    return {"marked": len(payload.items)}
 
 
 @router.post("/bulk-mark", dependencies=[Depends(require_permission("attendance:write"))])
@@ -103,11 +91,8 @@ def get_attendance_by_date(
     class_id: Optional[uuid.UUID] = None,
     section_id: Optional[uuid.UUID] = None,
 ) -> list[StudentAttendanceOut]:
-    d = _dt(attendance_date)
-    q = (
-        select(StudentAttendance)
-        .join(Student, Student.id == StudentAttendance.student_id)
-        .where(Student.school_id == school_id, StudentAttendance.attendance_date == d)
+    q = select(StudentAttendance).where(
+        StudentAttendance.school_id == school_id, StudentAttendance.attendance_day == attendance_date
     )
     if class_id:
         q = q.where(StudentAttendance.class_id == class_id)
@@ -117,6 +102,68 @@ def get_attendance_by_date(
     return [_out(r) for r in rows]
 
 
+def _window(start_date: Optional[date], end_date: Optional[date]) -> tuple[date, date]:
+    end = end_date or date.today()
+    return start_date or end.replace(day=1), end
+
+
+@router.get("/summary")
+def get_attendance_summary(
+    db: Session = Depends(get_db),
+    school_id=Depends(get_active_school_id),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    class_id: Optional[uuid.UUID] = None,
+    section_id: Optional[uuid.UUID] = None,
+) -> list[dict]:
+    start, end = _window(start_date, end_date)
+    rates = attendance_rates(db, school_id, start=start, end=end, class_id=class_id, section_id=section_id)
+    out = [
+        {
+            "student_id": str(r.student_id),
+            "counts": dict(r.counts),
+            "present": r.present,
+            "total": r.total,
+            "attendance_pct": r.percentage,
+        }
+        for r in rates
+    ]
+    out.sort(key=lambda x: x["student_id"])
+    return out
+
+
+@router.get("/defaulters")
+def get_attendance_defaulters(
+    db: Session = Depends(get_db),
+    school_id=Depends(get_active_school_id),
+    threshold: int = app_settings.attendance_defaulter_threshold,
+    window_days: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    class_id: Optional[uuid.UUID] = None,
+    section_id: Optional[uuid.UUID] = None,
+) -> list[dict]:
+    start, end = attendance_window(start_date, end_date, window_days)
+    rates = attendance_rates(db, school_id, start=start, end=end, class_id=class_id, section_id=section_id)
+    return attendance_defaulters(rates, threshold)
+
+
+@router.get("/statistics")
+def get_attendance_statistics(
+    db: Session = Depends(get_db),
+    school_id=Depends(get_active_school_id),
+    threshold: int = app_settings.attendance_defaulter_threshold,
+    window_days: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    class_id: Optional[uuid.UUID] = None,
+    section_id: Optional[uuid.UUID] = None,
+) -> dict:
+    start, end = attendance_window(start_date, end_date, window_days)
+    rates = attendance_rates(db, school_id, start=start, end=end, class_id=class_id, section_id=section_id)
+    return {"start_date": start.isoformat(), "end_date": end.isoformat(), **attendance_statistics(rates, threshold)}
+
+
 @router.get("/{attendance_id}", response_model=StudentAttendanceOut)
 def get_attendance_record(
     attendance_id: uuid.UUID,
@@ -146,7 +193,10 @@ def update_attendance(
     if not student or student.school_id != school_id:
         raise not_found("Attendance not found")
     r.status = status
+    db.flush()
+    refresh_attendance_summary(db, school_id, [(r.student_id, r.attendance_day)])
     db.commit()
+    invalidate_attendance_stats(school_id)
     return _out(r)
 
 
@@ -162,8 +212,12 @@ def delete_attendance(
     student = db.get(Student, r.student_id)
     if not student or student.school_id != school_id:
         raise not_found("Attendance not found")
+    key = (r.student_id, r.attendance_day)
     db.delete(r)
+    db.flush()
+    refresh_attendance_summary(db, school_id, [key])
     db.commit()
+    invalidate_attendance_stats(school_id)
     return {"status": "ok"}
 
 
@@ -172,24 +226,30 @@ def get_attendance_report() -> None:
     raise not_implemented("Attendance reporting is not implemented yet")
 
 
-@router.get("/summary", include_in_schema=False)
-def get_attendance_summary() -> None:
-    raise not_implemented("Attendance summary is not implemented yet")
-
-
-@router.get("/defaulters", include_in_schema=False)
-def get_attendance_defaulters() -> None:
-    raise not_implemented("Attendance defaulters is not implemented yet")
-
-
-@router.get("/statistics", include_in_schema=False)
-def get_attendance_statistics() -> None:
-    raise not_implemented("Attendance statistics is not implemented yet")
+@router.post("/send-alerts", dependencies=[Depends(require_permission("attendance:write"))])
+def send_attendance_alerts(
+    payload: SendAttendanceAlertsRequest,
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+    school_id=Depends(get_active_school_id),
+    jobs: Optional[JobLauncher] = Depends(get_job_launcher),
+) -> dict:
+    if jobs is not None:
+        return jobs.launch("attendance.send_alerts", payload.model_dump(mode="json"))
+    return dispatch_attendance_alerts(
+        db, school_id, attendance_date=payload.attendance_date, sent_by_user_id=user.id, statuses=payload.statuses
+    )
 
 
-@router.post("/send-alerts", include_in_schema=False)
-def send_attendance_alerts() -> None:
-    raise not_implemented("Attendance alerts are not implemented yet")
+@job_handler("attendance.send_alerts", permission="attendance:write")
+def _send_attendance_alerts_job(ctx: JobContext) -> dict:
+    return send_attendance_alerts(
+        payload=SendAttendanceAlertsRequest(**ctx.params),
+        db=ctx.db,
+        user=ctx.db.get(User, ctx.user_id),
+        school_id=ctx.school_id,
+        jobs=None,
+    )
 
 
 @router.get("/excuses/pending")
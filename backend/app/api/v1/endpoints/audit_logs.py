@@ -7,6 +7,7 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_active_school_id, require_permission
+from app.core.pagination import keyset_page
 from app.core.problems import not_found
 from app.db.session import get_db
 from app.models.audit_log import AuditLog
@@ -43,9 +44,12 @@ def list_audit_logs(
     end_date: Optional[date] = None,
     page: int = 1,
     limit: int = 50,
+    cursor: Optional[str] = None,
+    with_total: bool = False,
 ) -> dict:
+    """Newest first; pages by keyset on (created_at, id) when cursor is given (empty for the first page)."""
     offset = (page - 1) * limit if page > 1 else 0
-    q = select(AuditLog).where(AuditLog.school_id == school_id).order_by(AuditLog.created_at.desc())
+    q = select(AuditLog).where(AuditLog.school_id == school_id)
     if user_id:
         q = q.where(AuditLog.user_id == user_id)
     if action:
@@ -56,7 +60,12 @@ def list_audit_logs(
         q = q.where(AuditLog.created_at >= _dt(start_date))
     if end_date:
         q = q.where(AuditLog.created_at <= _dt(end_date, end=True))
-    rows = db.execute(q.offset(offset).limit(limit)).scalars().all()
+    if cursor is not None:
+        result = keyset_page(
+            db, q, keys=(AuditLog.created_at, AuditLog.id), cursor=cursor, limit=limit, descending=True, with_total=with_total
+        )
+        return result.response([_out(r).model_dump() for r in result.rows])
+    rows = db.execute(q.order_by(AuditLog.created_at.desc()).offset(offset).limit(limit)).scalars().all()
     return {"items": [_out(r).model_dump() for r in rows], "page": page, "limit": limit}
 
 
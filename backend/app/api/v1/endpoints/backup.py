@@ -3,6 +3,7 @@ import base64
 import gzip
 import json
 from datetime import datetime, timezone
+from typing import Optional
 
 from fastapi import APIRouter, Depends
 from fastapi.responses import StreamingResponse
@@ -10,7 +11,10 @@ from sqlalchemy import delete, insert, select
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_active_school_id, get_current_user, require_permission
+from app.api.v1.endpoints.jobs import JobLauncher, get_job_launcher
+from app.core.jobs import JobContext, job_handler, report_progress
 from app.core.problems import not_found, problem
+from app.core.school_settings import invalidate_school_settings
 from app.db.session import get_db
 from app.db.session import Base
 from app.models.backup_entry import BackupEntry
@@ -19,6 +23,8 @@ from app.schemas.backup import BackupEntryOut, CreateBackupRequest
 
 router = APIRouter(dependencies=[Depends(require_permission("backup:read"))])
 
+_SKIPPED_TABLES = {"backup_entries", "jobs"}
+
 
 def _out(b: BackupEntry) -> BackupEntryOut:
     return BackupEntryOut(
@@ -78,8 +84,9 @@ def _snapshot_school(db: Session, school_id: uuid.UUID) -> dict:
     tables = {t.name: t for t in Base.metadata.sorted_tables}
     snapshot: dict[str, list[dict]] = {}
 
-    for table in Base.metadata.sorted_tables:
-        if table.name in {"backup_entries"}:
+    for i, table in enumerate(Base.metadata.sorted_tables):
+        report_progress(i, len(Base.metadata.sorted_tables))
+        if table.name in _SKIPPED_TABLES:
             continue
         if "school_id" not in table.c:
             continue
@@ -105,14 +112,15 @@ def _restore_school(db: Session, school_id: uuid.UUID, payload: dict) -> None:
     data = payload.get("tables") or {}
 
     for table in reversed(Base.metadata.sorted_tables):
-        if table.name in {"backup_entries"}:
+        if table.name in _SKIPPED_TABLES:
             continue
         if "school_id" in table.c:
             db.execute(delete(table).where(table.c.school_id == school_id))
 
-    for table in Base.metadata.sorted_tables:
+    for i, table in enumerate(Base.metadata.sorted_tables):
+        report_progress(i, len(Base.metadata.sorted_tables))
         rows = data.get(table.name)
-        if not rows:
+        if not rows or table.name in _SKIPPED_TABLES:
             continue
         if table.name not in tables:
             continue
@@ -139,7 +147,10 @@ def create_backup(
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
     school_id=Depends(get_active_school_id),
+    jobs: Optional[JobLauncher] = Depends(get_job_launcher),
 ) -> BackupEntryOut:
+    if jobs is not None:
+        return jobs.launch("backup.create", {"notes": payload.notes})
     now = datetime.now(timezone.utc)
     filename = f"backup_{school_id}_{now.strftime('%Y%m%dT%H%M%SZ')}_{uuid.uuid4().hex}.json.gz"
     snapshot = _snapshot_school(db, school_id)
@@ -165,10 +176,13 @@ def restore_backup(
     backup_id: uuid.UUID,
     db: Session = Depends(get_db),
     school_id=Depends(get_active_school_id),
+    jobs: Optional[JobLauncher] = Depends(get_job_launcher),
 ) -> dict[str, str]:
     b = db.get(BackupEntry, backup_id)
     if not b or b.school_id != school_id:
         raise not_found("Backup not found")
+    if jobs is not None:
+        return jobs.launch("backup.restore", {"backup_id": backup_id})
     if not b.content:
         raise problem(status_code=400, title="Bad Request", detail="Backup has no content")
     payload = json.loads(gzip.decompress(b.content).decode("utf-8"))
@@ -176,11 +190,29 @@ def restore_backup(
         raise problem(status_code=400, title="Bad Request", detail="Backup school mismatch")
     _restore_school(db, school_id, payload)
     db.commit()
+    invalidate_school_settings(school_id)
     b.status = "restored"
     db.commit()
     return {"status": "ok"}
 
 
+@job_handler("backup.create", permission="backup:write")
+def _create_backup_job(ctx: JobContext) -> dict:
+    out = create_backup(
+        payload=CreateBackupRequest(**ctx.params),
+        db=ctx.db,
+        user=ctx.db.get(User, ctx.user_id),
+        school_id=ctx.school_id,
+        jobs=None,
+    )
+    return out.model_dump(mode="json")
+
+
+@job_handler("backup.restore", permission="backup:write")
+def _restore_backup_job(ctx: JobContext) -> dict[str, str]:
+    return restore_backup(backup_id=uuid.UUID(ctx.params["backup_id"]), db=ctx.db, school_id=ctx.school_id, jobs=None)
+
+
 @router.delete("/{backup_id}", dependencies=[Depends(require_permission("backup:write"))])
 def delete_backup(backup_id: uuid.UUID, db: Session = Depends(get_db), school_id=Depends(get_active_school_id)) -> dict[str, str]:
     b = db.get(BackupEntry, backup_id)
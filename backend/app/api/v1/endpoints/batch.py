@@ -1,12 +1,11 @@
 import uuid
-from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends
-from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_active_school_id, require_permission
-from app.core.problems import not_found, problem
+from app.core.promotions import promote_enrollments
+from app.core.problems import not_found
 from app.db.session import get_db
 from app.models.academic_year import AcademicYear
 from app.models.enrollment import Enrollment
@@ -59,38 +58,18 @@ def batch_transfer_students(
 @router.post("/students/promote")
 def batch_promote_students(
     payload: BatchPromoteStudentsRequest, db: Session = Depends(get_db), school_id=Depends(get_active_school_id)
-) -> dict[str, int]:
+) -> dict:
     _ensure_year(db, school_id, payload.new_academic_year_id)
     _ensure_class(db, school_id, payload.new_class_id)
     if payload.new_section_id:
         _ensure_section(db, payload.new_class_id, payload.new_section_id)
-    now = datetime.now(timezone.utc)
-    created = 0
-    for eid in payload.enrollment_ids:
-        e = db.get(Enrollment, eid)
-        if not e:
-            raise not_found("Enrollment not found")
-        student = db.get(Student, e.student_id)
-        if not student or student.school_id != school_id:
-            raise not_found("Enrollment not found")
-        existing = db.scalar(
-            select(Enrollment).where(Enrollment.student_id == e.student_id, Enrollment.academic_year_id == payload.new_academic_year_id)
-        )
-        if existing:
-            raise problem(status_code=409, title="Conflict", detail="Student already enrolled in target academic year")
-        e.status = "promoted"
-        db.add(
-            Enrollment(
-                student_id=e.student_id,
-                academic_year_id=payload.new_academic_year_id,
-                class_id=payload.new_class_id,
-                section_id=payload.new_section_id,
-                roll_number=None,
-                status="active",
-                created_at=now,
-            )
-        )
-        created += 1
-    db.commit()
-    return {"created": created}
+    return promote_enrollments(
+        db,
+        school_id,
+        enrollment_ids=payload.enrollment_ids,
+        new_academic_year_id=payload.new_academic_year_id,
+        new_class_id=payload.new_class_id,
+        new_section_id=payload.new_section_id,
+        dry_run=payload.dry_run,
+    )
 
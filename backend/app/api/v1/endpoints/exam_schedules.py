@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 
 from app.api.deps import get_active_school_id, require_permission
 from app.core.problems import not_found
+from app.core.results import refresh_exam_results
 from app.db.session import get_db
 from app.models.academic_year import AcademicYear
 from app.models.exam import Exam
@@ -100,6 +101,7 @@ def create_exam_schedule(
         created_at=now,
     )
     db.add(s)
+    refresh_exam_results(db, school_id=school_id, exam_ids=[s.exam_id])
     db.commit()
     db.refresh(s)
     return _out(s)
@@ -120,8 +122,10 @@ def update_exam_schedule(
     if not year or year.school_id != school_id:
         raise not_found("Exam schedule not found")
     data = payload.model_dump(exclude_unset=True)
+    previous_exam_id = s.exam_id
     for k, v in data.items():
         setattr(s, k, v)
+    refresh_exam_results(db, school_id=school_id, exam_ids=[previous_exam_id, s.exam_id])
     db.commit()
     return _out(s)
 
@@ -136,6 +140,7 @@ def delete_exam_schedule(schedule_id: uuid.UUID, db: Session = Depends(get_db),
     if not year or year.school_id != school_id:
         raise not_found("Exam schedule not found")
     db.delete(s)
+    refresh_exam_results(db, school_id=school_id, exam_ids=[s.exam_id])
     db.commit()
     return {"status": "ok"}
 
@@ -164,6 +169,7 @@ def bulk_create_exam_schedule(
             )
         )
         created += 1
+    refresh_exam_results(db, school_id=school_id, exam_ids=[item.exam_id for item in payload.items])
     db.commit()
     return {"created": created}
 
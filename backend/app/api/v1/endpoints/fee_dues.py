@@ -1,5 +1,4 @@
 import uuid
-from datetime import date, datetime, timezone
 from typing import Optional
 
 from fastapi import APIRouter, Depends
@@ -7,17 +6,16 @@ from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_active_school_id, require_permission
+from app.api.v1.endpoints.jobs import JobLauncher, get_job_launcher
+from app.core.fee_dues import calculate_fee_dues
+from app.core.jobs import JobContext, job_handler
 from app.core.problems import not_found, not_implemented
+from app.core.rollups import refresh_school_rollup
 from app.db.session import get_db
 from app.models.academic_year import AcademicYear
-from app.models.discount import Discount
 from app.models.enrollment import Enrollment
 from app.models.fee_due import FeeDue
-from app.models.fee_payment import FeePayment
-from app.models.fee_structure import FeeStructure
-from app.models.school_class import SchoolClass
 from app.models.student import Student
-from app.models.student_discount import StudentDiscount
 from app.schemas.fees import FeeDueOut
 
 router = APIRouter(dependencies=[Depends(require_permission("fee_dues:read"))])
@@ -37,49 +35,6 @@ def _out(d: FeeDue) -> FeeDueOut:
     )
 
 
-def _effective_paid(db: Session, student_id: uuid.UUID, academic_year_id: uuid.UUID) -> int:
-    payments = db.execute(
-        select(FeePayment.amount, FeePayment.is_refund).where(
-            FeePayment.student_id == student_id, FeePayment.academic_year_id == academic_year_id
-        )
-    ).all()
-    total = 0
-    for amount, is_refund in payments:
-        total += (-amount if is_refund else amount)
-    return total
-
-
-def _discount_amount(db: Session, school_id: uuid.UUID, student_id: uuid.UUID, total_fee: int) -> int:
-    links = db.execute(select(StudentDiscount).where(StudentDiscount.student_id == student_id)).scalars().all()
-    total_discount = 0
-    for link in links:
-        d = db.get(Discount, link.discount_id)
-        if not d or d.school_id != school_id:
-            continue
-        if d.discount_type == "percent":
-            total_discount += int(total_fee * (float(d.value) / 100.0))
-        else:
-            total_discount += int(d.value)
-    if total_discount > total_fee:
-        total_discount = total_fee
-    return total_discount
-
-
-def _compute_total_fee(db: Session, school_id: uuid.UUID, academic_year_id: uuid.UUID, class_id: uuid.UUID) -> int:
-    year = db.get(AcademicYear, academic_year_id)
-    if not year or year.school_id != school_id:
-        raise not_found("Academic year not found")
-    cls = db.get(SchoolClass, class_id)
-    if not cls or cls.school_id != school_id:
-        raise not_found("Class not found")
-    total_fee = db.scalar(
-        select(func.coalesce(func.sum(FeeStructure.amount), 0)).where(
-            FeeStructure.academic_year_id == academic_year_id, FeeStructure.class_id == class_id
-        )
-    ) or 0
-    return int(total_fee)
-
-
 @router.get("", response_model=list[FeeDueOut])
 def list_dues(
     db: Session = Depends(get_db),
@@ -140,7 +95,10 @@ def calculate_dues(
     db: Session = Depends(get_db),
     school_id=Depends(get_active_school_id),
     academic_year_id: Optional[uuid.UUID] = None,
+    jobs: Optional[JobLauncher] = Depends(get_job_launcher),
 ) -> dict[str, int]:
+    if jobs is not None:
+        return jobs.launch("fee_dues.calculate", {"academic_year_id": academic_year_id})
     if academic_year_id is None:
         year = db.scalar(select(AcademicYear).where(AcademicYear.school_id == school_id, AcademicYear.is_current.is_(True)))
         if not year:
@@ -150,62 +108,23 @@ def calculate_dues(
     if not year or year.school_id != school_id:
         raise not_found("Academic year not found")
 
-    enrollments = db.execute(
-        select(Enrollment).where(Enrollment.academic_year_id == academic_year_id, Enrollment.status == "active")
-    ).scalars().all()
-    now = datetime.now(timezone.utc)
-    today = date.today()
-    updated = 0
-    for enr in enrollments:
-        student = db.get(Student, enr.student_id)
-        if not student or student.school_id != school_id:
-            continue
-        total_fee = _compute_total_fee(db, school_id, academic_year_id, enr.class_id)
-        discount_amount = _discount_amount(db, school_id, student.id, total_fee)
-        paid_amount = _effective_paid(db, student.id, academic_year_id)
-        due_amount = max(total_fee - discount_amount - paid_amount, 0)
-        status = "paid" if due_amount == 0 else ("partial" if paid_amount > 0 else "due")
-        if due_amount > 0:
-            has_due_date = db.scalar(
-                select(func.count())
-                .select_from(FeeStructure)
-                .where(
-                    FeeStructure.academic_year_id == academic_year_id,
-                    FeeStructure.class_id == enr.class_id,
-                    FeeStructure.due_date.is_not(None),
-                    FeeStructure.due_date < today,
-                )
-            )
-            if has_due_date:
-                status = "overdue"
-        existing = db.scalar(select(FeeDue).where(FeeDue.student_id == student.id, FeeDue.academic_year_id == academic_year_id))
-        if existing:
-            existing.total_fee = total_fee
-            existing.discount_amount = discount_amount
-            existing.paid_amount = paid_amount
-            existing.due_amount = due_amount
-            existing.status = status
-            existing.last_calculated_date = today
-            existing.updated_at = now
-        else:
-            db.add(
-                FeeDue(
-                    student_id=student.id,
-                    academic_year_id=academic_year_id,
-                    total_fee=total_fee,
-                    discount_amount=discount_amount,
-                    paid_amount=paid_amount,
-                    due_amount=due_amount,
-                    status=status,
-                    last_calculated_date=today,
-                    updated_at=now,
-                )
-            )
-        updated += 1
+    updated = calculate_fee_dues(db, school_id, academic_year_id=academic_year_id)
+    refresh_school_rollup(db, school_id)
     db.commit()
     return {"updated": updated}
 
 
+@job_handler("fee_dues.calculate", permission="fee_dues:write", max_attempts=3)
+def _calculate_dues_job(ctx: JobContext) -> dict[str, int]:
+    year_id = ctx.params.get("academic_year_id")
+    return calculate_dues(
+        db=ctx.db,
+        school_id=ctx.school_id,
+        academic_year_id=uuid.UUID(year_id) if year_id else None,
+        jobs=None,
+    )
+
+
 @router.post("/send-reminders", include_in_schema=False)
 def send_fee_reminders() -> None:
     raise not_implemented("Fee reminders are not implemented yet")
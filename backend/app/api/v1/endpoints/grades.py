@@ -2,13 +2,15 @@ import uuid
 from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_active_school_id, require_permission
 from app.core.problems import not_found, problem
+from app.core.results import refresh_school_results
 from app.db.session import get_db
 from app.models.grade import Grade
+from app.models.result import Result
 from app.schemas.grades import GradeCreate, GradeOut, GradeUpdate
 
 router = APIRouter(dependencies=[Depends(require_permission("grades:read"))])
@@ -39,6 +41,7 @@ def create_grade(payload: GradeCreate, db: Session = Depends(get_db), school_id=
     now = datetime.now(timezone.utc)
     g = Grade(school_id=school_id, name=payload.name, min_percentage=payload.min_percentage, max_percentage=payload.max_percentage, created_at=now)
     db.add(g)
+    refresh_school_results(db, school_id=school_id)
     db.commit()
     db.refresh(g)
     return _out(g)
@@ -56,6 +59,7 @@ def update_grade(
         setattr(g, k, v)
     if g.max_percentage < g.min_percentage:
         raise problem(status_code=400, title="Bad Request", detail="max_percentage must be >= min_percentage")
+    refresh_school_results(db, school_id=school_id)
     db.commit()
     return _out(g)
 
@@ -65,7 +69,9 @@ def delete_grade(grade_id: uuid.UUID, db: Session = Depends(get_db), school_id=D
     g = db.get(Grade, grade_id)
     if not g or g.school_id != school_id:
         raise not_found("Grade not found")
+    db.execute(update(Result).where(Result.grade_id == g.id).values(grade_id=None), execution_options={"synchronize_session": False})
     db.delete(g)
+    refresh_school_results(db, school_id=school_id)
     db.commit()
     return {"status": "ok"}
 
@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 
 from app.api.deps import get_active_school_id, require_permission
 from app.core.problems import not_found, not_implemented, problem
+from app.core.search import apply_search
 from app.db.session import get_db
 from app.models.guardian import Guardian
 from app.models.student import Student
@@ -44,14 +45,12 @@ def list_guardians(
 ) -> dict:
     offset = (page - 1) * limit if page > 1 else 0
     base = select(Guardian).where(Guardian.school_id == school_id)
+    rank = None
     if search:
-        base = base.where(
-            Guardian.full_name.ilike(f"%{search}%")
-            | Guardian.phone.ilike(f"%{search}%")
-            | Guardian.email.ilike(f"%{search}%")
-        )
+        base, rank = apply_search(db, base, "guardians", search)
     total = db.scalar(select(func.count()).select_from(base.subquery())) or 0
-    rows = db.execute(base.order_by(Guardian.full_name.asc()).offset(offset).limit(limit)).scalars().all()
+    order = [Guardian.full_name.asc()] if rank is None else [rank, Guardian.full_name.asc()]
+    rows = db.execute(base.order_by(*order).offset(offset).limit(limit)).scalars().all()
     return {"items": [_out(g).model_dump() for g in rows], "total": int(total), "page": page, "limit": limit}
 
 
@@ -1,6 +1,7 @@
 import csv
 import io
 import uuid
+from collections import defaultdict
 from datetime import date, datetime, timezone
 from typing import Optional
 
@@ -10,7 +11,14 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_active_school_id, require_permission
+from app.api.v1.endpoints.jobs import JobLauncher, get_job_launcher
+from app.core.csv_export import CSV_MEDIA_TYPE, export_students_csv
+from app.core.jobs import JobContext, job_handler, report_progress
 from app.core.problems import not_found, problem
+from app.core.results import refresh_student_results
+from app.core.rollups import adjust_school_rollup
+from app.core.school_settings import get_student_settings
+from app.core.student_import import import_students as run_student_import, iter_csv_records
 from app.db.session import get_db
 from app.models.academic_year import AcademicYear
 from app.models.enrollment import Enrollment
@@ -26,12 +34,10 @@ from app.models.mark import Mark
 
 router = APIRouter(dependencies=[Depends(require_permission("import_export:read"))])
 
-_CSV_MEDIA_TYPE = "text/csv; charset=utf-8"
-
 
 def _csv_response(filename: str, content: str) -> StreamingResponse:
     headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
-    return StreamingResponse(iter([content.encode("utf-8")]), media_type=_CSV_MEDIA_TYPE, headers=headers)
+    return StreamingResponse(iter([content.encode("utf-8")]), media_type=CSV_MEDIA_TYPE, headers=headers)
 
 
 def _read_csv(file: UploadFile) -> list[dict[str, str]]:
@@ -59,29 +65,17 @@ def import_students(
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
     school_id=Depends(get_active_school_id),
-) -> dict[str, int]:
-    rows = _read_csv(file)
-    now = datetime.now(timezone.utc)
-    created = 0
-    for r in rows:
-        first_name = r.get("first_name") or r.get("firstName") or ""
-        if not first_name:
-            continue
-        s = Student(
-            school_id=school_id,
-            first_name=first_name,
-            last_name=r.get("last_name") or r.get("lastName") or None,
-            admission_no=r.get("admission_no") or r.get("admissionNo") or None,
-            gender=r.get("gender") or None,
-            date_of_birth=_parse_date(r.get("date_of_birth") or r.get("dateOfBirth") or ""),
-            status=r.get("status") or "active",
-            photo_url=r.get("photo_url") or r.get("photoUrl") or None,
-            created_at=now,
-        )
-        db.add(s)
-        created += 1
-    db.commit()
-    return {"created": created}
+    jobs: Optional[JobLauncher] = Depends(get_job_launcher),
+) -> dict:
+    if jobs is not None:
+        return jobs.launch("import_export.students", {"filename": file.filename}, payload=file.file.read())
+    report = run_student_import(
+        db,
+        school_id=school_id,
+        records=iter_csv_records(file.file),
+        student_settings=get_student_settings(db, school_id),
+    )
+    return report.as_dict()
 
 
 @router.post("/import/staff", dependencies=[Depends(require_permission("import_export:write"))])
@@ -89,11 +83,15 @@ def import_staff(
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
     school_id=Depends(get_active_school_id),
+    jobs: Optional[JobLauncher] = Depends(get_job_launcher),
 ) -> dict[str, int]:
+    if jobs is not None:
+        return jobs.launch("import_export.staff", {"filename": file.filename}, payload=file.file.read())
     rows = _read_csv(file)
     now = datetime.now(timezone.utc)
     created = 0
-    for r in rows:
+    for i, r in enumerate(rows):
+        report_progress(i, len(rows))
         full_name = r.get("full_name") or r.get("fullName") or ""
         if not full_name:
             continue
@@ -111,6 +109,7 @@ def import_staff(
         )
         db.add(st)
         created += 1
+    adjust_school_rollup(db, school_id, staff=created)
     db.commit()
     return {"created": created}
 
@@ -120,11 +119,15 @@ def import_fee_structures(
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
     school_id=Depends(get_active_school_id),
+    jobs: Optional[JobLauncher] = Depends(get_job_launcher),
 ) -> dict[str, int]:
+    if jobs is not None:
+        return jobs.launch("import_export.fee_structures", {"filename": file.filename}, payload=file.file.read())
     rows = _read_csv(file)
     now = datetime.now(timezone.utc)
     created = 0
-    for r in rows:
+    for i, r in enumerate(rows):
+        report_progress(i, len(rows))
         year_id = r.get("academic_year_id") or ""
         class_id = r.get("class_id") or ""
         name = r.get("name") or ""
@@ -156,11 +159,16 @@ def import_marks(
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
     school_id=Depends(get_active_school_id),
+    jobs: Optional[JobLauncher] = Depends(get_job_launcher),
 ) -> dict[str, int]:
+    if jobs is not None:
+        return jobs.launch("import_export.marks", {"filename": file.filename}, payload=file.file.read())
     rows = _read_csv(file)
     now = datetime.now(timezone.utc)
     created = 0
-    for r in rows:
+    touched: dict[uuid.UUID, set[uuid.UUID]] = defaultdict(set)
+    for i, r in enumerate(rows):
+        report_progress(i, len(rows))
         sched_id = r.get("exam_schedule_id") or ""
         student_id = r.get("student_id") or ""
         if not (sched_id and student_id):
@@ -186,24 +194,35 @@ def import_marks(
             created_at=now,
         )
         db.add(m)
+        touched[sched.exam_id].add(student.id)
         created += 1
+    for exam_id, student_ids in touched.items():
+        refresh_student_results(db, school_id=school_id, exam_id=exam_id, student_ids=student_ids)
     db.commit()
     return {"created": created}
 
 
+def _import_job(endpoint):
+    def handler(ctx: JobContext) -> dict:
+        upload = UploadFile(io.BytesIO(ctx.payload or b""), filename=ctx.params.get("filename"))
+        ctx.total = (ctx.payload or b"").count(b"\n")
+        return endpoint(file=upload, db=ctx.db, school_id=ctx.school_id, jobs=None)
+
+    return handler
+
+
+job_handler("import_export.students", permission="import_export:write", needs_upload=True)(_import_job(import_students))
+job_handler("import_export.staff", permission="import_export:write", needs_upload=True)(_import_job(import_staff))
+job_handler("import_export.fee_structures", permission="import_export:write", needs_upload=True)(_import_job(import_fee_structures))
+job_handler("import_export.marks", permission="import_export:write", needs_upload=True)(_import_job(import_marks))
+
+
 @router.get("/export/students")
 def export_students(
     format: str = "excel",
-    db: Session = Depends(get_db),
     school_id=Depends(get_active_school_id),
 ) -> StreamingResponse:
-    rows = db.execute(select(Student).where(Student.school_id == school_id).order_by(Student.created_at.asc())).scalars().all()
-    buf = io.StringIO()
-    w = csv.writer(buf)
-    w.writerow(["first_name", "last_name", "admission_no", "gender", "date_of_birth", "status", "photo_url"])
-    for s in rows:
-        w.writerow([s.first_name, s.last_name or "", s.admission_no or "", s.gender or "", s.date_of_birth or "", s.status, s.photo_url or ""])
-    return _csv_response("students.csv", buf.getvalue())
+    return export_students_csv(school_id)
 
 
 @router.get("/export/staff")
@@ -234,11 +253,10 @@ def export_attendance(
     rows = (
         db.execute(
             select(StudentAttendance)
-            .join(Student, Student.id == StudentAttendance.student_id)
             .where(
-                Student.school_id == school_id,
-                StudentAttendance.attendance_date >= datetime.combine(start, datetime.min.time(), tzinfo=timezone.utc),
-                StudentAttendance.attendance_date <= datetime.combine(end, datetime.max.time(), tzinfo=timezone.utc),
+                StudentAttendance.school_id == school_id,
+                StudentAttendance.attendance_day >= start,
+                StudentAttendance.attendance_day <= end,
             )
             .order_by(StudentAttendance.attendance_date.asc())
         )
@@ -0,0 +1,152 @@
+import json
+import uuid
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.api.deps import Principal, get_active_school_id, get_principal
+from app.core.jobs import TERMINAL_STATUSES, cancel_job, enqueue_job, get_job_spec, is_stale, retry_job
+from app.core.problems import forbidden, not_found, problem
+from app.db.session import get_db
+from app.models.job import Job
+from app.schemas.jobs import JobCreate, JobOut
+
+router = APIRouter()
+
+
+def _out(j: Job) -> JobOut:
+    return JobOut(
+        id=j.id,
+        school_id=j.school_id,
+        created_by_user_id=j.created_by_user_id,
+        kind=j.kind,
+        status=j.status,
+        progress=j.progress,
+        result=json.loads(j.result) if j.result else None,
+        error=j.error,
+        attempts=j.attempts,
+        max_attempts=j.max_attempts,
+        cancel_requested=j.cancel_requested,
+        created_at=j.created_at,
+        started_at=j.started_at,
+        finished_at=j.finished_at,
+    )
+
+
+def _require_kind_permission(principal: Principal, kind: str) -> None:
+    if principal.school_error:
+        raise forbidden(principal.school_error)
+    spec = get_job_spec(kind)
+    if spec is None:
+        raise problem(status_code=400, title="Bad Request", detail=f"Unknown job kind: {kind}")
+    if not principal.has_permission(spec.permission):
+        raise forbidden("Missing required permission")
+
+
+def _get_job(db: Session, principal: Principal, school_id: uuid.UUID, job_id: uuid.UUID) -> Job:
+    job = db.get(Job, job_id)
+    if not job or job.school_id != school_id:
+        raise not_found("Job not found")
+    _require_kind_permission(principal, job.kind)
+    return job
+
+
+class JobLauncher:
+    """Enqueues the calling endpoint's work as a job and answers 202 with the job."""
+
+    def __init__(self, db: Session, *, school_id: uuid.UUID, user_id: uuid.UUID) -> None:
+        self.db = db
+        self.school_id = school_id
+        self.user_id = user_id
+
+    def launch(self, kind: str, params: Optional[dict[str, Any]] = None, payload: Optional[bytes] = None) -> JSONResponse:
+        job = enqueue_job(self.db, kind=kind, school_id=self.school_id, user_id=self.user_id, params=params, payload=payload)
+        return JSONResponse(status_code=202, content=jsonable_encoder(_out(job)))
+
+
+def get_job_launcher(
+    background: bool = False,
+    db: Session = Depends(get_db),
+    principal: Principal = Depends(get_principal),
+    school_id=Depends(get_active_school_id),
+) -> Optional[JobLauncher]:
+    if not background:
+        return None
+    return JobLauncher(db, school_id=school_id, user_id=principal.user.id)
+
+
+@router.get("", response_model=list[JobOut])
+def list_jobs(
+    kind: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: int = 50,
+    db: Session = Depends(get_db),
+    principal: Principal = Depends(get_principal),
+    school_id=Depends(get_active_school_id),
+) -> list[JobOut]:
+    if principal.school_error:
+        raise forbidden(principal.school_error)
+    q = select(Job).where(Job.school_id == school_id)
+    if kind:
+        _require_kind_permission(principal, kind)
+        q = q.where(Job.kind == kind)
+    else:
+        q = q.where(Job.created_by_user_id == principal.user.id)
+    if status:
+        q = q.where(Job.status == status)
+    rows = db.execute(q.order_by(Job.created_at.desc()).limit(max(1, min(limit, 200)))).scalars().all()
+    return [_out(j) for j in rows]
+
+
+@router.post("", response_model=JobOut, status_code=202)
+def create_job(
+    payload: JobCreate,
+    db: Session = Depends(get_db),
+    principal: Principal = Depends(get_principal),
+    school_id=Depends(get_active_school_id),
+) -> JobOut:
+    _require_kind_permission(principal, payload.kind)
+    if get_job_spec(payload.kind).needs_upload:
+        raise problem(status_code=400, title="Bad Request", detail="This job kind needs a file; use its import endpoint with ?background=true")
+    job = enqueue_job(db, kind=payload.kind, school_id=school_id, user_id=principal.user.id, params=payload.params)
+    return _out(job)
+
+
+@router.get("/{job_id}", response_model=JobOut)
+def get_job(
+    job_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    principal: Principal = Depends(get_principal),
+    school_id=Depends(get_active_school_id),
+) -> JobOut:
+    return _out(_get_job(db, principal, school_id, job_id))
+
+
+@router.post("/{job_id}/cancel", response_model=JobOut)
+def cancel(
+    job_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    principal: Principal = Depends(get_principal),
+    school_id=Depends(get_active_school_id),
+) -> JobOut:
+    job = _get_job(db, principal, school_id, job_id)
+    if job.status in TERMINAL_STATUSES:
+        raise problem(status_code=409, title="Conflict", detail=f"Job already {job.status}")
+    return _out(cancel_job(db, job))
+
+
+@router.post("/{job_id}/retry", response_model=JobOut, status_code=202)
+def retry(
+    job_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    principal: Principal = Depends(get_principal),
+    school_id=Depends(get_active_school_id),
+) -> JobOut:
+    job = _get_job(db, principal, school_id, job_id)
+    if job.status not in ("failed", "cancelled") and not is_stale(job):
+        raise problem(status_code=409, title="Conflict", detail="Only failed, cancelled or stale running jobs can be retried")
+    return _out(retry_job(db, job))
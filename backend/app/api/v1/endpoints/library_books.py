@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 
 from app.api.deps import get_active_school_id, require_permission
 from app.core.problems import not_found, not_implemented, problem
+from app.core.search import apply_search
 from app.db.session import get_db
 from app.models.library_book import LibraryBook
 from app.models.library_issue import LibraryIssue
@@ -37,13 +38,9 @@ def search_books(
     db: Session = Depends(get_db),
     school_id=Depends(get_active_school_id),
 ) -> list[LibraryBookOut]:
-    q = select(LibraryBook).where(LibraryBook.school_id == school_id)
-    q = q.where(
-        (LibraryBook.title.ilike(f"%{query}%"))
-        | (LibraryBook.author.ilike(f"%{query}%"))
-        | (LibraryBook.isbn.ilike(f"%{query}%"))
-    )
-    rows = db.execute(q.order_by(LibraryBook.created_at.desc()).limit(50)).scalars().all()
+    q, rank = apply_search(db, select(LibraryBook).where(LibraryBook.school_id == school_id), "library_books", query)
+    order = [LibraryBook.created_at.desc()] if rank is None else [rank, LibraryBook.created_at.desc()]
+    rows = db.execute(q.order_by(*order).limit(50)).scalars().all()
     return [_out(b) for b in rows]
 
 
@@ -71,10 +68,12 @@ def list_books(
         base = base.where(LibraryBook.category == category)
     if isbn:
         base = base.where(LibraryBook.isbn == isbn)
+    rank = None
     if search:
-        base = base.where((LibraryBook.title.ilike(f"%{search}%")) | (LibraryBook.author.ilike(f"%{search}%")))
+        base, rank = apply_search(db, base, "library_books", search)
     total = db.scalar(select(func.count()).select_from(base.subquery())) or 0
-    rows = db.execute(base.order_by(LibraryBook.created_at.desc()).offset(offset).limit(limit)).scalars().all()
+    order = [LibraryBook.created_at.desc()] if rank is None else [rank, LibraryBook.created_at.desc()]
+    rows = db.execute(base.order_by(*order).offset(offset).limit(limit)).scalars().all()
     return {"items": [_out(b).model_dump() for b in rows], "total": int(total), "page": page, "limit": limit}
 
 
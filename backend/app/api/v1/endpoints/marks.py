@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 
 from app.api.deps import get_active_school_id, require_permission
 from app.core.problems import not_found, problem
+from app.core.results import refresh_student_results
 from app.db.session import get_db
 from app.models.academic_year import AcademicYear
 from app.models.exam import Exam
@@ -118,6 +119,7 @@ def enter_marks(
             db.add(m)
             db.flush()
             out.append(_out(m))
+    refresh_student_results(db, school_id=school_id, exam_id=sched.exam_id, student_ids=[i.student_id for i in payload.items])
     db.commit()
     return out
 
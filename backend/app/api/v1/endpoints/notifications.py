@@ -7,6 +7,7 @@ from sqlalchemy import func, select, update
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_active_school_id, get_current_user, require_permission
+from app.core.pagination import keyset_page
 from app.core.problems import not_found
 from app.db.session import get_db
 from app.models.membership import Membership
@@ -45,12 +46,20 @@ def get_my_notifications(
     is_read: Optional[bool] = None,
     page: int = 1,
     limit: int = 20,
+    cursor: Optional[str] = None,
+    with_total: bool = False,
 ) -> dict:
+    """Newest first; pages by keyset on (created_at, id) when cursor is given (empty for the first page)."""
     _ensure_membership(db, user.id, school_id)
     offset = (page - 1) * limit if page > 1 else 0
     base = select(Notification).where(Notification.school_id == school_id, Notification.user_id == user.id)
     if is_read is not None:
         base = base.where(Notification.is_read.is_(is_read))
+    if cursor is not None:
+        result = keyset_page(
+            db, base, keys=(Notification.created_at, Notification.id), cursor=cursor, limit=limit, descending=True, with_total=with_total
+        )
+        return result.response([_out(n).model_dump() for n in result.rows])
     total = db.scalar(select(func.count()).select_from(base.subquery())) or 0
     rows = db.execute(base.order_by(Notification.created_at.desc()).offset(offset).limit(limit)).scalars().all()
     return {"items": [_out(n).model_dump() for n in rows], "total": int(total), "page": page, "limit": limit}
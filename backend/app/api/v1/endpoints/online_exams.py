@@ -9,8 +9,9 @@ from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_active_school_id, get_current_user, require_permission
-from app.core.audit import write_audit_log
+from app.core.audit import enqueue_audit_log, write_audit_log
 from app.core.problems import forbidden, not_found, problem
+from app.core.results import refresh_student_results
 from app.db.session import get_db
 from app.models.academic_year import AcademicYear
 from app.models.enrollment import Enrollment
@@ -631,8 +632,9 @@ def start_online_exam(
         user_agent=user_agent,
     )
     db.add(a)
-    write_audit_log(
-        db,
+    db.commit()
+    db.refresh(a)
+    enqueue_audit_log(
         school_id=school_id,
         action="online_exam_attempt.start",
         user_id=user.id,
@@ -640,8 +642,6 @@ def start_online_exam(
         entity_id=str(a.id),
         details=f"config_id={cfg.id}",
     )
-    db.commit()
-    db.refresh(a)
 
     rows = db.execute(
         select(QuestionBankQuestion)
@@ -814,9 +814,11 @@ def submit_online_exam_attempt(
                 created_at=now,
             )
         )
+    refresh_student_results(db, school_id=school_id, exam_id=sched.exam_id, student_ids=[student.id])
 
-    write_audit_log(
-        db,
+    db.commit()
+    db.refresh(a)
+    enqueue_audit_log(
         school_id=school_id,
         action="online_exam_attempt.submit",
         user_id=user.id,
@@ -824,8 +826,6 @@ def submit_online_exam_attempt(
         entity_id=str(a.id),
         details=f"score={a.score};max_score={a.max_score};pct={a.percentage}",
     )
-    db.commit()
-    db.refresh(a)
     return OnlineExamSubmitResponse(attempt=_attempt_out(a))
 
 
@@ -852,8 +852,8 @@ def create_online_exam_proctor_event(
         created_at=now,
     )
     db.add(e)
-    write_audit_log(
-        db,
+    db.commit()
+    enqueue_audit_log(
         school_id=school_id,
         action="online_exam_proctor_event.create",
         user_id=user.id,
@@ -861,7 +861,6 @@ def create_online_exam_proctor_event(
         entity_id=str(a.id),
         details=payload.event_type,
     )
-    db.commit()
     return {"status": "ok"}
 
 
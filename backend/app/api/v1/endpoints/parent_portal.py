@@ -224,7 +224,7 @@ def child_dashboard(
     today = date.today()
     today_attendance = db.scalar(
         select(StudentAttendance)
-        .where(StudentAttendance.student_id == student_id, func.date(StudentAttendance.attendance_date) == today)
+        .where(StudentAttendance.student_id == student_id, StudentAttendance.attendance_day == today)
         .order_by(StudentAttendance.created_at.desc())
     )
     overview["attendance_today"] = (today_attendance.status if today_attendance else None)
@@ -257,14 +257,14 @@ def attendance_month(
         db.execute(
             select(StudentAttendance).where(
                 StudentAttendance.student_id == student_id,
-                StudentAttendance.attendance_date >= datetime.combine(start, datetime.min.time(), tzinfo=timezone.utc),
-                StudentAttendance.attendance_date < datetime.combine(end, datetime.min.time(), tzinfo=timezone.utc),
+                StudentAttendance.attendance_day >= start,
+                StudentAttendance.attendance_day < end,
             )
         )
         .scalars()
         .all()
     )
-    return [{"date": r.attendance_date.date().isoformat(), "status": r.status} for r in rows]
+    return [{"date": r.attendance_day.isoformat(), "status": r.status} for r in rows]
 
 
 @router.get("/attendance/{student_id}/excuses", response_model=list[AttendanceExcuseOut])
@@ -10,6 +10,7 @@ from app.api.deps import require_platform_admin, require_saas_admin_host
 from app.core.problems import not_found, problem
 from app.core.security import hash_password
 from app.core.seed import ensure_default_roles
+from app.core.tenant_cache import invalidate_tenant
 from app.db.session import get_db
 from app.models.membership import Membership
 from app.models.refresh_token import RefreshToken
@@ -123,6 +124,7 @@ def provision_tenant(payload: TenantProvisionRequest, db: Session = Depends(get_
     db.add(Membership(user_id=admin_user.id, school_id=school.id, role_id=role.id, is_active=True, created_at=now))
     db.commit()
     db.refresh(tenant)
+    invalidate_tenant(tenant_id=tenant.id, subdomain=tenant.subdomain)
 
     return TenantProvisionResponse(tenant=TenantOut.model_validate(tenant), school_id=school.id, admin_user_id=admin_user.id)
 
@@ -139,6 +141,7 @@ def update_tenant_status(tenant_id: uuid.UUID, payload: TenantStatusUpdate, db:
     tenant.updated_at = datetime.now(timezone.utc)
     db.commit()
     db.refresh(tenant)
+    invalidate_tenant(tenant_id=tenant.id, subdomain=tenant.subdomain)
     return TenantOut.model_validate(tenant)
 
 
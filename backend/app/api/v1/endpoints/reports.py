@@ -7,6 +7,9 @@ from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_active_school_id, require_permission
+from app.core.attendance import attendance_status_days
+from app.core.attendance_stats import attendance_rates, attendance_window
+from app.core.config import settings
 from app.core.problems import not_found, not_implemented
 from app.db.session import get_db
 from app.models.academic_year import AcademicYear
@@ -38,8 +41,7 @@ def daily_attendance_report(
     d = _dt(report_date)
     student_rows = db.execute(
         select(StudentAttendance.status, func.count())
-        .join(Student, Student.id == StudentAttendance.student_id)
-        .where(Student.school_id == school_id, StudentAttendance.attendance_date == d)
+        .where(StudentAttendance.school_id == school_id, StudentAttendance.attendance_day == report_date)
         .group_by(StudentAttendance.status)
     ).all()
     staff_rows = db.execute(
@@ -64,12 +66,8 @@ def monthly_attendance_report(
 ) -> dict:
     start = date(year, month, 1)
     end = (start.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
-    student_rows = db.execute(
-        select(StudentAttendance.status, func.count())
-        .join(Student, Student.id == StudentAttendance.student_id)
-        .where(Student.school_id == school_id, StudentAttendance.attendance_date >= _dt(start), StudentAttendance.attendance_date <= _dt(end))
-        .group_by(StudentAttendance.status)
-    ).all()
+    days = attendance_status_days(school_id, start, end)
+    student_rows = db.execute(select(days.c.status, func.sum(days.c.days)).group_by(days.c.status)).all()
     staff_rows = db.execute(
         select(StaffAttendance.status, func.count())
         .join(Staff, Staff.id == StaffAttendance.staff_id)
@@ -97,12 +95,11 @@ def class_attendance_report(
         raise not_found("Class not found")
     rows = db.execute(
         select(StudentAttendance.status, func.count())
-        .join(Student, Student.id == StudentAttendance.student_id)
         .where(
-            Student.school_id == school_id,
+            StudentAttendance.school_id == school_id,
             StudentAttendance.class_id == class_id,
-            StudentAttendance.attendance_date >= _dt(start_date),
-            StudentAttendance.attendance_date <= _dt(end_date),
+            StudentAttendance.attendance_day >= start_date,
+            StudentAttendance.attendance_day <= end_date,
         )
         .group_by(StudentAttendance.status)
     ).all()
@@ -111,39 +108,25 @@ def class_attendance_report(
 
 @router.get("/attendance/defaulters")
 def attendance_defaulters_report(
-    threshold: int = 75,
+    threshold: int = settings.attendance_defaulter_threshold,
+    window_days: Optional[int] = None,
+    class_id: Optional[uuid.UUID] = None,
+    section_id: Optional[uuid.UUID] = None,
     db: Session = Depends(get_db),
     school_id=Depends(get_active_school_id),
 ) -> list[dict]:
-    window_end = date.today()
-    window_start = window_end - timedelta(days=30)
-    total_by_student = db.execute(
-        select(StudentAttendance.student_id, func.count())
-        .join(Student, Student.id == StudentAttendance.student_id)
-        .where(Student.school_id == school_id, StudentAttendance.attendance_date >= _dt(window_start), StudentAttendance.attendance_date <= _dt(window_end))
-        .group_by(StudentAttendance.student_id)
-    ).all()
-    present_by_student = db.execute(
-        select(StudentAttendance.student_id, func.count())
-        .join(Student, Student.id == StudentAttendance.student_id)
-        .where(
-            Student.school_id == school_id,
-            StudentAttendance.status == "present",
-            StudentAttendance.attendance_date >= _dt(window_start),
-            StudentAttendance.attendance_date <= _dt(window_end),
-        )
-        .group_by(StudentAttendance.student_id)
-    ).all()
-    present_map = {sid: int(cnt) for sid, cnt in present_by_student}
+    start, end = attendance_window(window_days=window_days)
+    rates = attendance_rates(db, school_id, start=start, end=end, class_id=class_id, section_id=section_id)
+    # This report has always published whole percentages and compared the
+    # threshold against them; /attendance/students/defaulters carries the
+    # two-decimal figures.
     out: list[dict] = []
-    for sid, total in total_by_student:
-        total_i = int(total)
-        if total_i <= 0:
+    for r in rates:
+        if r.total <= 0:
             continue
-        present_i = present_map.get(sid, 0)
-        pct = int(round(present_i / total_i * 100.0))
+        pct = int(round(r.present / r.total * 100.0))
         if pct < threshold:
-            out.append({"student_id": str(sid), "attendance_pct": pct, "present": present_i, "total": total_i})
+            out.append({"student_id": str(r.student_id), "attendance_pct": pct, "present": r.present, "total": r.total})
     out.sort(key=lambda x: x["attendance_pct"])
     return out
 
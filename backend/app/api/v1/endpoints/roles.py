@@ -5,6 +5,7 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.api.deps import require_permission
+from app.core.permission_cache import invalidate_permissions
 from app.core.problems import not_found, problem
 from app.db.session import get_db
 from app.models.role import Role
@@ -60,6 +61,7 @@ def delete_role(role_id: uuid.UUID, db: Session = Depends(get_db)) -> dict[str,
         raise not_found("Role not found")
     db.delete(role)
     db.commit()
+    invalidate_permissions()
     return {"status": "ok"}
 
 
@@ -78,5 +80,6 @@ def update_role_permissions(role_id: uuid.UUID, payload: RolePermissionsUpdate,
         raise not_found("Role not found")
     role.permissions = payload.permissions or {}
     db.commit()
+    invalidate_permissions()
     return role.permissions or {}
 
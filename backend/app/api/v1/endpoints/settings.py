@@ -7,6 +7,7 @@ from sqlalchemy.orm import Session
 
 from app.api.deps import get_active_school_id, require_permission
 from app.core.problems import not_found
+from app.core.school_settings import invalidate_school_settings
 from app.db.session import get_db
 from app.models.setting import Setting
 from app.schemas.settings import SettingOut, SettingUpdate
@@ -50,6 +51,7 @@ def update_setting(
     s.value = payload.value
     s.updated_at = datetime.now(timezone.utc)
     db.commit()
+    invalidate_school_settings(school_id)
     return _out(s)
 
 
@@ -10,7 +10,10 @@ from sqlalchemy import func, select, delete
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_active_school_id, require_permission
+from app.core.pagination import keyset_page
 from app.core.problems import not_found, not_implemented, problem
+from app.core.rollups import adjust_school_rollup
+from app.core.search import apply_search
 from app.db.session import get_db
 from app.models.document import Document
 from app.models.school import School
@@ -112,7 +115,10 @@ def list_staff(
     department: Optional[str] = None,
     search: Optional[str] = None,
     status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    with_total: bool = False,
 ) -> dict:
+    """Pages with page/limit, or by keyset on (full_name, id) when cursor is given (empty for the first page)."""
     offset = (page - 1) * limit if page > 1 else 0
     base = select(Staff).where(Staff.school_id == school_id)
     if designation:
@@ -121,14 +127,15 @@ def list_staff(
         base = base.where(Staff.department == department)
     if status:
         base = base.where(Staff.status == status)
+    rank = None
     if search:
-        base = base.where(
-            Staff.full_name.ilike(f"%{search}%")
-            | Staff.email.ilike(f"%{search}%")
-            | Staff.phone.ilike(f"%{search}%")
-        )
+        base, rank = apply_search(db, base, "staff", search)
+    if cursor is not None:
+        result = keyset_page(db, base, keys=(Staff.full_name, Staff.id), cursor=cursor, limit=limit, with_total=with_total)
+        return result.response([_out(r).model_dump() for r in result.rows])
     total = db.scalar(select(func.count()).select_from(base.subquery())) or 0
-    rows = db.execute(base.order_by(Staff.full_name.asc()).offset(offset).limit(limit)).scalars().all()
+    order = [Staff.full_name.asc()] if rank is None else [rank, Staff.full_name.asc()]
+    rows = db.execute(base.order_by(*order).offset(offset).limit(limit)).scalars().all()
     return {"items": [_out(r).model_dump() for r in rows], "total": int(total), "page": page, "limit": limit}
 
 
@@ -216,6 +223,7 @@ def create_staff(payload: StaffCreate, db: Session = Depends(get_db), school_id=
         created_at=now,
     )
     db.add(s)
+    adjust_school_rollup(db, school_id, staff=1)
     db.commit()
     db.refresh(s)
     
@@ -333,6 +341,7 @@ def delete_staff(staff_id: uuid.UUID, db: Session = Depends(get_db), school_id=D
     db.execute(delete(Document).where(Document.entity_id == str(staff_id), Document.entity_type == "staff"))
 
     db.delete(s)
+    adjust_school_rollup(db, school_id, staff=-1)
     db.commit()
     return {"status": "ok"}
 
@@ -1,28 +1,34 @@
 import uuid
-import csv
-import io
-import html
-import json
-import segno
 from datetime import date, datetime, time, timezone
 from typing import Optional
 
 from fastapi import APIRouter, Depends, File, UploadFile
 from fastapi.responses import StreamingResponse
 from sqlalchemy import func, select, delete
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, defer
 
 from app.api.deps import get_active_school_id, get_current_user, require_permission, get_current_tenant_id
+from app.api.v1.endpoints.jobs import JobLauncher, get_job_launcher
+from app.core.admission_numbers import admission_number_config, allocate_admission_numbers, reserve_admission_numbers
+from app.core.attendance_stats import invalidate_attendance_stats
+from app.core.config import settings as app_settings
+from app.core.csv_export import export_students_csv
+from app.core.id_cards import current_year, id_card_for, iter_id_card_document, load_id_card_context, render_id_card
+from app.core.jobs import JobContext, job_handler
+from app.core.pagination import keyset_page
+from app.core.promotions import promote_enrollments
 from app.core.problems import not_found, problem
+from app.core.rollups import adjust_school_rollup, refresh_school_rollup
+from app.core.school_settings import get_student_settings
+from app.core.search import apply_search
+from app.core.student_import import import_students, iter_csv_records
 from app.db.session import get_db
 from app.models.document import Document
 from app.models.academic_year import AcademicYear
 from app.models.enrollment import Enrollment
 from app.models.guardian import Guardian
-from app.models.school import School
 from app.models.school_class import SchoolClass
 from app.models.section import Section
-from app.models.setting import Setting
 from app.models.student import Student
 from app.models.student_guardian import StudentGuardian
 from app.models.teacher_assignment import StudentAttendance
@@ -51,56 +57,6 @@ def _out(s: Student) -> StudentOut:
     return StudentOut.model_validate(s)
 
 
-def _get_student_settings(db: Session, school_id: uuid.UUID) -> dict:
-    """Load and parse student settings from database"""
-    setting = db.scalar(
-        select(Setting).where(
-            Setting.school_id == school_id,
-            Setting.key == "students.settings"
-        )
-    )
-    if not setting or not setting.value or not setting.value.strip():
-        return {}  # Return empty dict to use defaults
-    try:
-        return json.loads(setting.value)
-    except (json.JSONDecodeError, ValueError):
-        return {}
-
-
-def _generate_admission_no(db: Session, school_id: uuid.UUID) -> Optional[str]:
-    """Generate admission number based on settings"""
-    settings = _get_student_settings(db, school_id)
-    
-    # Check if auto-generation is enabled
-    if not settings.get("auto_generate_admission_no", True):
-        return None
-    
-    # Get prefix and start number from settings
-    prefix = settings.get("admission_no_prefix", "STU").strip()
-    start_from = int(settings.get("admission_no_start_from", 1001))
-    
-    # Find the highest existing number with this prefix
-    max_admission = db.scalar(
-        select(func.max(Student.admission_no))
-        .where(
-            Student.school_id == school_id,
-            Student.admission_no.like(f"{prefix}%")
-        )
-    )
-    
-    if max_admission and max_admission.startswith(prefix):
-        try:
-            # Extract number part after prefix
-            number_part = max_admission[len(prefix):]
-            last_num = int(number_part)
-            next_num = last_num + 1
-        except (ValueError, IndexError):
-            next_num = start_from
-    else:
-        next_num = start_from
-    
-    return f"{prefix}{next_num}"
-
 @router.get("", response_model=dict)
 def list_students(
     db: Session = Depends(get_db),
@@ -114,44 +70,112 @@ def list_students(
     search: Optional[str] = None,
     status: Optional[str] = None,
     gender: Optional[str] = None,
+    cursor: Optional[str] = None,
+    with_total: bool = False,
 ) -> dict:
+    """Pages with page/limit, or by keyset on (first_name, id) when cursor is given (empty for the first page)."""
     offset = (page - 1) * limit if page > 1 else 0
 
     base = select(Student).where(Student.school_id == school_id)
     if tenant_id:
         base = base.where(Student.tenant_id == tenant_id)
+    rank = None
     if search:
-        base = base.where(
-            (Student.first_name.ilike(f"%{search}%"))
-            | (Student.last_name.ilike(f"%{search}%"))
-            | (Student.admission_no.ilike(f"%{search}%"))
-        )
+        base, rank = apply_search(db, base, "students", search)
     if status:
         base = base.where(Student.status == status)
     if gender:
         base = base.where(Student.gender == gender)
     if class_id or section_id:
-        base = base.join(Enrollment, Enrollment.student_id == Student.id)
+        enrolled = select(Enrollment.student_id).where(Enrollment.status == "active")
         if academic_year_id is None:
             current_year_id = db.scalar(
                 select(AcademicYear.id).where(AcademicYear.school_id == school_id, AcademicYear.is_current.is_(True)).limit(1)
             )
             academic_year_id = current_year_id
         if academic_year_id is not None:
-            base = base.where(Enrollment.academic_year_id == academic_year_id)
-        base = base.where(Enrollment.status == "active")
+            enrolled = enrolled.where(Enrollment.academic_year_id == academic_year_id)
         if class_id:
-            base = base.where(Enrollment.class_id == class_id)
+            enrolled = enrolled.where(Enrollment.class_id == class_id)
         if section_id:
-            base = base.where(Enrollment.section_id == section_id)
-
-        base = base.distinct()
+            enrolled = enrolled.where(Enrollment.section_id == section_id)
+        base = base.where(Student.id.in_(enrolled))
 
+    if cursor is not None:
+        result = keyset_page(db, base, keys=(Student.first_name, Student.id), cursor=cursor, limit=limit, with_total=with_total)
+        return result.response([_out(s).model_dump() for s in result.rows])
     total = db.scalar(select(func.count()).select_from(base.subquery())) or 0
-    rows = db.execute(base.order_by(Student.first_name.asc()).offset(offset).limit(limit)).scalars().all()
+    order = [Student.first_name.asc()] if rank is None else [rank, Student.first_name.asc()]
+    rows = db.execute(base.order_by(*order).offset(offset).limit(limit)).scalars().all()
     return {"items": [_out(s).model_dump() for s in rows], "total": int(total), "page": page, "limit": limit}
 
 
+@router.get("/export")
+def export_students(
+    school_id=Depends(get_active_school_id),
+) -> StreamingResponse:
+    return export_students_csv(school_id)
+
+
+@router.get("/id-cards")
+def generate_id_cards(
+    class_id: uuid.UUID,
+    section_id: Optional[uuid.UUID] = None,
+    academic_year_id: Optional[uuid.UUID] = None,
+    per_page: int = 4,
+    db: Session = Depends(get_db),
+    school_id=Depends(get_active_school_id),
+) -> StreamingResponse:
+    """One printable document with the ID cards of every active student in a class or section."""
+    c = db.get(SchoolClass, class_id)
+    if not c or c.school_id != school_id:
+        raise not_found("Class not found")
+    if academic_year_id is not None:
+        year = db.get(AcademicYear, academic_year_id)
+        if not year or year.school_id != school_id:
+            raise not_found("Academic year not found")
+    else:
+        year = current_year(db, school_id)
+        if not year:
+            raise problem(status_code=400, title="Bad Request", detail="No current academic year")
+    if section_id is not None:
+        sec = db.get(Section, section_id)
+        if not sec or sec.class_id != class_id:
+            raise not_found("Section not found")
+
+    stmt = (
+        select(Student, Enrollment.section_id, Enrollment.roll_number)
+        .join(Enrollment, Enrollment.student_id == Student.id)
+        .where(
+            Student.school_id == school_id,
+            Enrollment.academic_year_id == year.id,
+            Enrollment.class_id == class_id,
+            Enrollment.status == "active",
+        )
+        .order_by(Enrollment.section_id, Enrollment.roll_number, Student.first_name, Student.id)
+    )
+    if section_id is not None:
+        stmt = stmt.where(Enrollment.section_id == section_id)
+    rows = db.execute(stmt).all()
+    section_names = dict(db.execute(select(Section.id, Section.name).where(Section.class_id == class_id)).all())
+    cards = [
+        id_card_for(s, class_name=c.name, section_name=section_names.get(sec_id, ""), roll_number=roll)
+        for s, sec_id, roll in rows
+    ]
+    ctx = load_id_card_context(db, school_id, year)
+    document = iter_id_card_document(
+        ctx,
+        cards,
+        title=f"ID Cards - {c.name}",
+        per_page=max(1, min(per_page, 10)),
+        workers=app_settings.id_card_render_workers,
+    )
+    headers = {"Content-Disposition": f'attachment; filename="id_cards_{class_id}.html"'}
+    return StreamingResponse(
+        (chunk.encode("utf-8") for chunk in document), media_type="text/html; charset=utf-8", headers=headers
+    )
+
+
 @router.get("/{student_id}", response_model=StudentOut)
 def get_student(student_id: uuid.UUID, db: Session = Depends(get_db), school_id=Depends(get_active_school_id)) -> StudentOut:
     s = db.get(Student, student_id)
@@ -180,7 +204,7 @@ def create_student(payload: StudentCreate, db: Session = Depends(get_db), school
     now = datetime.now(timezone.utc)
     
     # Load student settings
-    settings = _get_student_settings(db, school_id)
+    settings = get_student_settings(db, school_id)
     
     # Validate vaccination records if required
     if settings.get("require_vaccination_records", False):
@@ -191,8 +215,15 @@ def create_student(payload: StudentCreate, db: Session = Depends(get_db), school
                 detail="Vaccination status is required by school policy"
             )
     
-    # Handle admission number
+    # Handle admission number: reserve manual ones, allocate from the school's sequence otherwise
     admission_no = payload.admission_no.strip() if payload.admission_no else None
+    numbering = admission_number_config(settings)
+    if numbering is not None:
+        prefix, start_from = numbering
+        if admission_no:
+            reserve_admission_numbers(db, school_id, prefix=prefix, start_from=start_from, admission_nos=[admission_no])
+        else:
+            admission_no = allocate_admission_numbers(db, school_id, prefix=prefix, start_from=start_from)[0]
     
     # Determine admission status based on settings
     admission_status = payload.admission_status
@@ -268,15 +299,9 @@ def create_student(payload: StudentCreate, db: Session = Depends(get_db), school
         created_at=now,
     )
     db.add(s)
+    adjust_school_rollup(db, school_id, students=1)
     db.commit()
     db.refresh(s)
-    
-    # Auto-generate admission number using settings
-    if not s.admission_no:
-        s.admission_no = _generate_admission_no(db, school_id)
-        if s.admission_no:
-            db.commit()
-            db.refresh(s)
 
     # Create/Link User if portal access is enabled
     if s.portal_access_student and not s.user_id:
@@ -320,8 +345,14 @@ def update_student(
     s = db.get(Student, student_id)
     if not s or s.school_id != school_id:
         raise not_found("Student not found")
-    for k, v in payload.model_dump(exclude_unset=True).items():
+    changes = payload.model_dump(exclude_unset=True)
+    for k, v in changes.items():
         setattr(s, k, v)
+    if changes.get("admission_no"):
+        numbering = admission_number_config(get_student_settings(db, school_id))
+        if numbering is not None:
+            prefix, start_from = numbering
+            reserve_admission_numbers(db, school_id, prefix=prefix, start_from=start_from, admission_nos=[s.admission_no])
     
     # Auto-create User if portal access is enabled and User missing
     if s.portal_access_student and not s.user_id:
@@ -432,6 +463,8 @@ def delete_student(student_id: uuid.UUID, db: Session = Depends(get_db), school_
     db.execute(delete(StudentGuardian).where(StudentGuardian.student_id == student_id))
     from app.models.teacher_assignment import StudentAttendance
     db.execute(delete(StudentAttendance).where(StudentAttendance.student_id == student_id))
+    from app.models.attendance_summary import StudentAttendanceMonthly
+    db.execute(delete(StudentAttendanceMonthly).where(StudentAttendanceMonthly.student_id == student_id))
     from app.models.document import Document
     db.execute(delete(Document).where(Document.entity_id == str(student_id), Document.entity_type == "student"))
 
@@ -455,7 +488,9 @@ def delete_student(student_id: uuid.UUID, db: Session = Depends(get_db), school_
     
     # Finally delete student
     db.delete(s)
+    refresh_school_rollup(db, school_id)
     db.commit()
+    invalidate_attendance_stats(school_id)
     return {"status": "ok"}
 
 
@@ -532,7 +567,7 @@ def get_student_attendance(
 
 
 @router.get("/{student_id}/guardians", response_model=list[StudentGuardianResponse])
-def get_student_guardians(
+def list_student_guardians(
     student_id: uuid.UUID,
     db: Session = Depends(get_db),
     school_id=Depends(get_active_school_id),
@@ -578,13 +613,17 @@ def get_student_attendance_summary(
     db: Session = Depends(get_db),
     school_id=Depends(get_active_school_id),
 ) -> dict[str, int]:
-    rows = get_student_attendance(
-        student_id=student_id, start_date=start_date, end_date=end_date, db=db, school_id=school_id
-    )
-    counts: dict[str, int] = {}
-    for r in rows:
-        counts[r.status] = counts.get(r.status, 0) + 1
-    counts["total"] = len(rows)
+    s = db.get(Student, student_id)
+    if not s or s.school_id != school_id:
+        raise not_found("Student not found")
+
+    q = select(StudentAttendance.status, func.count()).where(StudentAttendance.student_id == student_id)
+    if start_date:
+        q = q.where(StudentAttendance.attendance_date >= datetime.combine(start_date, time.min, tzinfo=timezone.utc))
+    if end_date:
+        q = q.where(StudentAttendance.attendance_date <= datetime.combine(end_date, time.min, tzinfo=timezone.utc))
+    counts = {status: int(n) for status, n in db.execute(q.group_by(StudentAttendance.status)).all()}
+    counts["total"] = sum(counts.values())
     return counts
 
 
@@ -797,6 +836,7 @@ def get_student_documents(
     rows = (
         db.execute(
             select(Document)
+            .options(defer(Document.content))
             .where(Document.school_id == school_id, Document.entity_type == "student", Document.entity_id == str(student_id))
             .order_by(Document.created_at.desc())
         )
@@ -892,50 +932,64 @@ def get_student_timetable(
     return out
 
 
-@router.post("/bulk-import", dependencies=[Depends(require_permission("students:write"))])
-def bulk_import_students(
-    file: UploadFile = File(...),
+_OVERVIEW_SECTIONS = ("guardians", "attendance", "results", "promotions", "discipline", "documents", "timetable")
+
+
+@router.get("/{student_id}/overview")
+def get_student_overview(
+    student_id: uuid.UUID,
+    include: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
     db: Session = Depends(get_db),
     school_id=Depends(get_active_school_id),
-) -> dict[str, int]:
-    raw = file.file.read().decode("utf-8-sig")
-    reader = csv.DictReader(io.StringIO(raw))
-    now = datetime.now(timezone.utc)
-    created = 0
-    for r in reader:
-        first_name = (r.get("first_name") or "").strip()
-        if not first_name:
-            continue
-        s = Student(
-            school_id=school_id,
-            first_name=first_name,
-            last_name=(r.get("last_name") or "").strip() or None,
-            admission_no=(r.get("admission_no") or "").strip() or None,
-            gender=(r.get("gender") or "").strip() or None,
-            date_of_birth=(date.fromisoformat(r["date_of_birth"]) if (r.get("date_of_birth") or "").strip() else None),
-            status=(r.get("status") or "active").strip(),
-            photo_url=(r.get("photo_url") or "").strip() or None,
-            created_at=now,
-        )
-        db.add(s)
-        created += 1
-    db.commit()
-    return {"created": created}
+) -> dict:
+    """The student plus the requested detail sections (all of _OVERVIEW_SECTIONS by default) in one response.
+
+    start_date and end_date bound the attendance summary. Sections reuse the
+    per-section endpoints; the student is loaded once and their own lookups are
+    served from the session's identity map.
+    """
+    s = db.get(Student, student_id)
+    if not s or s.school_id != school_id:
+        raise not_found("Student not found")
+    sections = _OVERVIEW_SECTIONS
+    if include:
+        sections = tuple(dict.fromkeys(part.strip() for part in include.split(",") if part.strip()))
+        unknown = [name for name in sections if name not in _OVERVIEW_SECTIONS]
+        if unknown:
+            raise problem(status_code=400, title="Bad Request", detail=f"Unknown include: {', '.join(unknown)}")
+
+    loaders = {
+        "guardians": lambda: list_student_guardians(student_id=student_id, db=db, school_id=school_id),
+        "attendance": lambda: get_student_attendance_summary(
+            student_id=student_id, start_date=start_date, end_date=end_date, db=db, school_id=school_id
+        ),
+        "results": lambda: get_student_results(student_id=student_id, db=db, school_id=school_id),
+        "promotions": lambda: get_student_promotions(student_id=student_id, db=db, school_id=school_id),
+        "discipline": lambda: get_student_discipline(student_id=student_id, db=db, school_id=school_id),
+        "documents": lambda: get_student_documents(student_id=student_id, db=db, school_id=school_id),
+        "timetable": lambda: get_student_timetable(student_id=student_id, db=db, school_id=school_id),
+    }
+    out: dict = {"student": _out(s)}
+    for name in sections:
+        out[name] = loaders[name]()
+    return out
 
 
-@router.get("/export")
-def export_students(
+@router.post("/bulk-import", dependencies=[Depends(require_permission("students:write"))])
+def bulk_import_students(
+    file: UploadFile = File(...),
     db: Session = Depends(get_db),
     school_id=Depends(get_active_school_id),
-) -> StreamingResponse:
-    rows = db.execute(select(Student).where(Student.school_id == school_id).order_by(Student.created_at.asc())).scalars().all()
-    buf = io.StringIO()
-    w = csv.writer(buf)
-    w.writerow(["first_name", "last_name", "admission_no", "gender", "date_of_birth", "status", "photo_url"])
-    for s in rows:
-        w.writerow([s.first_name, s.last_name or "", s.admission_no or "", s.gender or "", s.date_of_birth or "", s.status, s.photo_url or ""])
-    headers = {"Content-Disposition": 'attachment; filename="students.csv"'}
-    return StreamingResponse(iter([buf.getvalue().encode("utf-8")]), media_type="text/csv; charset=utf-8", headers=headers)
+) -> dict:
+    report = import_students(
+        db,
+        school_id=school_id,
+        records=iter_csv_records(file.file),
+        student_settings=get_student_settings(db, school_id),
+    )
+    return report.as_dict()
 
 
 @router.post("/bulk-promote", dependencies=[Depends(require_permission("students:write"))])
@@ -943,36 +997,26 @@ def bulk_promote_students(
     payload: BatchPromoteStudentsRequest,
     db: Session = Depends(get_db),
     school_id=Depends(get_active_school_id),
-) -> dict[str, int]:
-    now = datetime.now(timezone.utc)
-    created = 0
-    for eid in payload.enrollment_ids:
-        e = db.get(Enrollment, eid)
-        if not e:
-            raise not_found("Enrollment not found")
-        student = db.get(Student, e.student_id)
-        if not student or student.school_id != school_id:
-            raise not_found("Enrollment not found")
-        existing = db.scalar(
-            select(Enrollment).where(Enrollment.student_id == e.student_id, Enrollment.academic_year_id == payload.new_academic_year_id)
-        )
-        if existing:
-            raise problem(status_code=409, title="Conflict", detail="Student already enrolled in target academic year")
-        e.status = "promoted"
-        db.add(
-            Enrollment(
-                student_id=e.student_id,
-                academic_year_id=payload.new_academic_year_id,
-                class_id=payload.new_class_id,
-                section_id=payload.new_section_id,
-                roll_number=None,
-                status="active",
-                created_at=now,
-            )
-        )
-        created += 1
-    db.commit()
-    return {"created": created}
+    jobs: Optional[JobLauncher] = Depends(get_job_launcher),
+) -> dict:
+    if jobs is not None:
+        return jobs.launch("students.bulk_promote", payload.model_dump(mode="json"))
+    return promote_enrollments(
+        db,
+        school_id,
+        enrollment_ids=payload.enrollment_ids,
+        new_academic_year_id=payload.new_academic_year_id,
+        new_class_id=payload.new_class_id,
+        new_section_id=payload.new_section_id,
+        dry_run=payload.dry_run,
+    )
+
+
+@job_handler("students.bulk_promote", permission="students:write")
+def _bulk_promote_students_job(ctx: JobContext) -> dict:
+    return bulk_promote_students(
+        payload=BatchPromoteStudentsRequest(**ctx.params), db=ctx.db, school_id=ctx.school_id, jobs=None
+    )
 
 
 @router.get("/{student_id}/id-card")
@@ -985,30 +1029,8 @@ def generate_student_id_card(
     if not s or s.school_id != school_id:
         raise not_found("Student not found")
 
-    school = db.get(School, school_id)
-    school_name = school.name if school else "School"
-    school_code = school.code if school else ""
-
-    settings_rows = db.execute(
-        select(Setting).where(
-            Setting.school_id == school_id,
-            Setting.key.in_(
-                [
-                    "school.profile.address",
-                    "school.profile.phone",
-                    "school.profile.website",
-                    "school.profile.logo_url",
-                ]
-            ),
-        )
-    ).scalars().all()
-    settings_map = {row.key: row.value for row in settings_rows}
-    school_address = (settings_map.get("school.profile.address") or "").strip()
-    school_phone = (settings_map.get("school.profile.phone") or "").strip()
-    school_website = (settings_map.get("school.profile.website") or "").strip()
-    school_logo_url = (settings_map.get("school.profile.logo_url") or "").strip()
-
-    year = db.scalar(select(AcademicYear).where(AcademicYear.school_id == school_id, AcademicYear.is_current.is_(True)))
+    year = current_year(db, school_id)
+    ctx = load_id_card_context(db, school_id, year)
     enrollment = None
     if year:
         enrollment = db.scalar(
@@ -1027,389 +1049,14 @@ def generate_student_id_card(
             .order_by(Enrollment.created_at.desc())
         )
 
-    class_name = ""
-    section_name = ""
-    roll_number = ""
+    card = id_card_for(s)
     if enrollment:
         c = db.get(SchoolClass, enrollment.class_id)
-        class_name = c.name if c else ""
-        if enrollment.section_id:
-            sec = db.get(Section, enrollment.section_id)
-            section_name = sec.name if sec else ""
-        roll_number = str(enrollment.roll_number) if enrollment.roll_number is not None else ""
-
-    def esc(v: Optional[str]) -> str:
-        return html.escape((v or "").strip())
-
-    student_name = " ".join([part for part in [s.first_name, s.last_name or ""] if part]).strip()
-    dob = s.date_of_birth.isoformat() if s.date_of_birth else ""
-    issue_date = datetime.now(timezone.utc).date().isoformat()
-    qr_payload = "|".join(
-        [part for part in ["KUSKUL", school_code or "", str(s.id), s.admission_no or ""] if part.strip()]
-    ).strip()
-    qr_display = esc(qr_payload)
-    qr_svg = ""
-    try:
-        qr = segno.make(qr_payload, error="m")
-        buf = io.BytesIO()
-        qr.save(buf, kind="svg", scale=4, border=1)
-        qr_svg = buf.getvalue().decode("utf-8")
-        if qr_svg.startswith("<?xml"):
-            qr_svg = qr_svg.split("?>", 1)[1]
-        qr_svg = qr_svg.strip()
-    except Exception:
-        qr_svg = ""
-
-    html_doc = f"""<!doctype html>
-<html lang="en">
-  <head>
-    <meta charset="utf-8" />
-    <meta name="viewport" content="width=device-width, initial-scale=1" />
-    <title>ID Card - {esc(student_name)}</title>
-    <style>
-      :root {{
-        --card-w: 85.60mm;
-        --card-h: 53.98mm;
-        --border: #d0d5dd;
-        --text: #101828;
-        --muted: #475467;
-        --brand: #0b5fff;
-        --bg: #ffffff;
-      }}
-      * {{ box-sizing: border-box; }}
-      body {{
-        margin: 0;
-        padding: 16px;
-        font-family: ui-sans-serif, system-ui, -apple-system, Segoe UI, Roboto, Helvetica, Arial, "Apple Color Emoji", "Segoe UI Emoji";
-        color: var(--text);
-        background: #f5f7fb;
-      }}
-      .sheet {{
-        display: flex;
-        flex-direction: column;
-        gap: 14px;
-        align-items: flex-start;
-      }}
-      .card {{
-        width: var(--card-w);
-        height: var(--card-h);
-        background: var(--bg);
-        border: 1px solid var(--border);
-        border-radius: 10px;
-        overflow: hidden;
-        position: relative;
-        box-shadow: 0 8px 24px rgba(16, 24, 40, 0.12);
-      }}
-      .front .topbar {{
-        height: 12mm;
-        background: linear-gradient(90deg, rgba(11,95,255,1) 0%, rgba(25,160,255,1) 100%);
-      }}
-      .front .header {{
-        position: absolute;
-        top: 0;
-        left: 0;
-        right: 0;
-        height: 12mm;
-        display: flex;
-        align-items: center;
-        padding: 4mm;
-        gap: 3mm;
-        color: #fff;
-      }}
-      .logo {{
-        width: 9mm;
-        height: 9mm;
-        border-radius: 4mm;
-        background: rgba(255,255,255,0.25);
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        overflow: hidden;
-        flex: 0 0 auto;
-      }}
-      .logo img {{
-        width: 100%;
-        height: 100%;
-        object-fit: cover;
-      }}
-      .school {{
-        min-width: 0;
-        display: flex;
-        flex-direction: column;
-        line-height: 1.1;
-      }}
-      .school .name {{
-        font-weight: 800;
-        font-size: 12px;
-        white-space: nowrap;
-        overflow: hidden;
-        text-overflow: ellipsis;
-      }}
-      .school .sub {{
-        font-size: 10px;
-        opacity: 0.9;
-        white-space: nowrap;
-        overflow: hidden;
-        text-overflow: ellipsis;
-      }}
-      .front .content {{
-        position: absolute;
-        top: 12mm;
-        left: 0;
-        right: 0;
-        bottom: 0;
-        padding: 3.5mm 4mm 3.5mm 4mm;
-        display: grid;
-        grid-template-columns: 18mm 1fr;
-        gap: 3.5mm;
-      }}
-      .photo {{
-        width: 18mm;
-        height: 22mm;
-        border: 1px solid var(--border);
-        border-radius: 3mm;
-        overflow: hidden;
-        background: #eef2ff;
-      }}
-      .photo img {{
-        width: 100%;
-        height: 100%;
-        object-fit: cover;
-      }}
-      .photo .ph {{
-        width: 100%;
-        height: 100%;
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        color: var(--muted);
-        font-size: 10px;
-        padding: 2mm;
-        text-align: center;
-      }}
-      .fields {{
-        display: grid;
-        grid-template-columns: 1fr 1fr;
-        gap: 2mm 3mm;
-        align-content: start;
-      }}
-      .field {{
-        min-width: 0;
-      }}
-      .label {{
-        font-size: 9px;
-        color: var(--muted);
-        letter-spacing: 0.02em;
-      }}
-      .value {{
-        font-size: 10.5px;
-        font-weight: 700;
-        white-space: nowrap;
-        overflow: hidden;
-        text-overflow: ellipsis;
-      }}
-      .value.mono {{
-        font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, "Liberation Mono", "Courier New", monospace;
-        font-weight: 600;
-      }}
-      .nameLine {{
-        grid-column: 1 / -1;
-      }}
-      .nameLine .value {{
-        font-size: 12px;
-        font-weight: 900;
-      }}
-      .badge {{
-        position: absolute;
-        bottom: 3mm;
-        right: 3mm;
-        font-size: 9px;
-        padding: 1.4mm 2.5mm;
-        border-radius: 999px;
-        background: rgba(11,95,255,0.10);
-        color: var(--brand);
-        border: 1px solid rgba(11,95,255,0.25);
-      }}
-      .back {{
-        padding: 4mm;
-        display: grid;
-        grid-template-columns: 1fr 20mm;
-        gap: 4mm;
-        height: 100%;
-      }}
-      .back .left {{
-        display: flex;
-        flex-direction: column;
-        gap: 2mm;
-        min-width: 0;
-      }}
-      .back .row {{
-        display: flex;
-        gap: 2mm;
-        line-height: 1.15;
-        min-width: 0;
-      }}
-      .back .row .k {{
-        width: 18mm;
-        flex: 0 0 auto;
-        font-size: 9px;
-        color: var(--muted);
-      }}
-      .back .row .v {{
-        font-size: 9.5px;
-        font-weight: 700;
-        min-width: 0;
-        overflow: hidden;
-        text-overflow: ellipsis;
-        white-space: nowrap;
-      }}
-      .back .row .v.wrap {{
-        white-space: normal;
-      }}
-      .qr {{
-        border: 1px dashed var(--border);
-        border-radius: 3mm;
-        padding: 2mm;
-        height: 100%;
-        display: flex;
-        flex-direction: column;
-        justify-content: space-between;
-        gap: 2mm;
-      }}
-      .qr .box {{
-        width: 100%;
-        aspect-ratio: 1 / 1;
-        background: #ffffff;
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        border-radius: 2mm;
-      }}
-      .qr .box svg {{
-        width: 100%;
-        height: 100%;
-      }}
-      .qr .txt {{
-        font-size: 8px;
-        color: var(--muted);
-        word-break: break-all;
-      }}
-      .sign {{
-        margin-top: auto;
-        display: flex;
-        justify-content: space-between;
-        gap: 4mm;
-      }}
-      .sig {{
-        width: 34mm;
-        border-top: 1px solid var(--border);
-        padding-top: 1mm;
-        font-size: 8.5px;
-        color: var(--muted);
-        text-align: center;
-      }}
-      @media print {{
-        body {{ padding: 0; background: #fff; }}
-        .card {{ box-shadow: none; }}
-        .sheet {{ gap: 0; }}
-        .front {{ break-after: page; }}
-      }}
-    </style>
-  </head>
-  <body>
-    <div class="sheet">
-      <div class="card front">
-        <div class="topbar"></div>
-        <div class="header">
-          <div class="logo">
-            {f'<img src="{esc(school_logo_url)}" alt="Logo" />' if school_logo_url else '<span style="font-weight:800;font-size:10px;">ID</span>'}
-          </div>
-          <div class="school">
-            <div class="name">{esc(school_name)}</div>
-            <div class="sub">Student Identity Card</div>
-          </div>
-        </div>
-        <div class="content">
-          <div class="photo">
-            {f'<img src="{esc(s.photo_url)}" alt="Student photo" />' if s.photo_url else '<div class="ph">Photo</div>'}
-          </div>
-          <div class="fields">
-            <div class="field nameLine">
-              <div class="label">Student Name</div>
-              <div class="value">{esc(student_name)}</div>
-            </div>
-            <div class="field">
-              <div class="label">Admission No</div>
-              <div class="value mono">{esc(s.admission_no or "")}</div>
-            </div>
-            <div class="field">
-              <div class="label">Roll No</div>
-              <div class="value mono">{esc(roll_number)}</div>
-            </div>
-            <div class="field">
-              <div class="label">Class</div>
-              <div class="value">{esc(class_name)}</div>
-            </div>
-            <div class="field">
-              <div class="label">Section</div>
-              <div class="value">{esc(section_name)}</div>
-            </div>
-            <div class="field">
-              <div class="label">Date of Birth</div>
-              <div class="value mono">{esc(dob)}</div>
-            </div>
-            <div class="field">
-              <div class="label">Blood Group</div>
-              <div class="value">{esc(s.blood_group or "")}</div>
-            </div>
-          </div>
-        </div>
-        <div class="badge">{esc((year.name if year else "") or "Active")}</div>
-      </div>
-
-      <div class="card">
-        <div class="back">
-          <div class="left">
-            <div class="row">
-              <div class="k">School</div>
-              <div class="v">{esc(school_name)}</div>
-            </div>
-            <div class="row">
-              <div class="k">Address</div>
-              <div class="v wrap">{esc(school_address)}</div>
-            </div>
-            <div class="row">
-              <div class="k">Phone</div>
-              <div class="v">{esc(school_phone)}</div>
-            </div>
-            <div class="row">
-              <div class="k">Website</div>
-              <div class="v">{esc(school_website)}</div>
-            </div>
-            <div class="row">
-              <div class="k">Emergency</div>
-              <div class="v">{esc(s.emergency_contact_phone or "")}</div>
-            </div>
-            <div class="row">
-              <div class="k">Issued</div>
-              <div class="v mono">{esc(issue_date)}</div>
-            </div>
-            <div class="sign">
-              <div class="sig">Student Signature</div>
-              <div class="sig">Authorized Signature</div>
-            </div>
-          </div>
-          <div class="qr">
-            <div class="box">{qr_svg if qr_svg else '<div class="txt">QR</div>'}</div>
-            <div class="txt">{qr_display}</div>
-          </div>
-        </div>
-      </div>
-    </div>
-  </body>
-</html>
-"""
-
-    content = html_doc.encode("utf-8")
+        sec = db.get(Section, enrollment.section_id) if enrollment.section_id else None
+        card = id_card_for(
+            s, class_name=c.name if c else "", section_name=sec.name if sec else "", roll_number=enrollment.roll_number
+        )
+
+    content = render_id_card(ctx, card).encode("utf-8")
     headers = {"Content-Disposition": f'attachment; filename="id_card_{s.id}.html"'}
     return StreamingResponse(iter([content]), media_type="text/html; charset=utf-8", headers=headers)
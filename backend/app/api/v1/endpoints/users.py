@@ -8,6 +8,7 @@ from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_active_school_id, require_permission
+from app.core.permission_cache import invalidate_permissions
 from app.core.problems import not_found, problem
 from app.core.security import hash_password
 from app.core.seed import ensure_default_roles
@@ -200,6 +201,8 @@ def update_user(
 
     user.updated_at = datetime.now(timezone.utc)
     db.commit()
+    if payload.role_name:
+        invalidate_permissions()
 
     role = db.get(Role, membership.role_id)
     return UserDetail(
@@ -237,6 +240,7 @@ def deactivate_user(
     user.is_active = False
     user.updated_at = datetime.now(timezone.utc)
     db.commit()
+    invalidate_permissions()
     return {"status": "ok"}
 
 
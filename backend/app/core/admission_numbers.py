@@ -0,0 +1,95 @@
+import uuid
+from collections.abc import Iterable, Mapping
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from sqlalchemy import case, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.admission_sequence import AdmissionSequence
+from app.models.student import Student
+
+
+def admission_number_config(student_settings: Mapping[str, Any]) -> Optional[tuple[str, int]]:
+    """(prefix, start_from) from a school's student settings, or None when auto-generation is off."""
+    if not student_settings.get("auto_generate_admission_no", True):
+        return None
+    prefix = (student_settings.get("admission_no_prefix") or "STU").strip()
+    return prefix, int(student_settings.get("admission_no_start_from", 1001))
+
+
+def _suffix(prefix: str, admission_no: Optional[str]) -> Optional[int]:
+    if not admission_no or not admission_no.startswith(prefix):
+        return None
+    suffix = admission_no[len(prefix):]
+    return int(suffix) if suffix.isdigit() else None
+
+
+def _seed(db: Session, school_id: uuid.UUID, prefix: str, start_from: int) -> int:
+    last = start_from - 1
+    existing = db.execute(
+        select(Student.admission_no).where(Student.school_id == school_id, Student.admission_no.like(f"{prefix}%"))
+    ).scalars()
+    for value in existing:
+        number = _suffix(prefix, value)
+        if number is not None:
+            last = max(last, number)
+    return last + 1
+
+
+def _advance(db: Session, school_id: uuid.UUID, prefix: str, values: dict) -> Optional[int]:
+    return db.execute(
+        update(AdmissionSequence)
+        .where(AdmissionSequence.school_id == school_id, AdmissionSequence.prefix == prefix)
+        .values(updated_at=datetime.now(timezone.utc), **values)
+        .returning(AdmissionSequence.next_value)
+    ).scalar()
+
+
+def _ensure_sequence(db: Session, school_id: uuid.UUID, prefix: str, start_from: int) -> None:
+    try:
+        with db.begin_nested():
+            db.add(
+                AdmissionSequence(
+                    school_id=school_id,
+                    prefix=prefix,
+                    next_value=_seed(db, school_id, prefix, start_from),
+                    updated_at=datetime.now(timezone.utc),
+                )
+            )
+    except IntegrityError:
+        pass
+
+
+def allocate_admission_numbers(
+    db: Session, school_id: uuid.UUID, *, prefix: str, start_from: int, count: int = 1
+) -> list[str]:
+    """Reserve count consecutive admission numbers for (school_id, prefix).
+
+    The counter is advanced with a single UPDATE ... RETURNING, so the row lock is
+    held until the caller's transaction ends and concurrent allocations never
+    overlap. The first allocation for a prefix seeds the counter from the highest
+    numeric suffix already in use (or start_from).
+    """
+    if count <= 0:
+        return []
+    values = {"next_value": AdmissionSequence.next_value + count}
+    end = _advance(db, school_id, prefix, values)
+    if end is None:
+        _ensure_sequence(db, school_id, prefix, start_from)
+        end = _advance(db, school_id, prefix, values)
+    return [f"{prefix}{n}" for n in range(end - count, end)]
+
+
+def reserve_admission_numbers(
+    db: Session, school_id: uuid.UUID, *, prefix: str, start_from: int, admission_nos: Iterable[Optional[str]]
+) -> None:
+    """Move the counter past manually entered numbers so they are never generated again."""
+    highest = max((n for n in (_suffix(prefix, a) for a in admission_nos) if n is not None), default=None)
+    if highest is None:
+        return
+    values = {"next_value": case((AdmissionSequence.next_value <= highest, highest + 1), else_=AdmissionSequence.next_value)}
+    if _advance(db, school_id, prefix, values) is None:
+        _ensure_sequence(db, school_id, prefix, start_from)
+        _advance(db, school_id, prefix, values)
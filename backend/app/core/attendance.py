@@ -0,0 +1,258 @@
+import uuid
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Optional
+
+from sqlalchemy import Subquery, Table, and_, delete, func, insert, literal, or_, select, text, tuple_, union_all, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.problems import not_found
+from app.models.attendance_summary import StudentAttendanceMonthly
+from app.models.staff import Staff
+from app.models.student import Student
+from app.models.teacher_assignment import StaffAttendance, StudentAttendance
+
+_UPSERT_CHUNK = 500
+_UNIQUE_KEYS = {
+    "student_attendance": ("uq_student_attendance_student_date", "student_id"),
+    "staff_attendance": ("uq_staff_attendance_staff_date", "staff_id"),
+}
+
+
+def attendance_datetime(d: date) -> datetime:
+    return datetime.combine(d, time.min, tzinfo=timezone.utc)
+
+
+def month_start(d: date) -> date:
+    return d.replace(day=1)
+
+
+def _next_month(d: date) -> date:
+    return date(d.year + 1, 1, 1) if d.month == 12 else date(d.year, d.month + 1, 1)
+
+
+def attendance_status_days(school_id: uuid.UUID, start: date, end: date) -> Subquery:
+    """(student_id, status, days) rows covering start..end inclusive, one student may appear several times.
+
+    Whole calendar months are read from student_attendance_monthly; only the
+    partial months at either edge of the range touch raw attendance rows.
+    """
+    first_full = start if start.day == 1 else _next_month(start)
+    end_excl = end + timedelta(days=1)
+    last_full = month_start(end_excl)
+    parts = []
+    if first_full < last_full:
+        parts.append(
+            select(
+                StudentAttendanceMonthly.student_id,
+                StudentAttendanceMonthly.status,
+                StudentAttendanceMonthly.days.label("days"),
+            ).where(
+                StudentAttendanceMonthly.school_id == school_id,
+                StudentAttendanceMonthly.month >= first_full,
+                StudentAttendanceMonthly.month < last_full,
+            )
+        )
+        raw_ranges = [(start, first_full), (last_full, end_excl)]
+    else:
+        raw_ranges = [(start, end_excl)]
+    raw_ranges = [(lo, hi) for lo, hi in raw_ranges if lo < hi]
+    if raw_ranges or not parts:
+        day = StudentAttendance.attendance_day
+        parts.append(
+            select(StudentAttendance.student_id, StudentAttendance.status, func.count().label("days"))
+            .where(
+                StudentAttendance.school_id == school_id,
+                or_(*(and_(day >= lo, day < hi) for lo, hi in raw_ranges)) if raw_ranges else literal(False),
+            )
+            .group_by(StudentAttendance.student_id, StudentAttendance.status)
+        )
+    return (parts[0] if len(parts) == 1 else union_all(*parts)).subquery("status_days")
+
+
+def refresh_attendance_summary(db: Session, school_id: uuid.UUID, keys: Iterable[tuple[uuid.UUID, date]]) -> None:
+    """Recount student_attendance_monthly for the given (student_id, day) pairs' months.
+
+    Only the affected student-months are read and rewritten, so the cost follows
+    the size of the change rather than the history. Counts are upserted on
+    (student_id, month, status), so concurrent markings never collide on the key,
+    and statuses a student no longer has that month are removed. Leaves
+    committing to the caller.
+    """
+    by_month: dict[date, set[uuid.UUID]] = {}
+    for student_id, day in keys:
+        by_month.setdefault(month_start(day), set()).add(student_id)
+    if not by_month:
+        return
+    table = StudentAttendanceMonthly.__table__
+    for month, student_ids in by_month.items():
+        rows = db.execute(
+            select(StudentAttendance.student_id, StudentAttendance.status).where(
+                StudentAttendance.student_id.in_(student_ids),
+                StudentAttendance.attendance_day >= month,
+                StudentAttendance.attendance_day < _next_month(month),
+            )
+        ).all()
+        counts = Counter((r.student_id, r.status) for r in rows)
+        gone = delete(table).where(table.c.month == month, table.c.student_id.in_(student_ids))
+        if counts:
+            _upsert(
+                db,
+                table,
+                [
+                    {"student_id": sid, "month": month, "status": status, "school_id": school_id, "days": n}
+                    for (sid, status), n in counts.items()
+                ],
+                keys=("student_id", "month", "status"),
+                updates=("days",),
+            )
+            gone = gone.where(tuple_(table.c.student_id, table.c.status).not_in(list(counts)))
+        db.execute(gone, execution_options={"synchronize_session": False})
+
+
+def _upsert(db: Session, table: Table, rows: list[dict[str, Any]], keys: Sequence[str], updates: Sequence[str]) -> None:
+    """Insert rows, updating the updates columns of rows whose keys already exist."""
+    dialect = db.get_bind().dialect.name
+    for start in range(0, len(rows), _UPSERT_CHUNK):
+        chunk = rows[start : start + _UPSERT_CHUNK]
+        if dialect in ("postgresql", "sqlite"):
+            stmt = (postgresql if dialect == "postgresql" else sqlite).insert(table).values(chunk)
+            stmt = stmt.on_conflict_do_update(index_elements=list(keys), set_={c: stmt.excluded[c] for c in updates})
+            db.execute(stmt)
+            continue
+        for row in chunk:
+            match = and_(*(table.c[k] == row[k] for k in keys))
+            values = {c: row[c] for c in updates}
+            if db.execute(update(table).where(match).values(**values)).rowcount:
+                continue
+            try:
+                with db.begin_nested():
+                    db.execute(insert(table).values(**row))
+            except IntegrityError:
+                db.execute(update(table).where(match).values(**values))
+
+
+def _require_members(db: Session, model: Any, ids: set[uuid.UUID], school_id: uuid.UUID, missing: str) -> None:
+    if not ids:
+        return
+    found = set(db.execute(select(model.id).where(model.id.in_(ids), model.school_id == school_id)).scalars())
+    if found != ids:
+        raise not_found(missing)
+
+
+def upsert_student_attendance(
+    db: Session,
+    school_id: uuid.UUID,
+    *,
+    attendance_date: date,
+    statuses: Sequence[tuple[uuid.UUID, str]],
+    class_id: Optional[uuid.UUID] = None,
+    section_id: Optional[uuid.UUID] = None,
+) -> None:
+    """Record (student_id, status) pairs for one day; a later pair for the same student wins.
+
+    Students are checked against the school with one IN query, all rows are
+    written with INSERT ... ON CONFLICT on (student_id, attendance_date) and the
+    monthly summary is recounted for the touched students.
+    """
+    latest = dict(statuses)
+    _require_members(db, Student, set(latest), school_id, "Student not found")
+    d = attendance_datetime(attendance_date)
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "attendance_date": d,
+            "attendance_day": attendance_date,
+            "school_id": school_id,
+            "student_id": student_id,
+            "class_id": class_id,
+            "section_id": section_id,
+            "status": status,
+            "created_at": now,
+        }
+        for student_id, status in latest.items()
+    ]
+    _upsert(db, StudentAttendance.__table__, rows, ("student_id", "attendance_date"), ("status", "class_id", "section_id"))
+    refresh_attendance_summary(db, school_id, ((student_id, attendance_date) for student_id in latest))
+
+
+def upsert_staff_attendance(
+    db: Session, school_id: uuid.UUID, *, attendance_date: date, statuses: Sequence[tuple[uuid.UUID, str]]
+) -> None:
+    latest = dict(statuses)
+    _require_members(db, Staff, set(latest), school_id, "Staff not found")
+    d = attendance_datetime(attendance_date)
+    now = datetime.now(timezone.utc)
+    rows = [
+        {"id": uuid.uuid4(), "attendance_date": d, "staff_id": staff_id, "status": status, "created_at": now}
+        for staff_id, status in latest.items()
+    ]
+    _upsert(db, StaffAttendance.__table__, rows, ("staff_id", "attendance_date"), ("status",))
+
+
+def ensure_attendance_keys(db: Session) -> None:
+    """Add the one-row-per-day unique keys to SQLite databases created before them.
+
+    Duplicate rows left by the old read-then-write marking are only collapsed by
+    migration 0039; if any remain this raises instead of deleting data at startup.
+    """
+    if db.get_bind().dialect.name != "sqlite":
+        return
+    existing = set(db.execute(text("SELECT name FROM sqlite_master WHERE type IN ('table', 'index')")).scalars())
+    for table, (index, owner) in _UNIQUE_KEYS.items():
+        if table not in existing or index in existing:
+            continue
+        duplicated = db.execute(
+            text(f"SELECT 1 FROM {table} GROUP BY {owner}, attendance_date HAVING COUNT(*) > 1 LIMIT 1")
+        ).first()
+        if duplicated is not None:
+            raise RuntimeError(
+                f"{table} has several rows for one {owner} and day; run 'alembic upgrade head' "
+                f"(migration 0039 removes them) before starting the app"
+            )
+        db.execute(text(f"CREATE UNIQUE INDEX IF NOT EXISTS {index} ON {table} ({owner}, attendance_date)"))
+    db.commit()
+
+
+def ensure_attendance_summary(db: Session) -> None:
+    """Add the day and school columns and the monthly summary to SQLite databases created before them."""
+    if db.get_bind().dialect.name != "sqlite":
+        return
+    columns = {row[1] for row in db.execute(text("PRAGMA table_info(student_attendance)"))}
+    if not columns:
+        return
+    if "attendance_day" not in columns:
+        db.execute(text("ALTER TABLE student_attendance ADD COLUMN attendance_day DATE"))
+    if "school_id" not in columns:
+        db.execute(text("ALTER TABLE student_attendance ADD COLUMN school_id CHAR(32) REFERENCES schools (id)"))
+    db.execute(
+        text("UPDATE student_attendance SET attendance_day = date(attendance_date) WHERE attendance_day IS NULL")
+    )
+    db.execute(
+        text(
+            "UPDATE student_attendance SET school_id = "
+            "(SELECT students.school_id FROM students WHERE students.id = student_attendance.student_id) "
+            "WHERE school_id IS NULL"
+        )
+    )
+    db.execute(
+        text(
+            "CREATE INDEX IF NOT EXISTS ix_student_attendance_school_day_status "
+            "ON student_attendance (school_id, attendance_day, status)"
+        )
+    )
+    summary_empty = db.execute(text("SELECT 1 FROM student_attendance_monthly LIMIT 1")).first() is None
+    if summary_empty:
+        db.execute(
+            text(
+                "INSERT INTO student_attendance_monthly (student_id, month, status, school_id, days) "
+                "SELECT student_id, date(attendance_day, 'start of month'), status, school_id, COUNT(*) "
+                "FROM student_attendance WHERE school_id IS NOT NULL "
+                "GROUP BY student_id, date(attendance_day, 'start of month'), status, school_id"
+            )
+        )
+    db.commit()
@@ -0,0 +1,196 @@
+import uuid
+from collections.abc import Sequence
+from datetime import date, datetime, timezone
+from typing import Any, Optional
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.jobs import report_progress
+from app.core.messaging import MessageTransport, OutboundMessage, deliver_messages
+from app.models.communication_log import CommunicationLog
+from app.models.guardian import Guardian
+from app.models.notification import Notification
+from app.models.student import Student
+from app.models.student_guardian import StudentGuardian
+from app.models.teacher_assignment import StudentAttendance
+
+_CHUNK = 500
+ALERT_TITLE = "Attendance alert"
+
+
+def _status_update(db: Session, ids: Sequence[uuid.UUID], status: str) -> None:
+    for start in range(0, len(ids), _CHUNK):
+        db.execute(
+            update(CommunicationLog).where(CommunicationLog.id.in_(ids[start : start + _CHUNK])).values(status=status),
+            execution_options={"synchronize_session": False},
+        )
+
+
+def _alert_key(student_id: uuid.UUID, attendance_date: date, channel: str, recipient: str) -> str:
+    return f"attendance:{student_id}:{attendance_date.isoformat()}:{channel}:{recipient}"
+
+
+def _logged_keys(db: Session, school_id: uuid.UUID, keys: Sequence[str]) -> set[str]:
+    found: set[str] = set()
+    for start in range(0, len(keys), _CHUNK):
+        chunk = keys[start : start + _CHUNK]
+        found.update(
+            db.scalars(
+                select(CommunicationLog.dedupe_key).where(
+                    CommunicationLog.school_id == school_id, CommunicationLog.dedupe_key.in_(chunk)
+                )
+            )
+        )
+    return found
+
+
+def _insert_new(db: Session, table: Any, rows: list[dict[str, Any]]) -> None:
+    """Bulk insert, skipping rows whose dedupe key a concurrent dispatch has just written."""
+    dialect = db.get_bind().dialect.name
+    for start in range(0, len(rows), _CHUNK):
+        chunk = rows[start : start + _CHUNK]
+        if dialect in ("postgresql", "sqlite"):
+            stmt = (postgresql if dialect == "postgresql" else sqlite).insert(table).values(chunk)
+            db.execute(stmt.on_conflict_do_nothing(index_elements=["school_id", "dedupe_key"]))
+        else:
+            db.execute(insert(table), chunk)
+
+
+def deliver_queued_alerts(
+    db: Session, school_id: uuid.UUID, *, transport: Optional[MessageTransport] = None
+) -> tuple[int, int]:
+    """Send every attendance alert log still queued for the school; returns (sent, failed).
+
+    Logs are read back in id order a batch at a time and each batch's outcome is
+    committed before the next, so a dispatch that died mid-delivery is picked up
+    by the next one instead of leaving its messages queued forever.
+    """
+    sent = failed = 0
+    after: Optional[uuid.UUID] = None
+    while True:
+        q = select(CommunicationLog).where(
+            CommunicationLog.school_id == school_id,
+            CommunicationLog.status == "queued",
+            CommunicationLog.dedupe_key.like("attendance:%"),
+        )
+        if after is not None:
+            q = q.where(CommunicationLog.id > after)
+        batch = db.scalars(q.order_by(CommunicationLog.id).limit(_CHUNK)).all()
+        if not batch:
+            return sent, failed
+        after = batch[-1].id
+        messages = [
+            OutboundMessage(
+                id=log.id, channel=log.communication_type, recipient=log.recipient, body=log.body or "", subject=log.subject
+            )
+            for log in batch
+        ]
+        report = deliver_messages(messages, transport=transport)
+        _status_update(db, report.sent, "sent")
+        _status_update(db, report.failed, "failed")
+        db.commit()
+        sent += len(report.sent)
+        failed += len(report.failed)
+
+
+def dispatch_attendance_alerts(
+    db: Session,
+    school_id: uuid.UUID,
+    *,
+    attendance_date: date,
+    sent_by_user_id: uuid.UUID,
+    statuses: Sequence[str] = ("absent",),
+    transport: Optional[MessageTransport] = None,
+) -> dict[str, Any]:
+    """Notify the guardians of every student marked with one of statuses on attendance_date.
+
+    Guardians are resolved with one join; in-app notifications and queued
+    communication logs are written with bulk inserts and committed, skipping any
+    (student, date, channel, recipient) already alerted, so running it twice for
+    a day sends nothing new. Delivery then works from the queued logs through
+    deliver_queued_alerts.
+    """
+    rows = db.execute(
+        select(
+            StudentAttendance.student_id,
+            StudentAttendance.status,
+            Student.first_name,
+            Student.last_name,
+            Guardian.user_id,
+            Guardian.phone,
+            Guardian.email,
+        )
+        .join(Student, Student.id == StudentAttendance.student_id)
+        .join(StudentGuardian, StudentGuardian.student_id == StudentAttendance.student_id)
+        .join(Guardian, Guardian.id == StudentGuardian.guardian_id)
+        .where(
+            StudentAttendance.school_id == school_id,
+            StudentAttendance.attendance_day == attendance_date,
+            StudentAttendance.status.in_(statuses),
+            Guardian.school_id == school_id,
+        )
+    ).all()
+
+    now = datetime.now(timezone.utc)
+    notifications: dict[tuple[uuid.UUID, str], dict[str, Any]] = {}
+    logs: dict[str, dict[str, Any]] = {}
+    for r in rows:
+        name = " ".join(p for p in (r.first_name, r.last_name) if p)
+        body = f"{name} was marked {r.status} on {attendance_date.isoformat()}."
+        if r.user_id:
+            notifications[(r.user_id, body)] = {
+                "id": uuid.uuid4(),
+                "school_id": school_id,
+                "user_id": r.user_id,
+                "notification_type": "attendance",
+                "title": ALERT_TITLE,
+                "message": body,
+                "is_read": False,
+                "created_at": now,
+            }
+        for channel, recipient, subject in (("sms", r.phone, None), ("email", r.email, ALERT_TITLE)):
+            if not recipient:
+                continue
+            key = _alert_key(r.student_id, attendance_date, channel, recipient)
+            logs[key] = {
+                "id": uuid.uuid4(),
+                "school_id": school_id,
+                "sent_by_user_id": sent_by_user_id,
+                "communication_type": channel,
+                "status": "queued",
+                "recipient": recipient,
+                "subject": subject,
+                "body": body,
+                "dedupe_key": key,
+                "created_at": now,
+            }
+
+    for key in _logged_keys(db, school_id, list(logs)):
+        del logs[key]
+    bodies = sorted({body for _, body in notifications})
+    for start in range(0, len(bodies), _CHUNK):
+        for seen in db.execute(
+            select(Notification.user_id, Notification.message).where(
+                Notification.school_id == school_id,
+                Notification.notification_type == "attendance",
+                Notification.message.in_(bodies[start : start + _CHUNK]),
+            )
+        ).all():
+            notifications.pop(tuple(seen), None)
+
+    report_progress(1, 2)
+    for start in range(0, len(notifications), _CHUNK):
+        db.execute(insert(Notification.__table__), list(notifications.values())[start : start + _CHUNK])
+    _insert_new(db, CommunicationLog.__table__, list(logs.values()))
+    db.commit()
+
+    sent, failed = deliver_queued_alerts(db, school_id, transport=transport)
+    return {
+        "students": len({r.student_id for r in rows}),
+        "notifications": len(notifications),
+        "messages": len(logs),
+        "sent": sent,
+        "failed": failed,
+    }
@@ -0,0 +1,135 @@
+import uuid
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.attendance import attendance_status_days
+from app.core.cache import MISSING, TTLCache
+from app.core.cache_versions import version_store
+from app.core.config import settings
+from app.models.enrollment import Enrollment
+
+
+@dataclass(frozen=True)
+class AttendanceRate:
+    student_id: uuid.UUID
+    counts: Mapping[str, int]
+
+    @property
+    def present(self) -> int:
+        return self.counts.get("present", 0)
+
+    @property
+    def absent(self) -> int:
+        return self.counts.get("absent", 0)
+
+    @property
+    def late(self) -> int:
+        return self.counts.get("late", 0)
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    @property
+    def percentage(self) -> float:
+        return round(self.present / self.total * 100.0, 2) if self.total else 0.0
+
+
+def attendance_window(
+    start_date: Optional[date] = None, end_date: Optional[date] = None, window_days: Optional[int] = None
+) -> tuple[date, date]:
+    """The inclusive date range to report on; window_days counts back from end_date (default today)."""
+    end = end_date or date.today()
+    if start_date:
+        return start_date, end
+    return end - timedelta(days=window_days or settings.attendance_window_days), end
+
+
+_cache = TTLCache(
+    ttl_seconds=settings.attendance_stats_cache_ttl_seconds, max_entries=settings.attendance_stats_cache_max_entries
+)
+
+
+def _version_key(school_id: uuid.UUID) -> str:
+    return f"attendance:{school_id}"
+
+
+def attendance_rates(
+    db: Session,
+    school_id: uuid.UUID,
+    *,
+    start: date,
+    end: date,
+    class_id: Optional[uuid.UUID] = None,
+    section_id: Optional[uuid.UUID] = None,
+) -> tuple[AttendanceRate, ...]:
+    """Days per status for each student over start..end, in one aggregate query.
+
+    Results are cached per school and calendar day; attendance writes call
+    invalidate_attendance_stats so a cached window never outlives a change.
+    """
+    key = (school_id, date.today(), start, end, class_id, section_id)
+    version = version_store.get(_version_key(school_id))
+    cached = _cache.get(key)
+    if cached is not MISSING and cached[0] == version:
+        return cached[1]
+
+    days = attendance_status_days(school_id, start, end)
+    q = select(days.c.student_id, days.c.status, func.sum(days.c.days)).group_by(days.c.student_id, days.c.status)
+    if class_id or section_id:
+        members = select(Enrollment.student_id).where(Enrollment.status == "active")
+        if class_id:
+            members = members.where(Enrollment.class_id == class_id)
+        if section_id:
+            members = members.where(Enrollment.section_id == section_id)
+        q = q.where(days.c.student_id.in_(members))
+    counts: dict[uuid.UUID, dict[str, int]] = {}
+    for sid, status, n in db.execute(q).all():
+        if n:
+            counts.setdefault(sid, {})[status] = int(n)
+    value = tuple(AttendanceRate(student_id=sid, counts=c) for sid, c in counts.items())
+    _cache.set(key, (version, value))
+    return value
+
+
+def invalidate_attendance_stats(school_id: uuid.UUID) -> None:
+    """Call after committing a student attendance change."""
+    version_store.bump(_version_key(school_id))
+
+
+def attendance_defaulters(rates: tuple[AttendanceRate, ...], threshold: float) -> list[dict]:
+    out = [
+        {
+            "student_id": str(r.student_id),
+            "attendance_pct": r.percentage,
+            "present": r.present,
+            "absent": r.absent,
+            "late": r.late,
+            "total": r.total,
+        }
+        for r in rates
+        if r.total > 0 and r.percentage < threshold
+    ]
+    out.sort(key=lambda x: (x["attendance_pct"], x["student_id"]))
+    return out
+
+
+def attendance_statistics(rates: tuple[AttendanceRate, ...], threshold: float) -> dict:
+    present = sum(r.present for r in rates)
+    absent = sum(r.absent for r in rates)
+    late = sum(r.late for r in rates)
+    total = sum(r.total for r in rates)
+    by_status = {"present": present, "absent": absent, "late": late, "other": total - present - absent - late}
+    return {
+        "students": len(rates),
+        "total_records": total,
+        "by_status": {k: v for k, v in by_status.items() if v},
+        "attendance_pct": round(present / total * 100.0, 2) if total else 0.0,
+        "average_student_pct": round(sum(r.percentage for r in rates) / len(rates), 2) if rates else 0.0,
+        "below_threshold": sum(1 for r in rates if r.total > 0 and r.percentage < threshold),
+    }
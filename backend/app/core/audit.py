@@ -1,14 +1,22 @@
+import logging
+import queue
+import threading
 import uuid
+from collections.abc import Callable
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Optional
 
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.db.session import SessionLocal
 from app.models.audit_log import AuditLog
 
+logger = logging.getLogger(__name__)
 
-def write_audit_log(
-    db: Session,
+
+def _audit_row(
     *,
     school_id: uuid.UUID,
     action: str,
@@ -16,8 +24,7 @@ def write_audit_log(
     entity_type: Optional[str] = None,
     entity_id: Optional[str] = None,
     details: Optional[str] = None,
-) -> None:
-    now = datetime.now(timezone.utc)
+) -> dict[str, Any]:
     if action:
         action = action[:80]
     if entity_type:
@@ -26,14 +33,163 @@ def write_audit_log(
         entity_id = entity_id[:64]
     if details:
         details = details[:2000]
+    return {
+        "school_id": school_id,
+        "user_id": user_id,
+        "action": action,
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "details": details,
+        "created_at": datetime.now(timezone.utc),
+    }
+
+
+def write_audit_log(
+    db: Session,
+    *,
+    school_id: uuid.UUID,
+    action: str,
+    user_id: Optional[uuid.UUID],
+    entity_type: Optional[str] = None,
+    entity_id: Optional[str] = None,
+    details: Optional[str] = None,
+) -> None:
     db.add(
         AuditLog(
+            **_audit_row(
+                school_id=school_id,
+                action=action,
+                user_id=user_id,
+                entity_type=entity_type,
+                entity_id=entity_id,
+                details=details,
+            )
+        )
+    )
+
+
+class AuditSink:
+    def __init__(
+        self,
+        *,
+        session_factory: Callable[[], Session] = SessionLocal,
+        batch_size: int = 200,
+        flush_interval_seconds: float = 1.0,
+        max_queue_size: int = 10_000,
+    ) -> None:
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.written = 0
+        self._queue: queue.Queue[dict[str, Any]] = queue.Queue(maxsize=max_queue_size)
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-sink", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 10.0) -> None:
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def enqueue(
+        self,
+        *,
+        school_id: uuid.UUID,
+        action: str,
+        user_id: Optional[uuid.UUID],
+        entity_type: Optional[str] = None,
+        entity_id: Optional[str] = None,
+        details: Optional[str] = None,
+    ) -> None:
+        row = _audit_row(
             school_id=school_id,
-            user_id=user_id,
             action=action,
+            user_id=user_id,
             entity_type=entity_type,
             entity_id=entity_id,
             details=details,
-            created_at=now,
         )
+        if not self.running:
+            self._write([row])
+            return
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self._write([row])
+            return
+        if self._queue.qsize() >= self.batch_size:
+            self._wakeup.set()
+
+    def flush(self) -> int:
+        flushed = 0
+        with self._flush_lock:
+            while True:
+                batch: list[dict[str, Any]] = []
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if not batch:
+                    return flushed
+                self._write(batch)
+                flushed += len(batch)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wakeup.wait(self.flush_interval_seconds)
+            self._wakeup.clear()
+            self.flush()
+
+    def _write(self, rows: list[dict[str, Any]]) -> None:
+        db = self.session_factory()
+        try:
+            db.execute(insert(AuditLog), rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.exception("Failed to write %d audit log entries", len(rows))
+            return
+        finally:
+            db.close()
+        self.written += len(rows)
+
+
+audit_sink = AuditSink(
+    batch_size=settings.audit_batch_size,
+    flush_interval_seconds=settings.audit_flush_interval_seconds,
+)
+
+
+def enqueue_audit_log(
+    *,
+    school_id: uuid.UUID,
+    action: str,
+    user_id: Optional[uuid.UUID],
+    entity_type: Optional[str] = None,
+    entity_id: Optional[str] = None,
+    details: Optional[str] = None,
+) -> None:
+    audit_sink.enqueue(
+        school_id=school_id,
+        action=action,
+        user_id=user_id,
+        entity_type=entity_type,
+        entity_id=entity_id,
+        details=details,
     )
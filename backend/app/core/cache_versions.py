@@ -0,0 +1,100 @@
+import threading
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import Protocol
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.cache_version import CacheVersion
+
+
+class VersionStore(Protocol):
+    def get(self, key: str) -> int: ...
+
+    def bump(self, key: str) -> int: ...
+
+
+class LocalVersionStore:
+    def __init__(self) -> None:
+        self._versions: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> int:
+        with self._lock:
+            return self._versions.get(key, 0)
+
+    def bump(self, key: str) -> int:
+        with self._lock:
+            version = self._versions.get(key, 0) + 1
+            self._versions[key] = version
+            return version
+
+
+class DatabaseVersionStore:
+    """Shares version counters between worker processes through the cache_versions table.
+
+    Reads are served from memory and refreshed at most every poll_interval_seconds,
+    so an invalidation in one worker reaches the others within that interval.
+    """
+
+    def __init__(self, *, session_factory: Callable[[], Session] = SessionLocal, poll_interval_seconds: float = 2.0) -> None:
+        self.session_factory = session_factory
+        self.poll_interval_seconds = poll_interval_seconds
+        self._versions: dict[str, tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> int:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._versions.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[1]
+        db = self.session_factory()
+        try:
+            version = db.scalar(select(CacheVersion.version).where(CacheVersion.key == key)) or 0
+        finally:
+            db.close()
+        with self._lock:
+            self._versions[key] = (now + self.poll_interval_seconds, version)
+        return version
+
+    def bump(self, key: str) -> int:
+        db = self.session_factory()
+        try:
+            now = datetime.now(timezone.utc)
+            updated = db.execute(
+                update(CacheVersion)
+                .where(CacheVersion.key == key)
+                .values(version=CacheVersion.version + 1, updated_at=now)
+            ).rowcount
+            if not updated:
+                try:
+                    with db.begin_nested():
+                        db.add(CacheVersion(key=key, version=1, updated_at=now))
+                except IntegrityError:
+                    db.execute(
+                        update(CacheVersion)
+                        .where(CacheVersion.key == key)
+                        .values(version=CacheVersion.version + 1, updated_at=now)
+                    )
+            db.commit()
+            version = db.scalar(select(CacheVersion.version).where(CacheVersion.key == key)) or 0
+        finally:
+            db.close()
+        with self._lock:
+            self._versions[key] = (time.monotonic() + self.poll_interval_seconds, version)
+        return version
+
+
+def _build_version_store() -> VersionStore:
+    if settings.cache_version_backend == "database":
+        return DatabaseVersionStore(poll_interval_seconds=settings.cache_version_poll_seconds)
+    return LocalVersionStore()
+
+
+version_store: VersionStore = _build_version_store()
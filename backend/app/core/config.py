@@ -28,6 +28,40 @@ class Settings(BaseSettings):
     rate_limit_api_per_minute: int = 100
     rate_limit_auth_per_15_minutes: int = 5
 
+    tenant_cache_ttl_seconds: float = 30.0
+    tenant_cache_max_entries: int = 1024
+
+    cache_version_backend: str = "local"
+    cache_version_poll_seconds: float = 2.0
+    permission_cache_ttl_seconds: float = 60.0
+    permission_cache_max_entries: int = 10_000
+    school_settings_cache_ttl_seconds: float = 300.0
+    school_settings_cache_max_entries: int = 2048
+
+    id_card_qr_cache_ttl_seconds: float = 86400.0
+    id_card_qr_cache_max_entries: int = 20_000
+    id_card_parallel_threshold: int = 200
+    id_card_render_workers: int = 4
+
+    attendance_window_days: int = 30
+    attendance_defaulter_threshold: int = 75
+    attendance_stats_cache_ttl_seconds: float = 600.0
+    attendance_stats_cache_max_entries: int = 4096
+
+    messaging_transport: str = "log"
+    messaging_workers: int = 64
+    messaging_rate_per_second: float = 1000.0
+    messaging_send_timeout_seconds: float = 10.0
+
+    audit_async_enabled: bool = True
+    audit_batch_size: int = 200
+    audit_flush_interval_seconds: float = 1.0
+
+    jobs_mode: str = "thread"
+    jobs_worker_count: int = 2
+    jobs_poll_interval_seconds: float = 1.0
+    jobs_stale_after_seconds: float = 900.0
+
     @property
     def cors_allow_origins(self) -> list[str]:
         s = (self.cors_origins or "").strip()
@@ -0,0 +1,65 @@
+import csv
+import io
+from collections.abc import Callable, Iterable, Iterator, Sequence
+import uuid
+from typing import Any
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Row, Select, select
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.models.student import Student
+
+CSV_MEDIA_TYPE = "text/csv; charset=utf-8"
+
+
+def iter_csv(header: Sequence[str], rows: Iterable[Sequence[Any]], *, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Encode rows as CSV, yielding chunks of roughly chunk_size bytes."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(header)
+    for row in rows:
+        writer.writerow(row)
+        if buf.tell() >= chunk_size:
+            yield buf.getvalue().encode("utf-8")
+            buf.seek(0)
+            buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+
+def iter_rows(
+    statement: Select, *, batch_size: int = 1000, session_factory: Callable[[], Session] = SessionLocal
+) -> Iterator[Row]:
+    """Stream a column select in batches on its own session.
+
+    The generator outlives the request handler, so it cannot borrow the request's
+    session; it opens one and closes it when the response finishes or is aborted.
+    """
+    db = session_factory()
+    try:
+        result = db.execute(statement.execution_options(yield_per=batch_size))
+        for partition in result.partitions():
+            yield from partition
+    finally:
+        db.close()
+
+
+def stream_csv(filename: str, header: Sequence[str], statement: Select) -> StreamingResponse:
+    """Stream a column select as a CSV attachment, writing NULLs as empty cells."""
+    rows = ([v if v is not None else "" for v in r] for r in iter_rows(statement))
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    return StreamingResponse(iter_csv(header, rows), media_type=CSV_MEDIA_TYPE, headers=headers)
+
+
+STUDENT_EXPORT_COLUMNS = ("first_name", "last_name", "admission_no", "gender", "date_of_birth", "status", "photo_url")
+
+
+def export_students_csv(school_id: uuid.UUID) -> StreamingResponse:
+    statement = (
+        select(*(getattr(Student, c) for c in STUDENT_EXPORT_COLUMNS))
+        .where(Student.school_id == school_id)
+        .order_by(Student.created_at.asc())
+    )
+    return stream_csv("students.csv", STUDENT_EXPORT_COLUMNS, statement)
@@ -0,0 +1,127 @@
+import uuid
+from datetime import date, datetime, timezone
+from typing import Any
+
+from sqlalchemy import case, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core.problems import not_found
+from app.models.discount import Discount
+from app.models.enrollment import Enrollment
+from app.models.fee_due import FeeDue
+from app.models.fee_payment import FeePayment
+from app.models.fee_structure import FeeStructure
+from app.models.school_class import SchoolClass
+from app.models.student import Student
+from app.models.student_discount import StudentDiscount
+
+
+def discount_for(total_fee: int, discounts: list[tuple[str, int]]) -> int:
+    """Sum of (discount_type, value) discounts on total_fee, capped at the fee."""
+    amount = 0
+    for discount_type, value in discounts:
+        if discount_type == "percent":
+            amount += int(total_fee * (float(value) / 100.0))
+        else:
+            amount += int(value)
+    return min(amount, total_fee)
+
+
+def calculate_fee_dues(db: Session, school_id: uuid.UUID, *, academic_year_id: uuid.UUID) -> int:
+    """Recompute the FeeDue row of every actively enrolled student of the school for a year.
+
+    Class totals and overdue flags, per-student payments, linked discounts and
+    existing dues are each loaded with one grouped query; rows are then written
+    with one bulk UPDATE and one bulk INSERT. Returns the number of rows written
+    and leaves committing to the caller.
+    """
+    enrolled = dict(
+        db.execute(
+            select(Enrollment.student_id, Enrollment.class_id)
+            .join(Student, Student.id == Enrollment.student_id)
+            .where(
+                Enrollment.academic_year_id == academic_year_id,
+                Enrollment.status == "active",
+                Student.school_id == school_id,
+            )
+            .order_by(Enrollment.created_at, Enrollment.id)
+        ).all()
+    )
+    if not enrolled:
+        return 0
+    class_ids = set(enrolled.values())
+    if len(class_ids) != db.scalar(
+        select(func.count()).select_from(SchoolClass).where(SchoolClass.id.in_(class_ids), SchoolClass.school_id == school_id)
+    ):
+        raise not_found("Class not found")
+
+    today = date.today()
+    per_class = {
+        class_id: (int(total or 0), bool(overdue))
+        for class_id, total, overdue in db.execute(
+            select(
+                FeeStructure.class_id,
+                func.sum(FeeStructure.amount),
+                func.max(case((FeeStructure.due_date < today, 1), else_=0)),
+            )
+            .where(FeeStructure.academic_year_id == academic_year_id, FeeStructure.class_id.in_(class_ids))
+            .group_by(FeeStructure.class_id)
+        )
+    }
+    students = select(Enrollment.student_id).where(
+        Enrollment.academic_year_id == academic_year_id, Enrollment.status == "active"
+    )
+    paid = {
+        student_id: int(amount or 0)
+        for student_id, amount in db.execute(
+            select(FeePayment.student_id, func.sum(case((FeePayment.is_refund, -FeePayment.amount), else_=FeePayment.amount)))
+            .where(FeePayment.academic_year_id == academic_year_id, FeePayment.student_id.in_(students))
+            .group_by(FeePayment.student_id)
+        )
+    }
+    discounts: dict[uuid.UUID, list[tuple[str, int]]] = {}
+    for student_id, discount_type, value in db.execute(
+        select(StudentDiscount.student_id, Discount.discount_type, Discount.value)
+        .join(Discount, Discount.id == StudentDiscount.discount_id)
+        .where(Discount.school_id == school_id, StudentDiscount.student_id.in_(students))
+    ):
+        discounts.setdefault(student_id, []).append((discount_type, value))
+    existing = dict(
+        db.execute(
+            select(FeeDue.student_id, FeeDue.id).where(
+                FeeDue.academic_year_id == academic_year_id, FeeDue.student_id.in_(students)
+            )
+        ).all()
+    )
+
+    now = datetime.now(timezone.utc)
+    updates: list[dict[str, Any]] = []
+    inserts: list[dict[str, Any]] = []
+    for student_id, class_id in enrolled.items():
+        total_fee, overdue = per_class.get(class_id, (0, False))
+        discount_amount = discount_for(total_fee, discounts.get(student_id, []))
+        paid_amount = paid.get(student_id, 0)
+        due_amount = max(total_fee - discount_amount - paid_amount, 0)
+        status = "paid" if due_amount == 0 else ("partial" if paid_amount > 0 else "due")
+        if due_amount > 0 and overdue:
+            status = "overdue"
+        row = {
+            "student_id": student_id,
+            "academic_year_id": academic_year_id,
+            "total_fee": total_fee,
+            "discount_amount": discount_amount,
+            "paid_amount": paid_amount,
+            "due_amount": due_amount,
+            "status": status,
+            "last_calculated_date": today,
+            "updated_at": now,
+        }
+        if student_id in existing:
+            updates.append({"id": existing[student_id], **row})
+        else:
+            inserts.append({"id": uuid.uuid4(), **row})
+    if updates:
+        db.execute(update(FeeDue), updates)
+    if inserts:
+        db.execute(insert(FeeDue), inserts)
+    return len(updates) + len(inserts)
@@ -0,0 +1,530 @@
+import html
+import io
+import multiprocessing
+import uuid
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Optional
+
+import segno
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.cache import MISSING, TTLCache
+from app.core.config import settings
+from app.core.school_settings import get_school_profile
+from app.models.academic_year import AcademicYear
+from app.models.school import School
+from app.models.student import Student
+
+
+@dataclass(frozen=True)
+class IdCardContext:
+    """What every card of one school shares; load it once per document."""
+
+    school_name: str
+    school_code: str
+    address: str
+    phone: str
+    website: str
+    logo_url: str
+    year_name: str
+    issue_date: str
+
+
+@dataclass(frozen=True)
+class IdCard:
+    student_id: uuid.UUID
+    name: str
+    admission_no: str
+    roll_number: str
+    class_name: str
+    section_name: str
+    date_of_birth: str
+    blood_group: str
+    photo_url: str
+    emergency_phone: str
+
+
+def load_id_card_context(db: Session, school_id: uuid.UUID, year: Optional[AcademicYear]) -> IdCardContext:
+    school = db.get(School, school_id)
+    profile = get_school_profile(db, school_id)
+    return IdCardContext(
+        school_name=school.name if school else "School",
+        school_code=(school.code if school else "") or "",
+        address=profile.address,
+        phone=profile.phone,
+        website=profile.website,
+        logo_url=profile.logo_url,
+        year_name=year.name if year else "",
+        issue_date=datetime.now(timezone.utc).date().isoformat(),
+    )
+
+
+def current_year(db: Session, school_id: uuid.UUID) -> Optional[AcademicYear]:
+    return db.scalar(select(AcademicYear).where(AcademicYear.school_id == school_id, AcademicYear.is_current.is_(True)))
+
+
+def id_card_for(
+    s: Student, *, class_name: str = "", section_name: str = "", roll_number: Optional[int] = None
+) -> IdCard:
+    return IdCard(
+        student_id=s.id,
+        name=" ".join([part for part in [s.first_name, s.last_name or ""] if part]).strip(),
+        admission_no=s.admission_no or "",
+        roll_number=str(roll_number) if roll_number is not None else "",
+        class_name=class_name,
+        section_name=section_name,
+        date_of_birth=s.date_of_birth.isoformat() if isinstance(s.date_of_birth, date) else "",
+        blood_group=s.blood_group or "",
+        photo_url=s.photo_url or "",
+        emergency_phone=s.emergency_contact_phone or "",
+    )
+
+
+def qr_payload(ctx: IdCardContext, card: IdCard) -> str:
+    return "|".join(
+        [part for part in ["KUSKUL", ctx.school_code, str(card.student_id), card.admission_no] if part.strip()]
+    ).strip()
+
+
+def _make_qr_svg(payload: str) -> str:
+    try:
+        qr = segno.make(payload, error="m")
+        buf = io.BytesIO()
+        qr.save(buf, kind="svg", scale=4, border=1)
+        svg = buf.getvalue().decode("utf-8")
+        if svg.startswith("<?xml"):
+            svg = svg.split("?>", 1)[1]
+        return svg.strip()
+    except Exception:
+        return ""
+
+
+_qr_cache = TTLCache(ttl_seconds=settings.id_card_qr_cache_ttl_seconds, max_entries=settings.id_card_qr_cache_max_entries)
+
+
+def qr_svgs(payloads: Sequence[str], *, workers: int = 1) -> dict[str, str]:
+    """SVG QR codes by payload, memoized across requests.
+
+    Encoding dominates card rendering, so large sets of uncached payloads are
+    spread over a process pool when workers > 1.
+    """
+    found: dict[str, str] = {}
+    missing: list[str] = []
+    for payload in dict.fromkeys(payloads):
+        cached = _qr_cache.get(payload)
+        if cached is MISSING:
+            missing.append(payload)
+        else:
+            found[payload] = cached
+    if workers > 1 and len(missing) >= settings.id_card_parallel_threshold:
+        chunksize = max(1, len(missing) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            rendered = list(pool.map(_make_qr_svg, missing, chunksize=chunksize))
+    else:
+        rendered = [_make_qr_svg(payload) for payload in missing]
+    for payload, svg in zip(missing, rendered):
+        _qr_cache.set(payload, svg)
+        found[payload] = svg
+    return found
+
+
+def esc(v: Optional[str]) -> str:
+    return html.escape((v or "").strip())
+
+
+_STYLE = """      :root {
+        --card-w: 85.60mm;
+        --card-h: 53.98mm;
+        --border: #d0d5dd;
+        --text: #101828;
+        --muted: #475467;
+        --brand: #0b5fff;
+        --bg: #ffffff;
+      }
+      * { box-sizing: border-box; }
+      body {
+        margin: 0;
+        padding: 16px;
+        font-family: ui-sans-serif, system-ui, -apple-system, Segoe UI, Roboto, Helvetica, Arial, "Apple Color Emoji", "Segoe UI Emoji";
+        color: var(--text);
+        background: #f5f7fb;
+      }
+      .sheet {
+        display: flex;
+        flex-direction: column;
+        gap: 14px;
+        align-items: flex-start;
+      }
+      .card {
+        width: var(--card-w);
+        height: var(--card-h);
+        background: var(--bg);
+        border: 1px solid var(--border);
+        border-radius: 10px;
+        overflow: hidden;
+        position: relative;
+        box-shadow: 0 8px 24px rgba(16, 24, 40, 0.12);
+      }
+      .front .topbar {
+        height: 12mm;
+        background: linear-gradient(90deg, rgba(11,95,255,1) 0%, rgba(25,160,255,1) 100%);
+      }
+      .front .header {
+        position: absolute;
+        top: 0;
+        left: 0;
+        right: 0;
+        height: 12mm;
+        display: flex;
+        align-items: center;
+        padding: 4mm;
+        gap: 3mm;
+        color: #fff;
+      }
+      .logo {
+        width: 9mm;
+        height: 9mm;
+        border-radius: 4mm;
+        background: rgba(255,255,255,0.25);
+        display: flex;
+        align-items: center;
+        justify-content: center;
+        overflow: hidden;
+        flex: 0 0 auto;
+      }
+      .logo img {
+        width: 100%;
+        height: 100%;
+        object-fit: cover;
+      }
+      .school {
+        min-width: 0;
+        display: flex;
+        flex-direction: column;
+        line-height: 1.1;
+      }
+      .school .name {
+        font-weight: 800;
+        font-size: 12px;
+        white-space: nowrap;
+        overflow: hidden;
+        text-overflow: ellipsis;
+      }
+      .school .sub {
+        font-size: 10px;
+        opacity: 0.9;
+        white-space: nowrap;
+        overflow: hidden;
+        text-overflow: ellipsis;
+      }
+      .front .content {
+        position: absolute;
+        top: 12mm;
+        left: 0;
+        right: 0;
+        bottom: 0;
+        padding: 3.5mm 4mm 3.5mm 4mm;
+        display: grid;
+        grid-template-columns: 18mm 1fr;
+        gap: 3.5mm;
+      }
+      .photo {
+        width: 18mm;
+        height: 22mm;
+        border: 1px solid var(--border);
+        border-radius: 3mm;
+        overflow: hidden;
+        background: #eef2ff;
+      }
+      .photo img {
+        width: 100%;
+        height: 100%;
+        object-fit: cover;
+      }
+      .photo .ph {
+        width: 100%;
+        height: 100%;
+        display: flex;
+        align-items: center;
+        justify-content: center;
+        color: var(--muted);
+        font-size: 10px;
+        padding: 2mm;
+        text-align: center;
+      }
+      .fields {
+        display: grid;
+        grid-template-columns: 1fr 1fr;
+        gap: 2mm 3mm;
+        align-content: start;
+      }
+      .field {
+        min-width: 0;
+      }
+      .label {
+        font-size: 9px;
+        color: var(--muted);
+        letter-spacing: 0.02em;
+      }
+      .value {
+        font-size: 10.5px;
+        font-weight: 700;
+        white-space: nowrap;
+        overflow: hidden;
+        text-overflow: ellipsis;
+      }
+      .value.mono {
+        font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, "Liberation Mono", "Courier New", monospace;
+        font-weight: 600;
+      }
+      .nameLine {
+        grid-column: 1 / -1;
+      }
+      .nameLine .value {
+        font-size: 12px;
+        font-weight: 900;
+      }
+      .badge {
+        position: absolute;
+        bottom: 3mm;
+        right: 3mm;
+        font-size: 9px;
+        padding: 1.4mm 2.5mm;
+        border-radius: 999px;
+        background: rgba(11,95,255,0.10);
+        color: var(--brand);
+        border: 1px solid rgba(11,95,255,0.25);
+      }
+      .back {
+        padding: 4mm;
+        display: grid;
+        grid-template-columns: 1fr 20mm;
+        gap: 4mm;
+        height: 100%;
+      }
+      .back .left {
+        display: flex;
+        flex-direction: column;
+        gap: 2mm;
+        min-width: 0;
+      }
+      .back .row {
+        display: flex;
+        gap: 2mm;
+        line-height: 1.15;
+        min-width: 0;
+      }
+      .back .row .k {
+        width: 18mm;
+        flex: 0 0 auto;
+        font-size: 9px;
+        color: var(--muted);
+      }
+      .back .row .v {
+        font-size: 9.5px;
+        font-weight: 700;
+        min-width: 0;
+        overflow: hidden;
+        text-overflow: ellipsis;
+        white-space: nowrap;
+      }
+      .back .row .v.wrap {
+        white-space: normal;
+      }
+      .qr {
+        border: 1px dashed var(--border);
+        border-radius: 3mm;
+        padding: 2mm;
+        height: 100%;
+        display: flex;
+        flex-direction: column;
+        justify-content: space-between;
+        gap: 2mm;
+      }
+      .qr .box {
+        width: 100%;
+        aspect-ratio: 1 / 1;
+        background: #ffffff;
+        display: flex;
+        align-items: center;
+        justify-content: center;
+        border-radius: 2mm;
+      }
+      .qr .box svg {
+        width: 100%;
+        height: 100%;
+      }
+      .qr .txt {
+        font-size: 8px;
+        color: var(--muted);
+        word-break: break-all;
+      }
+      .sign {
+        margin-top: auto;
+        display: flex;
+        justify-content: space-between;
+        gap: 4mm;
+      }
+      .sig {
+        width: 34mm;
+        border-top: 1px solid var(--border);
+        padding-top: 1mm;
+        font-size: 8.5px;
+        color: var(--muted);
+        text-align: center;
+      }
+      @media print {
+        body { padding: 0; background: #fff; }
+        .card { box-shadow: none; }
+        .sheet { gap: 0; }
+        .front { break-after: page; }
+      }
+      .page {
+        display: flex;
+        flex-direction: column;
+        gap: 6mm;
+        margin-bottom: 10mm;
+      }
+      .page .sheet {
+        flex-direction: row;
+      }
+      @media print {
+        .page { break-after: page; margin: 0; }
+        .page:last-child { break-after: auto; }
+        .page .front { break-after: auto; }
+      }"""
+
+
+def render_card(ctx: IdCardContext, card: IdCard, qr_svg: str) -> str:
+    payload = qr_payload(ctx, card)
+    return f"""    <div class="sheet">
+    <div class="card front">
+      <div class="topbar"></div>
+      <div class="header">
+        <div class="logo">
+          {f'<img src="{esc(ctx.logo_url)}" alt="Logo" />' if ctx.logo_url else '<span style="font-weight:800;font-size:10px;">ID</span>'}
+        </div>
+        <div class="school">
+          <div class="name">{esc(ctx.school_name)}</div>
+          <div class="sub">Student Identity Card</div>
+        </div>
+      </div>
+      <div class="content">
+        <div class="photo">
+          {f'<img src="{esc(card.photo_url)}" alt="Student photo" />' if card.photo_url else '<div class="ph">Photo</div>'}
+        </div>
+        <div class="fields">
+          <div class="field nameLine">
+            <div class="label">Student Name</div>
+            <div class="value">{esc(card.name)}</div>
+          </div>
+          <div class="field">
+            <div class="label">Admission No</div>
+            <div class="value mono">{esc(card.admission_no)}</div>
+          </div>
+          <div class="field">
+            <div class="label">Roll No</div>
+            <div class="value mono">{esc(card.roll_number)}</div>
+          </div>
+          <div class="field">
+            <div class="label">Class</div>
+            <div class="value">{esc(card.class_name)}</div>
+          </div>
+          <div class="field">
+            <div class="label">Section</div>
+            <div class="value">{esc(card.section_name)}</div>
+          </div>
+          <div class="field">
+            <div class="label">Date of Birth</div>
+            <div class="value mono">{esc(card.date_of_birth)}</div>
+          </div>
+          <div class="field">
+            <div class="label">Blood Group</div>
+            <div class="value">{esc(card.blood_group)}</div>
+          </div>
+        </div>
+      </div>
+      <div class="badge">{esc(ctx.year_name or "Active")}</div>
+    </div>
+
+    <div class="card">
+      <div class="back">
+        <div class="left">
+          <div class="row">
+            <div class="k">School</div>
+            <div class="v">{esc(ctx.school_name)}</div>
+          </div>
+          <div class="row">
+            <div class="k">Address</div>
+            <div class="v wrap">{esc(ctx.address)}</div>
+          </div>
+          <div class="row">
+            <div class="k">Phone</div>
+            <div class="v">{esc(ctx.phone)}</div>
+          </div>
+          <div class="row">
+            <div class="k">Website</div>
+            <div class="v">{esc(ctx.website)}</div>
+          </div>
+          <div class="row">
+            <div class="k">Emergency</div>
+            <div class="v">{esc(card.emergency_phone)}</div>
+          </div>
+          <div class="row">
+            <div class="k">Issued</div>
+            <div class="v mono">{esc(ctx.issue_date)}</div>
+          </div>
+          <div class="sign">
+            <div class="sig">Student Signature</div>
+            <div class="sig">Authorized Signature</div>
+          </div>
+        </div>
+        <div class="qr">
+          <div class="box">{qr_svg if qr_svg else '<div class="txt">QR</div>'}</div>
+          <div class="txt">{esc(payload)}</div>
+        </div>
+      </div>
+    </div>
+    </div>
+"""
+
+
+def _head(title: str) -> str:
+    return f"""<!doctype html>
+<html lang="en">
+  <head>
+    <meta charset="utf-8" />
+    <meta name="viewport" content="width=device-width, initial-scale=1" />
+    <title>{esc(title)}</title>
+    <style>
+{_STYLE}
+    </style>
+  </head>
+  <body>
+"""
+
+
+_FOOT = """  </body>
+</html>
+"""
+
+
+def render_id_card(ctx: IdCardContext, card: IdCard) -> str:
+    svg = qr_svgs([qr_payload(ctx, card)])[qr_payload(ctx, card)]
+    return _head(f"ID Card - {card.name}") + render_card(ctx, card, svg) + _FOOT
+
+
+def iter_id_card_document(
+    ctx: IdCardContext, cards: Sequence[IdCard], *, title: str, per_page: int = 4, workers: int = 1
+) -> Iterator[str]:
+    """Yield a printable HTML document with per_page cards (front and back side by side) per page."""
+    svgs = qr_svgs([qr_payload(ctx, card) for card in cards], workers=workers)
+    yield _head(title)
+    for start in range(0, len(cards), per_page):
+        page = cards[start : start + per_page]
+        yield '  <div class="page">\n' + "".join(render_card(ctx, c, svgs[qr_payload(ctx, c)]) for c in page) + "  </div>\n"
+    yield _FOOT
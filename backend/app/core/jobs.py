@@ -0,0 +1,412 @@
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.tenant_context import reset_tenant_id, set_tenant_id
+from app.db.session import SessionLocal
+from app.models.job import Job
+from app.models.school import School
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = frozenset({"succeeded", "failed", "cancelled"})
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class JobContext:
+    def __init__(self, db: Session, job: Job, session_factory: Callable[[], Session], worker_id: Optional[str] = None) -> None:
+        self.db = db
+        self.job_id = job.id
+        self.school_id = job.school_id
+        self.user_id = job.created_by_user_id
+        self.params: dict[str, Any] = json.loads(job.params) if job.params else {}
+        self.payload = job.payload
+        self.total: Optional[int] = None
+        self._session_factory = session_factory
+        self._worker_id = worker_id
+        self._reported: Optional[tuple[int, float]] = None
+
+    def progress(self, percent: int) -> None:
+        """Record progress and refresh the job's heartbeat; raises JobCancelled once a cancel was requested.
+
+        The job row is written outside the handler's transaction, except on SQLite where
+        every session shares one connection and committing there would also commit the
+        handler's pending writes. A job reclaimed by another worker is stopped the same way.
+        """
+        percent = max(0, min(100, int(percent)))
+        if self._reported is not None and self._reported[0] == percent and time.monotonic() - self._reported[1] < 30:
+            return
+        self._reported = (percent, time.monotonic())
+        values = {"progress": percent, "updated_at": datetime.now(timezone.utc)}
+        if self.db.get_bind().dialect.name == "sqlite":
+            self.db.execute(update(Job).where(Job.id == self.job_id).values(**values))
+            state = self.db.execute(select(Job.cancel_requested, Job.status, Job.worker_id).where(Job.id == self.job_id)).one()
+        else:
+            with self._session_factory() as s:
+                s.execute(update(Job).where(Job.id == self.job_id).values(**values))
+                state = s.execute(select(Job.cancel_requested, Job.status, Job.worker_id).where(Job.id == self.job_id)).one()
+                s.commit()
+        if state.cancel_requested or state.status != "running" or (self._worker_id and state.worker_id != self._worker_id):
+            raise JobCancelled()
+
+
+_current_job: ContextVar[Optional[JobContext]] = ContextVar("current_job", default=None)
+
+
+def report_progress(done: int, total: Optional[int] = None) -> None:
+    """Report progress of the job running in this context, if any; total defaults to the context's total.
+
+    Call it between steps whose writes are either committed or not yet issued, so a
+    cancel can roll the rest back. Raises JobCancelled once a cancel was requested.
+    """
+    ctx = _current_job.get()
+    if ctx is None:
+        return
+    total = total if total is not None else ctx.total
+    if total:
+        ctx.progress(done * 100 // total)
+
+
+JobHandler = Callable[[JobContext], Optional[dict[str, Any]]]
+
+
+@dataclass(frozen=True)
+class JobSpec:
+    kind: str
+    handler: JobHandler
+    permission: str
+    max_attempts: int = 1
+    needs_upload: bool = False
+
+
+_registry: dict[str, JobSpec] = {}
+
+
+def job_handler(kind: str, *, permission: str, max_attempts: int = 1, needs_upload: bool = False) -> Callable[[JobHandler], JobHandler]:
+    """Register a handler for a job kind; permission is what enqueueing and viewing the job requires."""
+
+    def decorator(fn: JobHandler) -> JobHandler:
+        _registry[kind] = JobSpec(kind=kind, handler=fn, permission=permission, max_attempts=max_attempts, needs_upload=needs_upload)
+        return fn
+
+    return decorator
+
+
+def get_job_spec(kind: str) -> Optional[JobSpec]:
+    return _registry.get(kind)
+
+
+def _error_detail(exc: BaseException) -> str:
+    if isinstance(exc, HTTPException):
+        detail = exc.detail
+        if isinstance(detail, dict):
+            return str(detail.get("detail") or detail.get("title") or exc.status_code)
+        return str(detail)
+    return str(exc) or exc.__class__.__name__
+
+
+class JobRunner:
+    """Runs queued jobs from the jobs table with a pool of worker threads.
+
+    Workers claim a job with a conditional UPDATE on its status, so any number of
+    runners (in the API process or in app.scripts.job_worker) can share one queue.
+    When no worker is running and inline_fallback is set, submitted jobs run in the
+    calling thread instead.
+    """
+
+    def __init__(
+        self,
+        *,
+        session_factory: Callable[[], Session] = SessionLocal,
+        concurrency: int = 2,
+        poll_interval_seconds: float = 1.0,
+        inline_fallback: bool = True,
+    ) -> None:
+        self.session_factory = session_factory
+        self.concurrency = max(1, concurrency)
+        self.poll_interval_seconds = poll_interval_seconds
+        self.inline_fallback = inline_fallback
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._next_reclaim = 0.0
+        self._threads: list[threading.Thread] = []
+
+    @property
+    def running(self) -> bool:
+        return any(t.is_alive() for t in self._threads)
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._run, name=f"job-worker-{i}", daemon=True) for i in range(self.concurrency)
+        ]
+        for t in self._threads:
+            t.start()
+
+    def stop(self, timeout: Optional[float] = 30.0) -> None:
+        self._stop.set()
+        self._wakeup.set()
+        for t in self._threads:
+            t.join(timeout)
+        self._threads = []
+
+    def submit(self, job_id: uuid.UUID) -> None:
+        if self.running:
+            self._wakeup.set()
+        elif self.inline_fallback:
+            self.run_job(job_id)
+
+    def run_pending(self, limit: Optional[int] = None) -> int:
+        if time.monotonic() >= self._next_reclaim:
+            self._next_reclaim = time.monotonic() + min(60.0, settings.jobs_stale_after_seconds / 2)
+            self.reclaim_stale()
+        ran = 0
+        while limit is None or ran < limit:
+            job_id = self._claim()
+            if job_id is None:
+                break
+            self._execute(job_id)
+            ran += 1
+        return ran
+
+    def run_job(self, job_id: uuid.UUID) -> bool:
+        if self._claim(job_id) is None:
+            return False
+        self._execute(job_id)
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            if self.run_pending(limit=1):
+                continue
+            self._wakeup.wait(self.poll_interval_seconds)
+            self._wakeup.clear()
+
+    def reclaim_stale(self) -> int:
+        """Requeue or fail running jobs whose worker stopped sending heartbeats."""
+        db = self.session_factory()
+        try:
+            now = datetime.now(timezone.utc)
+            stale = and_(Job.status == "running", Job.updated_at < now - timedelta(seconds=settings.jobs_stale_after_seconds))
+            error = "Worker stopped responding"
+            reclaimed = 0
+            for condition, values in (
+                (Job.cancel_requested.is_(True), {"status": "cancelled", "finished_at": now}),
+                (Job.attempts < Job.max_attempts, {"status": "queued", "worker_id": None, "started_at": None}),
+                (Job.attempts >= Job.max_attempts, {"status": "failed", "finished_at": now}),
+            ):
+                reclaimed += db.execute(
+                    update(Job)
+                    .where(stale, condition)
+                    .values(error=error, updated_at=now, **values)
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+            db.commit()
+            if reclaimed:
+                logger.warning("Reclaimed %d stale running jobs", reclaimed)
+            return reclaimed
+        finally:
+            db.close()
+
+    def _claim(self, job_id: Optional[uuid.UUID] = None) -> Optional[uuid.UUID]:
+        db = self.session_factory()
+        try:
+            for _ in range(5):
+                candidate = job_id
+                if candidate is None:
+                    candidate = db.scalar(
+                        select(Job.id).where(Job.status == "queued").order_by(Job.created_at).limit(1)
+                    )
+                    if candidate is None:
+                        return None
+                now = datetime.now(timezone.utc)
+                claimed = db.execute(
+                    update(Job)
+                    .where(Job.id == candidate, Job.status == "queued")
+                    .values(status="running", worker_id=self.worker_id, attempts=Job.attempts + 1, started_at=now, updated_at=now)
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+                db.commit()
+                if claimed:
+                    return candidate
+                if job_id is not None:
+                    return None
+            return None
+        finally:
+            db.close()
+
+    def _execute(self, job_id: uuid.UUID) -> None:
+        db = self.session_factory()
+        try:
+            job = db.get(Job, job_id)
+            kind, attempts, max_attempts = job.kind, job.attempts, job.max_attempts
+            spec = _registry.get(kind)
+            token = set_tenant_id(db.scalar(select(School.tenant_id).where(School.id == job.school_id)))
+            try:
+                if spec is None:
+                    raise LookupError(f"Unknown job kind: {kind}")
+                if job.cancel_requested:
+                    raise JobCancelled()
+                ctx = JobContext(db, job, self.session_factory, self.worker_id)
+                job_token = _current_job.set(ctx)
+                try:
+                    result = spec.handler(ctx)
+                finally:
+                    _current_job.reset(job_token)
+            except JobCancelled:
+                db.rollback()
+                self._finish(db, job_id, status="cancelled")
+            except HTTPException as exc:
+                db.rollback()
+                self._finish(db, job_id, status="failed", error=_error_detail(exc))
+            except Exception as exc:
+                db.rollback()
+                logger.exception("Job %s (%s) failed on attempt %d", job_id, kind, attempts)
+                if attempts < max_attempts:
+                    self._finish(db, job_id, status="queued", error=_error_detail(exc))
+                    self._wakeup.set()
+                else:
+                    self._finish(db, job_id, status="failed", error=_error_detail(exc))
+            else:
+                self._finish(
+                    db,
+                    job_id,
+                    status="succeeded",
+                    result=None if result is None else json.dumps(result, default=str),
+                )
+            finally:
+                reset_tenant_id(token)
+        finally:
+            db.close()
+
+    def _finish(self, db: Session, job_id: uuid.UUID, *, status: str, result: Optional[str] = None, error: Optional[str] = None) -> None:
+        now = datetime.now(timezone.utc)
+        values: dict[str, Any] = {"status": status, "error": error, "result": result, "updated_at": now}
+        if status == "queued":
+            values.update(worker_id=None, started_at=None)
+        else:
+            values["finished_at"] = now
+        if status == "succeeded":
+            values["progress"] = 100
+        # A job reclaimed from this worker after a missed heartbeat belongs to someone else now.
+        db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == "running", Job.worker_id == self.worker_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+
+job_runner = JobRunner(
+    concurrency=settings.jobs_worker_count,
+    poll_interval_seconds=settings.jobs_poll_interval_seconds,
+    inline_fallback=settings.jobs_mode != "external",
+)
+
+
+def enqueue_job(
+    db: Session,
+    *,
+    kind: str,
+    school_id: uuid.UUID,
+    user_id: Optional[uuid.UUID],
+    params: Optional[dict[str, Any]] = None,
+    payload: Optional[bytes] = None,
+) -> Job:
+    spec = _registry[kind]
+    now = datetime.now(timezone.utc)
+    job = Job(
+        school_id=school_id,
+        created_by_user_id=user_id,
+        kind=kind,
+        status="queued",
+        params=json.dumps(params or {}, default=str),
+        payload=payload,
+        progress=0,
+        attempts=0,
+        max_attempts=spec.max_attempts,
+        cancel_requested=False,
+        created_at=now,
+        updated_at=now,
+    )
+    db.add(job)
+    db.commit()
+    job_runner.submit(job.id)
+    db.refresh(job)
+    return job
+
+
+def cancel_job(db: Session, job: Job) -> Job:
+    """Cancel a queued job outright; a running job stops at its next progress checkpoint."""
+    now = datetime.now(timezone.utc)
+    cancelled = db.execute(
+        update(Job)
+        .where(Job.id == job.id, Job.status == "queued")
+        .values(status="cancelled", cancel_requested=True, finished_at=now, updated_at=now)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not cancelled:
+        db.execute(
+            update(Job)
+            .where(Job.id == job.id, Job.status == "running")
+            .values(cancel_requested=True, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def is_stale(job: Job) -> bool:
+    """True for a running job whose worker has not sent a heartbeat within jobs_stale_after_seconds."""
+    updated_at = job.updated_at if job.updated_at.tzinfo else job.updated_at.replace(tzinfo=timezone.utc)
+    return job.status == "running" and datetime.now(timezone.utc) - updated_at > timedelta(seconds=settings.jobs_stale_after_seconds)
+
+
+def retry_job(db: Session, job: Job) -> Job:
+    """Requeue a failed or cancelled job, or a running one whose worker stopped sending heartbeats."""
+    now = datetime.now(timezone.utc)
+    stale = and_(Job.status == "running", Job.updated_at < now - timedelta(seconds=settings.jobs_stale_after_seconds))
+    requeued = db.execute(
+        update(Job)
+        .where(Job.id == job.id, or_(Job.status.in_(["failed", "cancelled"]), stale))
+        .values(
+            status="queued",
+            attempts=0,
+            progress=0,
+            result=None,
+            error=None,
+            cancel_requested=False,
+            worker_id=None,
+            started_at=None,
+            finished_at=None,
+            updated_at=now,
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+    if requeued:
+        job_runner.submit(job.id)
+    db.refresh(job)
+    return job
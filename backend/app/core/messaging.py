@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import uuid
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Optional, Protocol
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class OutboundMessage:
+    id: uuid.UUID
+    channel: str
+    recipient: str
+    body: str
+    subject: Optional[str] = None
+
+
+class MessageTransport(Protocol):
+    async def send(self, message: OutboundMessage) -> None:
+        """Hand one message to the provider; raise to mark it failed."""
+        ...
+
+
+class LogTransport:
+    """Default transport until an SMS/email provider is registered: logs instead of sending."""
+
+    async def send(self, message: OutboundMessage) -> None:
+        logger.info("%s to %s: %s", message.channel, message.recipient, message.subject or message.body[:80])
+
+
+class FakeTransport:
+    """In-memory transport for tests and benchmarks."""
+
+    def __init__(self, *, delay_seconds: float = 0.0, fail_recipients: Sequence[str] = ()) -> None:
+        self.delay_seconds = delay_seconds
+        self.fail_recipients = set(fail_recipients)
+        self.sent: list[OutboundMessage] = []
+
+    async def send(self, message: OutboundMessage) -> None:
+        if self.delay_seconds:
+            await asyncio.sleep(self.delay_seconds)
+        if message.recipient in self.fail_recipients:
+            raise RuntimeError(f"rejected {message.recipient}")
+        self.sent.append(message)
+
+
+_transports: dict[str, Callable[[], MessageTransport]] = {"log": LogTransport, "fake": FakeTransport}
+
+
+def register_transport(name: str, factory: Callable[[], MessageTransport]) -> None:
+    _transports[name] = factory
+
+
+def get_transport(name: Optional[str] = None) -> MessageTransport:
+    name = name or settings.messaging_transport
+    factory = _transports.get(name)
+    if factory is None:
+        raise ValueError(f"Unknown messaging transport: {name}")
+    return factory()
+
+
+@dataclass
+class DeliveryReport:
+    sent: list[uuid.UUID] = field(default_factory=list)
+    failed: list[uuid.UUID] = field(default_factory=list)
+
+
+class _Pacer:
+    """Spaces send starts at least 1/rate seconds apart across all workers."""
+
+    def __init__(self, rate_per_second: float) -> None:
+        self.interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        if not self.interval:
+            return
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            now = loop.time()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+async def _deliver(
+    messages: Sequence[OutboundMessage], transport: MessageTransport, workers: int, rate_per_second: float, timeout: float
+) -> DeliveryReport:
+    report = DeliveryReport()
+    pending: asyncio.Queue[OutboundMessage] = asyncio.Queue()
+    for message in messages:
+        pending.put_nowait(message)
+    pacer = _Pacer(rate_per_second)
+
+    async def worker() -> None:
+        while True:
+            try:
+                message = pending.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await pacer.wait()
+            try:
+                await asyncio.wait_for(transport.send(message), timeout)
+            except Exception:
+                logger.warning("Failed to deliver %s message %s", message.channel, message.id, exc_info=True)
+                report.failed.append(message.id)
+            else:
+                report.sent.append(message.id)
+
+    await asyncio.gather(*(worker() for _ in range(max(1, min(workers, len(messages))))))
+    return report
+
+
+def deliver_messages(
+    messages: Sequence[OutboundMessage],
+    *,
+    transport: Optional[MessageTransport] = None,
+    workers: Optional[int] = None,
+    rate_per_second: Optional[float] = None,
+) -> DeliveryReport:
+    """Send messages through a pool of asyncio workers sharing one rate limit; blocks until all are settled.
+
+    A failed or timed-out send is logged and reported, never raised.
+    """
+    if not messages:
+        return DeliveryReport()
+    return asyncio.run(
+        _deliver(
+            messages,
+            transport or get_transport(),
+            workers or settings.messaging_workers,
+            settings.messaging_rate_per_second if rate_per_second is None else rate_per_second,
+            settings.messaging_send_timeout_seconds,
+        )
+    )
@@ -0,0 +1,110 @@
+import uuid
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.audit import enqueue_audit_log
+from app.core.config import settings
+from app.core.rate_limit import RateLimiter, RateLimitRule
+from app.core.security import decode_access_token
+
+
+_MUTATING_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+class SecurityHeadersMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        limiter: RateLimiter,
+        auth_rule: RateLimitRule,
+        api_rule: RateLimitRule,
+    ) -> None:
+        self.app = app
+        self.limiter = limiter
+        self.auth_rule = auth_rule
+        self.api_rule = api_rule
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        if settings.rate_limit_enabled and scope["method"] != "OPTIONS":
+            client = scope.get("client")
+            client_host = client[0] if client else "unknown"
+            is_auth = path.startswith(f"{settings.api_v1_prefix}/auth/") and path.endswith(("/login", "/register"))
+            rule = self.auth_rule if is_auth else self.api_rule
+            key = f"{client_host}:{'auth' if is_auth else 'api'}"
+            if not self.limiter.allow(key=key, rule=rule):
+                resp = JSONResponse(
+                    status_code=429,
+                    media_type="application/problem+json",
+                    content={"type": "about:blank", "title": "Too Many Requests", "status": 429, "detail": "Rate limit exceeded"},
+                )
+                await resp(scope, receive, self._wrap_send(send, path))
+                return
+
+        await self.app(scope, receive, self._wrap_send(send, path))
+
+    @staticmethod
+    def _wrap_send(send: Send, path: str) -> Send:
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.setdefault("X-Content-Type-Options", "nosniff")
+                headers.setdefault("X-Frame-Options", "DENY")
+                headers.setdefault("Referrer-Policy", "no-referrer")
+                if path not in {"/docs", "/redoc"}:
+                    headers.setdefault("Content-Security-Policy", "default-src 'self'")
+                if settings.environment == "production":
+                    headers.setdefault("Strict-Transport-Security", "max-age=31536000; includeSubDomains")
+            await send(message)
+
+        return send_with_headers
+
+
+class AuditLogMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in _MUTATING_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_capturing_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        await self.app(scope, receive, send_capturing_status)
+
+        if status_code >= 500:
+            return
+        headers = Headers(scope=scope)
+        school_raw = headers.get("X-School-Id")
+        if not school_raw:
+            return
+        try:
+            school_id = uuid.UUID(school_raw)
+        except Exception:
+            return
+        user_id = scope.get("state", {}).get("user_id")
+        auth = headers.get("Authorization", "")
+        if user_id is None and auth.lower().startswith("bearer "):
+            token = auth.split(" ", 1)[1].strip()
+            try:
+                payload = decode_access_token(token)
+                user_id = uuid.UUID(payload["sub"])
+            except Exception:
+                user_id = None
+        action = f"{scope['method']} {scope['path']}"
+        enqueue_audit_log(school_id=school_id, action=action, user_id=user_id)
+
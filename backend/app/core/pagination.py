@@ -0,0 +1,92 @@
+import base64
+import json
+import uuid
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Optional
+
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute, Session
+
+from app.core.problems import problem
+
+MAX_PAGE_SIZE = 200
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def _decode_value(key: InstrumentedAttribute, value: Any) -> Any:
+    if value is None:
+        return None
+    python_type = key.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type is uuid.UUID:
+        return uuid.UUID(value)
+    return python_type(value)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence[InstrumentedAttribute]) -> list[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError("cursor shape")
+        return [_decode_value(k, v) for k, v in zip(keys, values)]
+    except (ValueError, TypeError) as exc:
+        raise problem(status_code=400, title="Bad Request", detail="Invalid cursor") from exc
+
+
+@dataclass
+class KeysetPage:
+    rows: list[Any]
+    next_cursor: Optional[str]
+    limit: int
+    total: Optional[int]
+
+    def response(self, items: list[Any]) -> dict[str, Any]:
+        return {"items": items, "next_cursor": self.next_cursor, "limit": self.limit, "total": self.total}
+
+
+def keyset_page(
+    db: Session,
+    stmt: Select,
+    *,
+    keys: Sequence[InstrumentedAttribute],
+    cursor: str,
+    limit: int,
+    descending: bool = False,
+    with_total: bool = False,
+) -> KeysetPage:
+    """Fetch one page of stmt ordered by keys, resuming after cursor.
+
+    keys must end with a unique column so the order is total; an empty cursor
+    starts at the first page. next_cursor is None on the last page, and the full
+    result is only counted when with_total is set.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    total = db.scalar(select(func.count()).select_from(stmt.subquery())) if with_total else None
+    if cursor:
+        boundary = tuple_(*decode_cursor(cursor, keys))
+        stmt = stmt.where(tuple_(*keys) < boundary if descending else tuple_(*keys) > boundary)
+    order = [k.desc() for k in keys] if descending else [k.asc() for k in keys]
+    rows = db.execute(stmt.order_by(*order).limit(limit + 1)).scalars().all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([getattr(rows[-1], k.key) for k in keys])
+    return KeysetPage(rows=list(rows), next_cursor=next_cursor, limit=limit, total=None if total is None else int(total))
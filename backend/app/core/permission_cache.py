@@ -0,0 +1,37 @@
+import uuid
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Optional, TypeVar
+
+from app.core.cache import MISSING, TTLCache
+from app.core.cache_versions import version_store
+from app.core.config import settings
+
+T = TypeVar("T")
+
+_VERSION_KEY = "permissions"
+
+
+@dataclass(frozen=True)
+class SchoolGrant:
+    school_tenant_id: Optional[uuid.UUID]
+    permissions: frozenset[str]
+    is_member: bool = False
+
+
+_cache = TTLCache(ttl_seconds=settings.permission_cache_ttl_seconds, max_entries=settings.permission_cache_max_entries)
+
+
+def get_or_load(key: Hashable, loader: Callable[[], T]) -> T:
+    version = version_store.get(_VERSION_KEY)
+    cached = _cache.get(key)
+    if cached is not MISSING and cached[0] == version:
+        return cached[1]
+    value = loader()
+    _cache.set(key, (version, value))
+    return value
+
+
+def invalidate_permissions() -> None:
+    _cache.clear()
+    version_store.bump(_VERSION_KEY)
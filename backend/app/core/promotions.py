@@ -0,0 +1,101 @@
+import uuid
+from collections import Counter
+from collections.abc import Sequence
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from sqlalchemy import and_, insert, select, update
+from sqlalchemy.orm import Session, aliased
+
+from app.core.jobs import report_progress
+from app.core.problems import not_found, problem
+from app.models.enrollment import Enrollment
+from app.models.student import Student
+
+
+def promote_enrollments(
+    db: Session,
+    school_id: uuid.UUID,
+    *,
+    enrollment_ids: Sequence[uuid.UUID],
+    new_academic_year_id: uuid.UUID,
+    new_class_id: uuid.UUID,
+    new_section_id: Optional[uuid.UUID] = None,
+    dry_run: bool = False,
+) -> dict[str, Any]:
+    """Mark enrollments promoted and enroll their students in the target year, set-based.
+
+    Loads and checks every enrollment in one query, finds students already
+    enrolled in the target year with one join, then applies one UPDATE and one
+    bulk INSERT. A dry run reports the planned changes and conflicts instead of
+    raising, and writes nothing.
+    """
+    ids = list(dict.fromkeys(enrollment_ids))
+    rows = db.execute(
+        select(Enrollment.id, Enrollment.student_id, Enrollment.academic_year_id, Enrollment.class_id, Enrollment.section_id)
+        .join(Student, Student.id == Enrollment.student_id)
+        .where(Enrollment.id.in_(ids), Student.school_id == school_id)
+    ).all()
+    if len(rows) != len(ids):
+        raise not_found("Enrollment not found")
+
+    student_ids = [r.student_id for r in rows]
+    target = aliased(Enrollment)
+    conflicts = set(
+        db.execute(
+            select(Enrollment.student_id)
+            .join(target, and_(target.student_id == Enrollment.student_id, target.academic_year_id == new_academic_year_id))
+            .where(Enrollment.id.in_(ids))
+            .distinct()
+        ).scalars()
+    )
+    conflicts.update(sid for sid, n in Counter(student_ids).items() if n > 1)
+
+    if dry_run:
+        return {
+            "created": 0,
+            "dry_run": True,
+            "would_create": len(rows) - sum(1 for r in rows if r.student_id in conflicts),
+            "conflicts": sorted(str(sid) for sid in conflicts),
+            "changes": [
+                {
+                    "enrollment_id": str(r.id),
+                    "student_id": str(r.student_id),
+                    "from_academic_year_id": str(r.academic_year_id),
+                    "from_class_id": str(r.class_id),
+                    "from_section_id": str(r.section_id) if r.section_id else None,
+                    "to_academic_year_id": str(new_academic_year_id),
+                    "to_class_id": str(new_class_id),
+                    "to_section_id": str(new_section_id) if new_section_id else None,
+                    "conflict": r.student_id in conflicts,
+                }
+                for r in rows
+            ],
+        }
+    if conflicts:
+        raise problem(status_code=409, title="Conflict", detail="Student already enrolled in target academic year")
+
+    report_progress(1, 2)
+    now = datetime.now(timezone.utc)
+    db.execute(
+        update(Enrollment).where(Enrollment.id.in_(ids)).values(status="promoted"),
+        execution_options={"synchronize_session": False},
+    )
+    db.execute(
+        insert(Enrollment.__table__),
+        [
+            {
+                "id": uuid.uuid4(),
+                "student_id": sid,
+                "academic_year_id": new_academic_year_id,
+                "class_id": new_class_id,
+                "section_id": new_section_id,
+                "roll_number": None,
+                "status": "active",
+                "created_at": now,
+            }
+            for sid in student_ids
+        ],
+    )
+    db.commit()
+    return {"created": len(student_ids)}
@@ -1,6 +1,8 @@
+import threading
 import time
-from collections import defaultdict, deque
+from collections.abc import Callable
 from dataclasses import dataclass
+from typing import Optional, Protocol
 
 
 @dataclass(frozen=True)
@@ -9,18 +11,62 @@ class RateLimitRule:
     max_requests: int
 
 
-class InMemoryRateLimiter:
-    def __init__(self) -> None:
-        self._buckets: dict[str, deque[float]] = defaultdict(deque)
+class RateLimitBackend(Protocol):
+    def acquire(self, key: str, *, now: float, increment: float, window: float) -> bool:
+        """Atomically advance the key's theoretical arrival time (TAT) by increment.
+
+        The request is allowed when the advanced TAT stays within window of now;
+        denied requests must leave the stored TAT untouched. A shared store only has
+        to keep one float per key, expiring when the TAT is in the past.
+        """
+        ...
+
+
+class LocalRateLimitBackend:
+    def __init__(self, *, max_keys: int = 200_000, sweep_interval_seconds: float = 60.0) -> None:
+        self.max_keys = max_keys
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self._tat: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._next_sweep = 0.0
+
+    def acquire(self, key: str, *, now: float, increment: float, window: float) -> bool:
+        with self._lock:
+            if now >= self._next_sweep or len(self._tat) >= self.max_keys:
+                self._sweep(now)
+            tat = self._tat.get(key, now)
+            if tat < now:
+                tat = now
+            new_tat = tat + increment
+            if new_tat - now > window:
+                return False
+            self._tat[key] = new_tat
+            return True
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._tat)
+
+    def _sweep(self, now: float) -> None:
+        self._next_sweep = now + self.sweep_interval_seconds
+        idle = [k for k, tat in self._tat.items() if tat <= now]
+        for k in idle:
+            del self._tat[k]
+        overflow = len(self._tat) - int(self.max_keys * 0.9)
+        if overflow > 0:
+            for k in list(self._tat)[:overflow]:
+                del self._tat[k]
+
+
+class RateLimiter:
+    """GCRA limiter: allows max_requests as a burst, then one every window/max_requests seconds."""
+
+    def __init__(self, backend: Optional[RateLimitBackend] = None, *, clock: Callable[[], float] = time.time) -> None:
+        self.backend = backend if backend is not None else LocalRateLimitBackend()
+        self.clock = clock
 
     def allow(self, *, key: str, rule: RateLimitRule) -> bool:
-        now = time.time()
-        bucket = self._buckets[key]
-        cutoff = now - rule.window_seconds
-        while bucket and bucket[0] < cutoff:
-            bucket.popleft()
-        if len(bucket) >= rule.max_requests:
+        if rule.max_requests <= 0:
             return False
-        bucket.append(now)
-        return True
-
+        increment = rule.window_seconds / rule.max_requests
+        return self.backend.acquire(key, now=self.clock(), increment=increment, window=rule.window_seconds)
@@ -0,0 +1,138 @@
+import uuid
+from collections import defaultdict
+from collections.abc import Collection, Sequence
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from sqlalchemy import case, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models.academic_year import AcademicYear
+from app.models.exam import Exam
+from app.models.exam_schedule import ExamSchedule
+from app.models.grade import Grade
+from app.models.mark import Mark
+from app.models.result import Result
+from app.models.student import Student
+
+GradeBand = tuple[float, float, uuid.UUID]
+
+
+def load_grade_bands(db: Session, school_id: uuid.UUID) -> list[GradeBand]:
+    return [
+        (row.min_percentage, row.max_percentage, row.id)
+        for row in db.execute(
+            select(Grade.id, Grade.min_percentage, Grade.max_percentage).where(Grade.school_id == school_id)
+        )
+    ]
+
+
+def pick_grade(bands: Sequence[GradeBand], percentage: float) -> Optional[uuid.UUID]:
+    for low, high, grade_id in bands:
+        if low <= percentage <= high:
+            return grade_id
+    return None
+
+
+def compute_results(
+    db: Session,
+    *,
+    school_id: uuid.UUID,
+    exam_id: uuid.UUID,
+    student_ids: Optional[Collection[uuid.UUID]] = None,
+) -> list[dict[str, Any]]:
+    """Recompute and upsert Result rows for an exam, optionally limited to student_ids.
+
+    A student's total is the max_marks of every schedule of the exam in the classes
+    they have marks for. Issues a fixed number of statements regardless of how many
+    students are affected and leaves committing to the caller.
+    """
+    if student_ids is not None and not student_ids:
+        return []
+    obtained_expr = func.coalesce(
+        func.sum(case((Mark.is_absent.is_(False), func.coalesce(Mark.marks_obtained, 0)), else_=0)), 0
+    )
+    marks_q = (
+        select(Mark.student_id, ExamSchedule.class_id, obtained_expr)
+        .join(ExamSchedule, ExamSchedule.id == Mark.exam_schedule_id)
+        .join(Student, Student.id == Mark.student_id)
+        .where(ExamSchedule.exam_id == exam_id, Student.school_id == school_id)
+        .group_by(Mark.student_id, ExamSchedule.class_id)
+    )
+    if student_ids is not None:
+        marks_q = marks_q.where(Mark.student_id.in_(student_ids))
+    per_class = db.execute(marks_q).all()
+    if not per_class:
+        return []
+
+    class_totals = dict(
+        db.execute(
+            select(ExamSchedule.class_id, func.sum(ExamSchedule.max_marks))
+            .where(ExamSchedule.exam_id == exam_id)
+            .group_by(ExamSchedule.class_id)
+        ).all()
+    )
+    totals: dict[uuid.UUID, list[int]] = defaultdict(lambda: [0, 0])
+    for student_id, class_id, obtained in per_class:
+        totals[student_id][0] += int(obtained)
+        totals[student_id][1] += int(class_totals.get(class_id) or 0)
+
+    existing_q = select(Result.student_id, Result.id, Result.created_at).where(Result.exam_id == exam_id)
+    if student_ids is not None:
+        existing_q = existing_q.where(Result.student_id.in_(student_ids))
+    existing = {row.student_id: (row.id, row.created_at) for row in db.execute(existing_q)}
+
+    bands = load_grade_bands(db, school_id)
+    now = datetime.now(timezone.utc)
+    rows: list[dict[str, Any]] = []
+    updates: list[dict[str, Any]] = []
+    inserts: list[dict[str, Any]] = []
+    for student_id, (obtained, total_marks) in totals.items():
+        percentage = (float(obtained) / float(total_marks) * 100.0) if total_marks else 0.0
+        row = {
+            "exam_id": exam_id,
+            "student_id": student_id,
+            "total_marks": total_marks,
+            "obtained_marks": obtained,
+            "percentage": percentage,
+            "grade_id": pick_grade(bands, percentage),
+        }
+        current = existing.get(student_id)
+        if current:
+            row["id"], row["created_at"] = current
+            updates.append(row)
+        else:
+            row["id"], row["created_at"] = uuid.uuid4(), now
+            inserts.append(row)
+        rows.append(row)
+    if updates:
+        db.execute(update(Result), updates)
+    if inserts:
+        db.execute(insert(Result), inserts)
+    return rows
+
+
+def refresh_exam_results(db: Session, *, school_id: uuid.UUID, exam_ids: Collection[uuid.UUID]) -> None:
+    """Recompute every result of the given exams after a change to their schedules."""
+    db.flush()
+    for exam_id in set(exam_ids):
+        compute_results(db, school_id=school_id, exam_id=exam_id)
+
+
+def refresh_school_results(db: Session, *, school_id: uuid.UUID) -> None:
+    """Recompute results of every exam that has any, after the school's grade bands change."""
+    db.flush()
+    exam_ids = db.execute(
+        select(Result.exam_id)
+        .join(Exam, Exam.id == Result.exam_id)
+        .join(AcademicYear, AcademicYear.id == Exam.academic_year_id)
+        .where(AcademicYear.school_id == school_id)
+        .distinct()
+    ).scalars().all()
+    for exam_id in exam_ids:
+        compute_results(db, school_id=school_id, exam_id=exam_id)
+
+
+def refresh_student_results(db: Session, *, school_id: uuid.UUID, exam_id: uuid.UUID, student_ids: Collection[uuid.UUID]) -> None:
+    db.flush()
+    compute_results(db, school_id=school_id, exam_id=exam_id, student_ids=list(set(student_ids)))
@@ -0,0 +1,83 @@
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.fee_due import FeeDue
+from app.models.school_rollup import SchoolRollup
+from app.models.staff import Staff
+from app.models.student import Student
+
+
+def _compute(db: Session, school_id: uuid.UUID) -> dict[str, int]:
+    students = db.scalar(select(func.count()).select_from(Student).where(Student.school_id == school_id)) or 0
+    staff = db.scalar(select(func.count()).select_from(Staff).where(Staff.school_id == school_id)) or 0
+    due, paid = db.execute(
+        select(func.coalesce(func.sum(FeeDue.due_amount), 0), func.coalesce(func.sum(FeeDue.paid_amount), 0))
+        .join(Student, Student.id == FeeDue.student_id)
+        .where(Student.school_id == school_id)
+    ).one()
+    return {
+        "student_count": int(students),
+        "staff_count": int(staff),
+        "total_due_amount": int(due or 0),
+        "total_paid_amount": int(paid or 0),
+    }
+
+
+def refresh_school_rollup(db: Session, school_id: uuid.UUID) -> SchoolRollup:
+    """Recompute the rollup from source tables inside the caller's transaction."""
+    db.flush()
+    values = _compute(db, school_id)
+    now = datetime.now(timezone.utc)
+    rollup = db.get(SchoolRollup, school_id)
+    if rollup is None:
+        try:
+            with db.begin_nested():
+                rollup = SchoolRollup(school_id=school_id, refreshed_at=now, updated_at=now, **values)
+                db.add(rollup)
+            return rollup
+        except IntegrityError:
+            rollup = db.get(SchoolRollup, school_id, populate_existing=True)
+    for key, value in values.items():
+        setattr(rollup, key, value)
+    rollup.refreshed_at = now
+    rollup.updated_at = now
+    return rollup
+
+
+def adjust_school_rollup(
+    db: Session,
+    school_id: uuid.UUID,
+    *,
+    students: int = 0,
+    staff: int = 0,
+    due_amount: int = 0,
+    paid_amount: int = 0,
+) -> None:
+    """Apply deltas atomically; a school without a rollup row gets one built from source tables."""
+    res = db.execute(
+        update(SchoolRollup)
+        .where(SchoolRollup.school_id == school_id)
+        .values(
+            student_count=SchoolRollup.student_count + students,
+            staff_count=SchoolRollup.staff_count + staff,
+            total_due_amount=SchoolRollup.total_due_amount + due_amount,
+            total_paid_amount=SchoolRollup.total_paid_amount + paid_amount,
+            updated_at=datetime.now(timezone.utc),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if res.rowcount == 0:
+        refresh_school_rollup(db, school_id)
+
+
+def get_school_rollup(db: Session, school_id: uuid.UUID) -> SchoolRollup:
+    """Read-only: serve the stored row as is, or compute a transient one for a school that has none yet."""
+    rollup = db.get(SchoolRollup, school_id)
+    if rollup is not None:
+        return rollup
+    now = datetime.now(timezone.utc)
+    return SchoolRollup(school_id=school_id, refreshed_at=now, updated_at=now, **_compute(db, school_id))
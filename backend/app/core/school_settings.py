@@ -0,0 +1,102 @@
+import json
+import uuid
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.cache import MISSING, TTLCache
+from app.core.cache_versions import version_store
+from app.core.config import settings
+from app.models.setting import Setting
+
+STUDENT_SETTINGS_KEY = "students.settings"
+
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+
+@dataclass(frozen=True)
+class SchoolProfile:
+    address: str = ""
+    phone: str = ""
+    website: str = ""
+    logo_url: str = ""
+
+
+@dataclass(frozen=True)
+class SchoolSettings:
+    """Every settings row of one school, with the structured ones parsed once."""
+
+    values: Mapping[str, str]
+    students: Mapping[str, Any]
+    profile: SchoolProfile
+
+    def get(self, key: str, default: str = "") -> str:
+        return self.values.get(key) or default
+
+    def json(self, key: str) -> Mapping[str, Any]:
+        """The setting parsed as a JSON object; empty when unset or malformed."""
+        if key == STUDENT_SETTINGS_KEY:
+            return self.students
+        return _parse_json(self.values.get(key))
+
+
+def _parse_json(raw: Optional[str]) -> Mapping[str, Any]:
+    if not raw or not raw.strip():
+        return _EMPTY
+    try:
+        parsed = json.loads(raw)
+    except (json.JSONDecodeError, ValueError):
+        return _EMPTY
+    return MappingProxyType(parsed) if isinstance(parsed, dict) else _EMPTY
+
+
+def _build(values: dict[str, str]) -> SchoolSettings:
+    profile = SchoolProfile(
+        address=(values.get("school.profile.address") or "").strip(),
+        phone=(values.get("school.profile.phone") or "").strip(),
+        website=(values.get("school.profile.website") or "").strip(),
+        logo_url=(values.get("school.profile.logo_url") or "").strip(),
+    )
+    return SchoolSettings(
+        values=MappingProxyType(values),
+        students=_parse_json(values.get(STUDENT_SETTINGS_KEY)),
+        profile=profile,
+    )
+
+
+_cache = TTLCache(
+    ttl_seconds=settings.school_settings_cache_ttl_seconds, max_entries=settings.school_settings_cache_max_entries
+)
+
+
+def _version_key(school_id: uuid.UUID) -> str:
+    return f"settings:{school_id}"
+
+
+def get_school_settings(db: Session, school_id: uuid.UUID) -> SchoolSettings:
+    version = version_store.get(_version_key(school_id))
+    cached = _cache.get(school_id)
+    if cached is not MISSING and cached[0] == version:
+        return cached[1]
+    rows = db.execute(select(Setting.key, Setting.value).where(Setting.school_id == school_id)).all()
+    value = _build({key: raw or "" for key, raw in rows})
+    _cache.set(school_id, (version, value))
+    return value
+
+
+def get_student_settings(db: Session, school_id: uuid.UUID) -> Mapping[str, Any]:
+    return get_school_settings(db, school_id).students
+
+
+def get_school_profile(db: Session, school_id: uuid.UUID) -> SchoolProfile:
+    return get_school_settings(db, school_id).profile
+
+
+def invalidate_school_settings(school_id: uuid.UUID) -> None:
+    """Call after committing a settings change; other workers see it once the version store syncs."""
+    _cache.delete(school_id)
+    version_store.bump(_version_key(school_id))
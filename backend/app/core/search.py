@@ -0,0 +1,186 @@
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import DDL, ColumnElement, Select, column, event, func, literal_column, or_, select, table, text
+from sqlalchemy.orm import Session
+
+from app.db.session import Base
+
+
+@dataclass(frozen=True)
+class SearchIndex:
+    table: str
+    columns: tuple[str, ...]
+
+    @property
+    def fts_table(self) -> str:
+        return f"{self.table}_fts"
+
+    @property
+    def trigram_table(self) -> str:
+        return f"{self.table}_trgm"
+
+    def document(self, qualified: bool = True) -> str:
+        """The normalized text Postgres indexes; queries must use the identical expression."""
+        prefix = f"{self.table}." if qualified else ""
+        return "lower(" + " || ' ' || ".join(f"coalesce({prefix}{c}, '')" for c in self.columns) + ")"
+
+
+SEARCH_INDEXES = {
+    "students": SearchIndex("students", ("first_name", "last_name", "admission_no")),
+    "staff": SearchIndex("staff", ("full_name", "email", "phone")),
+    "guardians": SearchIndex("guardians", ("full_name", "phone", "email")),
+    "library_books": SearchIndex("library_books", ("title", "author", "isbn")),
+}
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def _sqlite_fts_tables(index: SearchIndex) -> dict[str, str]:
+    """Word-prefix table for ranked matches, trigram table for substrings such as '1001' in 'STU1001'."""
+    return {
+        index.fts_table: "tokenize='unicode61 remove_diacritics 2', prefix='2 3'",
+        index.trigram_table: "tokenize='trigram'",
+    }
+
+
+def _sqlite_ddl(index: SearchIndex) -> list[str]:
+    statements = []
+    for fts, tokenizer in _sqlite_fts_tables(index).items():
+        statements += _sqlite_fts_ddl(index, fts, tokenizer)
+    return statements
+
+
+def _sqlite_fts_ddl(index: SearchIndex, fts: str, tokenizer: str) -> list[str]:
+    cols = ", ".join(index.columns)
+    new = ", ".join(f"new.{c}" for c in index.columns)
+    old = ", ".join(f"old.{c}" for c in index.columns)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({cols}, content='{index.table}', {tokenizer})",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {index.table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {index.table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {index.table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new}); END",
+    ]
+
+
+def _postgresql_ddl(index: SearchIndex) -> list[str]:
+    doc = index.document(qualified=False)
+    return [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        f"CREATE INDEX IF NOT EXISTS ix_{index.table}_search_trgm ON {index.table} USING gin (({doc}) gin_trgm_ops)",
+        f"CREATE INDEX IF NOT EXISTS ix_{index.table}_search_tsv ON {index.table} USING gin (to_tsvector('simple'::regconfig, {doc}))",
+    ]
+
+
+def search_ddl(dialect: str, index: SearchIndex) -> list[str]:
+    if dialect == "sqlite":
+        return _sqlite_ddl(index)
+    if dialect == "postgresql":
+        return _postgresql_ddl(index)
+    return []
+
+
+def drop_search_ddl(dialect: str, index: SearchIndex) -> list[str]:
+    if dialect == "sqlite":
+        statements = []
+        for fts in _sqlite_fts_tables(index):
+            statements += [f"DROP TRIGGER IF EXISTS {fts}_{suffix}" for suffix in ("ai", "ad", "au")]
+            statements.append(f"DROP TABLE IF EXISTS {fts}")
+        return statements
+    if dialect == "postgresql":
+        return [f"DROP INDEX IF EXISTS ix_{index.table}_search_trgm", f"DROP INDEX IF EXISTS ix_{index.table}_search_tsv"]
+    return []
+
+
+def _rebuild(db: Session, fts: str) -> None:
+    db.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+
+
+def rebuild_search_index(db: Session) -> None:
+    """Repopulate the SQLite FTS tables from their content tables.
+
+    They are keyed by rowid, which VACUUM may renumber, so run this after one.
+    Postgres indexes are maintained by the database and need nothing.
+    """
+    if db.get_bind().dialect.name != "sqlite":
+        return
+    for index in SEARCH_INDEXES.values():
+        for fts in _sqlite_fts_tables(index):
+            _rebuild(db, fts)
+    db.commit()
+
+
+def ensure_search_indexes(db: Session) -> None:
+    """Add the SQLite FTS tables to databases whose tables predate them, backfilling new ones."""
+    if db.get_bind().dialect.name != "sqlite":
+        return
+    existing = set(db.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'")).scalars())
+    for index in SEARCH_INDEXES.values():
+        if index.table not in existing:
+            continue
+        for statement in _sqlite_ddl(index):
+            db.execute(text(statement))
+        for fts in _sqlite_fts_tables(index):
+            if fts not in existing:
+                _rebuild(db, fts)
+    db.commit()
+
+
+def register_search_ddl() -> None:
+    """Emit the search DDL whenever metadata.create_all builds the indexed tables."""
+    for index in SEARCH_INDEXES.values():
+        target = Base.metadata.tables[index.table]
+        for dialect in ("sqlite", "postgresql"):
+            for statement in search_ddl(dialect, index):
+                event.listen(target, "after_create", DDL(statement).execute_if(dialect=dialect))
+            for statement in drop_search_ddl(dialect, index):
+                event.listen(target, "before_drop", DDL(statement).execute_if(dialect=dialect))
+
+
+def search_tokens(term: str) -> list[str]:
+    return [t.lower() for t in _TOKEN.findall(term or "")][:8]
+
+
+def apply_search(db: Session, stmt: Select, name: str, term: str) -> tuple[Select, Optional[ColumnElement]]:
+    """Restrict stmt to rows of SEARCH_INDEXES[name] matching term.
+
+    A row matches when every word of term is a word prefix in it, or when term
+    occurs anywhere in one of its columns (so "1001" finds "STU1001" and partial
+    emails match), as the plain ilike search did. Returns the filtered statement
+    and a relevance expression to order by first (ascending), or None when the
+    backend has no index to rank with.
+    """
+    index = SEARCH_INDEXES[name]
+    tokens = search_tokens(term)
+    needle = (term or "").strip().lower()
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite" and tokens:
+        fts = table(index.fts_table, column("rowid"), column("rank"))
+        found = select(fts.c.rowid, fts.c.rank).where(
+            literal_column(index.fts_table).op("MATCH")(" ".join(f'"{t}"*' for t in tokens))
+        )
+        if len(needle) >= 3:  # trigram queries need at least one full trigram; substring-only hits rank last
+            trgm = table(index.trigram_table, column("rowid"))
+            phrase = '"' + needle.replace('"', '""') + '"'
+            found = found.union_all(
+                select(trgm.c.rowid, literal_column("0")).where(literal_column(index.trigram_table).op("MATCH")(phrase))
+            ).subquery()
+            found = select(found.c.rowid, func.min(found.c.rank).label("rank")).group_by(found.c.rowid)
+        matches = found.subquery()
+        stmt = stmt.join(matches, matches.c.rowid == literal_column(f"{index.table}.rowid"))
+        return stmt, matches.c.rank
+    if dialect == "postgresql" and tokens:
+        doc = literal_column(index.document())
+        vector = func.to_tsvector(literal_column("'simple'::regconfig"), doc)
+        query = func.to_tsquery(literal_column("'simple'::regconfig"), " & ".join(f"{t}:*" for t in tokens))
+        pattern = "%" + needle.replace("/", "//").replace("%", "/%").replace("_", "/_") + "%"
+        stmt = stmt.where(or_(vector.op("@@")(query), doc.like(pattern, escape="/")))
+        return stmt, -(func.ts_rank(vector, query) + func.similarity(doc, needle))
+    pattern = f"%{term}%"
+    columns = Base.metadata.tables[index.table].c
+    return stmt.where(or_(*(columns[c].ilike(pattern) for c in index.columns))), None
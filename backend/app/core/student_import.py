@@ -0,0 +1,178 @@
+import csv
+import io
+import uuid
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from typing import Any, BinaryIO, Optional
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.core.admission_numbers import admission_number_config, allocate_admission_numbers, reserve_admission_numbers
+from app.core.jobs import report_progress
+from app.core.rollups import adjust_school_rollup
+from app.models.school import School
+from app.models.student import Student
+
+_ALIASES = {
+    "first_name": ("first_name", "firstName"),
+    "last_name": ("last_name", "lastName"),
+    "admission_no": ("admission_no", "admissionNo"),
+    "gender": ("gender",),
+    "date_of_birth": ("date_of_birth", "dateOfBirth"),
+    "status": ("status",),
+    "photo_url": ("photo_url", "photoUrl"),
+}
+_MAX_LENGTHS = {"first_name": 100, "last_name": 100, "admission_no": 64, "gender": 16, "status": 32, "photo_url": 500}
+
+
+@dataclass
+class ImportRowError:
+    row: int
+    field: Optional[str]
+    message: str
+
+
+@dataclass
+class ImportReport:
+    created: int = 0
+    skipped: int = 0
+    error_count: int = 0
+    errors: list[ImportRowError] = field(default_factory=list)
+    max_errors: int = 1000
+
+    def add_error(self, row: int, field: Optional[str], message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append(ImportRowError(row=row, field=field, message=message))
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "created": self.created,
+            "skipped": self.skipped,
+            "error_count": self.error_count,
+            "errors": [{"row": e.row, "field": e.field, "message": e.message} for e in sorted(self.errors, key=lambda e: e.row)],
+        }
+
+
+def iter_csv_records(file: BinaryIO) -> Iterator[tuple[int, dict[str, str]]]:
+    """Yield (line number, row) pairs without reading the whole upload into memory."""
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, {(k or "").strip(): (v or "").strip() for k, v in row.items() if isinstance(v, str)}
+    finally:
+        text.detach()
+
+
+def _pick(record: dict[str, str], name: str) -> str:
+    for key in _ALIASES[name]:
+        value = record.get(key)
+        if value:
+            return value
+    return ""
+
+
+def import_students(
+    db: Session,
+    *,
+    school_id: uuid.UUID,
+    records: Iterable[tuple[int, dict[str, str]]],
+    student_settings: Optional[Mapping[str, Any]] = None,
+    chunk_size: int = 1000,
+) -> ImportReport:
+    """Validate and insert students in chunks, committing after each chunk.
+
+    Bad rows are reported and skipped instead of aborting the import. Rows without
+    an admission_no get one generated when the school's settings allow it, and
+    admission numbers already used in the school or earlier in the file are
+    rejected as duplicates.
+    """
+    student_settings = student_settings or {}
+    report = ImportReport()
+    tenant_id = db.scalar(select(School.tenant_id).where(School.id == school_id))
+    numbers = admission_number_config(student_settings)
+    seen: set[str] = set()
+    pending: list[tuple[int, dict[str, Any]]] = []
+    now = datetime.now(timezone.utc)
+
+    def flush() -> None:
+        given = [row["admission_no"] for _, row in pending if row["admission_no"]]
+        clashes = set()
+        if given:
+            clashes = set(
+                db.execute(
+                    select(Student.admission_no).where(Student.school_id == school_id, Student.admission_no.in_(given))
+                ).scalars()
+            )
+        rows = []
+        for line, row in pending:
+            if row["admission_no"] in clashes:
+                report.add_error(line, "admission_no", "admission_no already exists")
+                continue
+            rows.append(row)
+        pending.clear()
+        if numbers is not None and rows:
+            prefix, start_from = numbers
+            reserve_admission_numbers(
+                db, school_id, prefix=prefix, start_from=start_from, admission_nos=(row["admission_no"] for row in rows)
+            )
+            missing = [row for row in rows if not row["admission_no"]]
+            for row, admission_no in zip(
+                missing, allocate_admission_numbers(db, school_id, prefix=prefix, start_from=start_from, count=len(missing))
+            ):
+                row["admission_no"] = admission_no
+        if rows:
+            db.execute(insert(Student.__table__), rows)
+            adjust_school_rollup(db, school_id, students=len(rows))
+            db.commit()
+            report.created += len(rows)
+
+    for line, record in records:
+        first_name = _pick(record, "first_name")
+        if not first_name:
+            report.skipped += 1
+            continue
+        values = {name: _pick(record, name) for name in _ALIASES}
+        too_long = next((name for name, limit in _MAX_LENGTHS.items() if len(values[name]) > limit), None)
+        if too_long:
+            report.add_error(line, too_long, f"{too_long} exceeds {_MAX_LENGTHS[too_long]} characters")
+            continue
+        date_of_birth = None
+        if values["date_of_birth"]:
+            try:
+                date_of_birth = date.fromisoformat(values["date_of_birth"])
+            except ValueError:
+                report.add_error(line, "date_of_birth", "date_of_birth must be YYYY-MM-DD")
+                continue
+        admission_no = values["admission_no"] or None
+        if admission_no:
+            if admission_no in seen:
+                report.add_error(line, "admission_no", "Duplicate admission_no in file")
+                continue
+            seen.add(admission_no)
+        pending.append(
+            (
+                line,
+                {
+                    "id": uuid.uuid4(),
+                    "tenant_id": tenant_id,
+                    "school_id": school_id,
+                    "first_name": first_name,
+                    "last_name": values["last_name"] or None,
+                    "admission_no": admission_no,
+                    "gender": values["gender"] or None,
+                    "date_of_birth": date_of_birth,
+                    "status": values["status"] or "active",
+                    "photo_url": values["photo_url"] or None,
+                    "created_at": now,
+                },
+            )
+        )
+        if len(pending) >= chunk_size:
+            flush()
+            report_progress(line)
+    flush()
+    return report
@@ -0,0 +1,83 @@
+import uuid
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import select
+
+from app.core.cache import MISSING, TTLCache
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.tenant import Tenant
+
+
+@dataclass(frozen=True)
+class TenantSnapshot:
+    id: uuid.UUID
+    subdomain: str
+    status: str
+
+    @property
+    def is_active(self) -> bool:
+        return self.status == "active"
+
+
+_cache = TTLCache(ttl_seconds=settings.tenant_cache_ttl_seconds, max_entries=settings.tenant_cache_max_entries)
+
+
+def _snapshot(tenant: Optional[Tenant]) -> Optional[TenantSnapshot]:
+    if tenant is None:
+        return None
+    return TenantSnapshot(id=tenant.id, subdomain=tenant.subdomain, status=tenant.status)
+
+
+def _store(snapshot: TenantSnapshot) -> None:
+    _cache.set(("subdomain", snapshot.subdomain), snapshot)
+    _cache.set(("id", snapshot.id), snapshot)
+
+
+def get_tenant_by_subdomain(subdomain: str) -> Optional[TenantSnapshot]:
+    key = ("subdomain", subdomain)
+    cached = _cache.get(key)
+    if cached is not MISSING:
+        return cached
+    db = SessionLocal()
+    try:
+        snapshot = _snapshot(db.scalar(select(Tenant).where(Tenant.subdomain == subdomain)))
+    finally:
+        db.close()
+    if snapshot is None:
+        _cache.set(key, None)
+    else:
+        _store(snapshot)
+    return snapshot
+
+
+def get_tenant_by_id(tenant_id: uuid.UUID) -> Optional[TenantSnapshot]:
+    key = ("id", tenant_id)
+    cached = _cache.get(key)
+    if cached is not MISSING:
+        return cached
+    db = SessionLocal()
+    try:
+        snapshot = _snapshot(db.get(Tenant, tenant_id))
+    finally:
+        db.close()
+    if snapshot is None:
+        _cache.set(key, None)
+    else:
+        _store(snapshot)
+    return snapshot
+
+
+def invalidate_tenant(*, tenant_id: Optional[uuid.UUID] = None, subdomain: Optional[str] = None) -> None:
+    if tenant_id is not None:
+        cached = _cache.get(("id", tenant_id))
+        if cached is not MISSING and cached is not None:
+            _cache.delete(("subdomain", cached.subdomain))
+        _cache.delete(("id", tenant_id))
+    if subdomain is not None:
+        _cache.delete(("subdomain", subdomain))
+
+
+def clear_tenant_cache() -> None:
+    _cache.clear()
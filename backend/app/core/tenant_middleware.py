@@ -1,22 +1,40 @@
 from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import JSONResponse
-from app.db.session import SessionLocal
-from app.models.tenant import Tenant
+from starlette.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Receive, Scope, Send
 import uuid
+from typing import Optional
+from app.core.tenant_cache import get_tenant_by_id, get_tenant_by_subdomain
 from app.core.tenant_context import reset_tenant_id, set_tenant_id
 from app.core.config import settings
 
-class TenantMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        if request.url.path.startswith(("/docs", "/redoc", "/openapi.json", "/static", "/health")):
-            return await call_next(request)
+class TenantMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(("/docs", "/redoc", "/openapi.json", "/static", "/health")):
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        response = self._resolve(request)
+        if response is not None:
+            await response(scope, receive, send)
+            return
+
+        token = set_tenant_id(request.state.tenant_id)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            reset_tenant_id(token)
+
+    @staticmethod
+    def _resolve(request: Request) -> Optional[Response]:
         forwarded_host = request.headers.get("x-forwarded-host")
         raw_host = forwarded_host.split(",", 1)[0].strip() if forwarded_host else request.headers.get("host", "")
         host = raw_host.split(":")[0]
         parts = host.split(".")
-        
+
         request.state.tenant = None
         request.state.tenant_id = None
         request.state.is_saas_admin = False
@@ -28,24 +46,20 @@ class TenantMiddleware(BaseHTTPMiddleware):
         else:
             if len(parts) > 2:
                 subdomain = parts[0]
-            
+
         if subdomain:
             if subdomain == "admin":
                 request.state.is_saas_admin = True
             else:
-                db = SessionLocal()
-                try:
-                    tenant = db.query(Tenant).filter(Tenant.subdomain == subdomain).first()
-                    if tenant:
-                        if tenant.status != "active":
-                            return JSONResponse(
-                                status_code=403, 
-                                content={"detail": "Your school account is temporarily suspended. Contact support."}
-                            )
-                        request.state.tenant = tenant
-                        request.state.tenant_id = tenant.id
-                finally:
-                    db.close()
+                tenant = get_tenant_by_subdomain(subdomain)
+                if tenant:
+                    if not tenant.is_active:
+                        return JSONResponse(
+                            status_code=403,
+                            content={"detail": "Your school account is temporarily suspended. Contact support."}
+                        )
+                    request.state.tenant = tenant
+                    request.state.tenant_id = tenant.id
 
         if not request.state.tenant_id:
             tenant_subdomain = request.headers.get("X-Tenant-Subdomain")
@@ -54,41 +68,34 @@ class TenantMiddleware(BaseHTTPMiddleware):
                 if tenant_subdomain == "admin":
                     request.state.is_saas_admin = True
                 else:
-                    db = SessionLocal()
-                    try:
-                        tenant = db.query(Tenant).filter(Tenant.subdomain == tenant_subdomain).first()
-                        if tenant:
-                            if tenant.status != "active":
-                                return JSONResponse(status_code=403, content={"detail": "Tenant inactive"})
-                            request.state.tenant = tenant
-                            request.state.tenant_id = tenant.id
-                    finally:
-                        db.close()
-        
+                    tenant = get_tenant_by_subdomain(tenant_subdomain)
+                    if tenant:
+                        if not tenant.is_active:
+                            return JSONResponse(status_code=403, content={"detail": "Tenant inactive"})
+                        request.state.tenant = tenant
+                        request.state.tenant_id = tenant.id
+
         if not request.state.tenant_id:
              tenant_header = request.headers.get("X-Tenant-ID")
              if tenant_header:
                  try:
                      t_id = uuid.UUID(tenant_header)
-                     db = SessionLocal()
-                     try:
-                         tenant = db.query(Tenant).filter(Tenant.id == t_id).first()
-                         if tenant:
-                             if tenant.status != "active":
-                                 return JSONResponse(status_code=403, content={"detail": "Tenant inactive"})
-                             request.state.tenant = tenant
-                             request.state.tenant_id = tenant.id
-                     finally:
-                         db.close()
                  except ValueError:
-                     pass
+                     t_id = None
+                 if t_id:
+                     tenant = get_tenant_by_id(t_id)
+                     if tenant:
+                         if not tenant.is_active:
+                             return JSONResponse(status_code=403, content={"detail": "Tenant inactive"})
+                         request.state.tenant = tenant
+                         request.state.tenant_id = tenant.id
         if not request.state.tenant_id:
              origin = request.headers.get("origin")
              if origin:
                  origin_host = origin.split("://")[-1].split(":")[0]
                  origin_parts = origin_host.split(".")
                  origin_subdomain = None
-                 
+
                  if "localhost" in origin_host:
                     if origin_parts[0] != "localhost":
                         origin_subdomain = origin_parts[0]
@@ -96,16 +103,12 @@ class TenantMiddleware(BaseHTTPMiddleware):
                     origin_subdomain = origin_parts[0]
 
                  if origin_subdomain and origin_subdomain != "admin":
-                     db = SessionLocal()
-                     try:
-                         tenant = db.query(Tenant).filter(Tenant.subdomain == origin_subdomain).first()
-                         if tenant:
-                             if tenant.status != "active":
-                                 return JSONResponse(status_code=403, content={"detail": "Tenant inactive"})
-                             request.state.tenant = tenant
-                             request.state.tenant_id = tenant.id
-                     finally:
-                         db.close()
+                     tenant = get_tenant_by_subdomain(origin_subdomain)
+                     if tenant:
+                         if not tenant.is_active:
+                             return JSONResponse(status_code=403, content={"detail": "Tenant inactive"})
+                         request.state.tenant = tenant
+                         request.state.tenant_id = tenant.id
 
         if not request.state.tenant_id and settings.environment == "development":
             qp = request.query_params.get("tenant")
@@ -114,21 +117,11 @@ class TenantMiddleware(BaseHTTPMiddleware):
                 if qp == "admin":
                     request.state.is_saas_admin = True
                 else:
-                    db = SessionLocal()
-                    try:
-                        tenant = db.query(Tenant).filter(Tenant.subdomain == qp).first()
-                        if tenant:
-                            if tenant.status != "active":
-                                return JSONResponse(status_code=403, content={"detail": "Tenant inactive"})
-                            request.state.tenant = tenant
-                            request.state.tenant_id = tenant.id
-                    finally:
-                        db.close()
-
+                    tenant = get_tenant_by_subdomain(qp)
+                    if tenant:
+                        if not tenant.is_active:
+                            return JSONResponse(status_code=403, content={"detail": "Tenant inactive"})
+                        request.state.tenant = tenant
+                        request.state.tenant_id = tenant.id
 
-        token = set_tenant_id(request.state.tenant_id)
-        try:
-            response = await call_next(request)
-            return response
-        finally:
-            reset_tenant_id(token)
+        return None
@@ -21,6 +21,7 @@ from app.models.term import Term
 from app.models.curriculum_unit import CurriculumUnit
 from app.models.academic_calendar_settings import AcademicCalendarSettings
 from app.models.teacher_assignment import StaffAttendance, StudentAttendance, TeacherAssignment
+from app.models.attendance_summary import StudentAttendanceMonthly
 from app.models.leave import Leave
 from app.models.time_slot import TimeSlot
 from app.models.timetable_entry import TimetableEntry
@@ -48,6 +49,10 @@ from app.models.transport_route_stop import TransportRouteStop
 from app.models.transport_vehicle import TransportVehicle
 from app.models.document import Document
 from app.models.audit_log import AuditLog
+from app.models.cache_version import CacheVersion
+from app.models.school_rollup import SchoolRollup
+from app.models.job import Job
+from app.models.admission_sequence import AdmissionSequence
 from app.models.user_preference import UserPreference
 from app.models.certificate import Certificate, CertificateTemplate
 from app.models.event import Event
@@ -74,3 +79,7 @@ from app.models.inventory import InventoryItem, InventoryLocation, StockMovement
 from app.models.procurement import PurchaseRequest, PurchaseRequestLine, PurchaseOrder
 from app.models.vendor import Vendor
 from app.models.staff_leave import LeaveType, LeaveBalance, StaffLeaveRequest
+
+from app.core.search import register_search_ddl
+
+register_search_ddl()
@@ -1,24 +1,45 @@
-import uuid
 import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, RedirectResponse
 
 import app.db.base
 from app.api.v1.api import api_router
+from app.core.audit import audit_sink
 from app.core.config import settings
-from app.core.rate_limit import InMemoryRateLimiter, RateLimitRule
-from app.core.security import decode_access_token
-from app.core.audit import write_audit_log
+from app.core.jobs import job_runner
+from app.core.rate_limit import RateLimiter, RateLimitRule
+from app.core.attendance import ensure_attendance_keys, ensure_attendance_summary
+from app.core.search import ensure_search_indexes
+from app.core.middleware import AuditLogMiddleware, SecurityHeadersMiddleware
 from app.core.seed import ensure_default_admin, ensure_platform_admin
 from fastapi.staticfiles import StaticFiles
-from app.db.session import SessionLocal
+from sqlalchemy.pool import StaticPool
+from app.db.session import SessionLocal, engine
 from app.core.tenant_middleware import TenantMiddleware
 
 
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    # A StaticPool shares one connection, so background writes would interleave with request transactions.
+    background = not isinstance(engine.pool, StaticPool)
+    if settings.audit_async_enabled and background:
+        audit_sink.start()
+    if settings.jobs_mode == "thread" and background:
+        job_runner.start()
+    try:
+        yield
+    finally:
+        job_runner.stop()
+        audit_sink.stop()
+
+
 def create_app() -> FastAPI:
     app = FastAPI(
         title=settings.app_name,
+        lifespan=_lifespan,
         openapi_url="/openapi.json",
         docs_url="/docs",
         redoc_url="/redoc",
@@ -29,66 +50,10 @@ def create_app() -> FastAPI:
         
     app.mount("/static", StaticFiles(directory="static"), name="static")
 
-    limiter = InMemoryRateLimiter()
+    limiter = RateLimiter()
     auth_rule = RateLimitRule(window_seconds=15 * 60, max_requests=settings.rate_limit_auth_per_15_minutes)
     api_rule = RateLimitRule(window_seconds=60, max_requests=settings.rate_limit_api_per_minute)
 
-    @app.middleware("http")
-    async def _security_headers(request: Request, call_next):
-        if settings.rate_limit_enabled and request.method != "OPTIONS":
-            client_host = request.client.host if request.client else "unknown"
-            path = request.url.path
-            is_auth = path.startswith(f"{settings.api_v1_prefix}/auth/") and path.endswith(("/login", "/register"))
-            rule = auth_rule if is_auth else api_rule
-            key = f"{client_host}:{'auth' if is_auth else 'api'}"
-            if not limiter.allow(key=key, rule=rule):
-                return JSONResponse(
-                    status_code=429,
-                    media_type="application/problem+json",
-                    content={"type": "about:blank", "title": "Too Many Requests", "status": 429, "detail": "Rate limit exceeded"},
-                )
-
-        resp = await call_next(request)
-        resp.headers.setdefault("X-Content-Type-Options", "nosniff")
-        resp.headers.setdefault("X-Frame-Options", "DENY")
-        resp.headers.setdefault("Referrer-Policy", "no-referrer")
-        if request.url.path not in {"/docs", "/redoc"}:
-            resp.headers.setdefault("Content-Security-Policy", "default-src 'self'")
-        if settings.environment == "production":
-            resp.headers.setdefault("Strict-Transport-Security", "max-age=31536000; includeSubDomains")
-        return resp
-
-    @app.middleware("http")
-    async def _audit_log(request: Request, call_next):
-        resp = await call_next(request)
-        if request.method in {"POST", "PUT", "PATCH", "DELETE"} and resp.status_code < 500:
-            school_raw = request.headers.get("X-School-Id")
-            if school_raw:
-                try:
-                    school_id = uuid.UUID(school_raw)
-                except Exception:
-                    return resp
-                user_id = None
-                auth = request.headers.get("Authorization", "")
-                if auth.lower().startswith("bearer "):
-                    token = auth.split(" ", 1)[1].strip()
-                    try:
-                        payload = decode_access_token(token)
-                        user_id = uuid.UUID(payload["sub"])
-                    except Exception:
-                        user_id = None
-                action = f"{request.method} {request.url.path}"
-                db = SessionLocal()
-                try:
-                    write_audit_log(db, school_id=school_id, action=action, user_id=user_id)
-                    try:
-                        db.commit()
-                    except Exception:
-                        db.rollback()
-                finally:
-                    db.close()
-        return resp
-
     @app.exception_handler(Exception)
     async def _unhandled_exception_handler(request: Request, exc: Exception):
         return JSONResponse(
@@ -146,6 +111,19 @@ def create_app() -> FastAPI:
     finally:
         db.close()
 
+    db = SessionLocal()
+    try:
+        ensure_search_indexes(db)
+        ensure_attendance_keys(db)
+        ensure_attendance_summary(db)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    app.add_middleware(SecurityHeadersMiddleware, limiter=limiter, auth_rule=auth_rule, api_rule=api_rule)
+    app.add_middleware(AuditLogMiddleware)
     app.add_middleware(TenantMiddleware)
 
     app.add_middleware(
@@ -0,0 +1,20 @@
+import uuid
+from datetime import date
+
+from sqlalchemy import Date, ForeignKey, Index, Integer, String, Uuid
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.session import Base
+
+
+class StudentAttendanceMonthly(Base):
+    """Days per status for one student and calendar month, kept in step with student_attendance."""
+
+    __tablename__ = "student_attendance_monthly"
+    __table_args__ = (Index("ix_student_attendance_monthly_school_month", "school_id", "month"),)
+
+    student_id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), ForeignKey("students.id"), primary_key=True)
+    month: Mapped[date] = mapped_column(Date, primary_key=True)
+    status: Mapped[str] = mapped_column(String(32), primary_key=True)
+    school_id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), ForeignKey("schools.id"), nullable=False)
+    days: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import DateTime, ForeignKey, String, Uuid
+from sqlalchemy import DateTime, ForeignKey, Index, String, Uuid
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.session import Base
@@ -10,6 +10,7 @@ from app.db.session import Base
 
 class CommunicationLog(Base):
     __tablename__ = "communication_logs"
+    __table_args__ = (Index("uq_communication_logs_school_dedupe_key", "school_id", "dedupe_key", unique=True),)
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     school_id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), ForeignKey("schools.id"), index=True, nullable=False)
@@ -19,5 +20,6 @@ class CommunicationLog(Base):
     recipient: Mapped[str] = mapped_column(String(255), nullable=False)
     subject: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
     body: Mapped[Optional[str]] = mapped_column(String(2000), nullable=True)
+    dedupe_key: Mapped[Optional[str]] = mapped_column(String(320), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
 
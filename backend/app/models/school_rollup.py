@@ -0,0 +1,19 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Integer, Uuid
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.session import Base
+
+
+class SchoolRollup(Base):
+    __tablename__ = "school_rollups"
+
+    school_id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), ForeignKey("schools.id"), primary_key=True)
+    student_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    staff_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_due_amount: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    total_paid_amount: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    refreshed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
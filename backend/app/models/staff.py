@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime, date
 from typing import Optional
 
-from sqlalchemy import Date, DateTime, ForeignKey, Integer, String, Uuid, Text
+from sqlalchemy import Date, DateTime, ForeignKey, Index, Integer, String, Uuid, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.session import Base
@@ -10,6 +10,7 @@ from app.db.session import Base
 
 class Staff(Base):
     __tablename__ = "staff"
+    __table_args__ = (Index("ix_staff_school_full_name_id", "school_id", "full_name", "id"),)
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     tenant_id: Mapped[Optional[uuid.UUID]] = mapped_column(Uuid(as_uuid=True), ForeignKey("tenants.id"), index=True, nullable=True)
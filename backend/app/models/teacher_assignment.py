@@ -1,8 +1,8 @@
 import uuid
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, String, Uuid
+from sqlalchemy import Boolean, Date, DateTime, ForeignKey, Index, String, Uuid
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.session import Base
@@ -22,9 +22,15 @@ class TeacherAssignment(Base):
 
 class StudentAttendance(Base):
     __tablename__ = "student_attendance"
+    __table_args__ = (
+        Index("uq_student_attendance_student_date", "student_id", "attendance_date", unique=True),
+        Index("ix_student_attendance_school_day_status", "school_id", "attendance_day", "status"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     attendance_date: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True, nullable=False)
+    attendance_day: Mapped[date] = mapped_column(Date, nullable=False)
+    school_id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), ForeignKey("schools.id"), nullable=False)
     student_id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), ForeignKey("students.id"), index=True, nullable=False)
     section_id: Mapped[Optional[uuid.UUID]] = mapped_column(Uuid(as_uuid=True), ForeignKey("sections.id"), index=True, nullable=True)
     class_id: Mapped[Optional[uuid.UUID]] = mapped_column(Uuid(as_uuid=True), ForeignKey("classes.id"), index=True, nullable=True)
@@ -34,6 +40,7 @@ class StudentAttendance(Base):
 
 class StaffAttendance(Base):
     __tablename__ = "staff_attendance"
+    __table_args__ = (Index("uq_staff_attendance_staff_date", "staff_id", "attendance_date", unique=True),)
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     attendance_date: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True, nullable=False)
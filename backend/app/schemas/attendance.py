@@ -37,6 +37,11 @@ class MarkStudentAttendanceRequest(BaseModel):
     items: list[StudentAttendanceMarkItem] = Field(min_length=1)
 
 
+class SendAttendanceAlertsRequest(BaseModel):
+    attendance_date: date
+    statuses: list[str] = Field(default_factory=lambda: ["absent"], min_length=1)
+
+
 class StaffAttendanceMarkItem(BaseModel):
     staff_id: uuid.UUID
     status: str = Field(default="present", max_length=32)
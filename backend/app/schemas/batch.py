@@ -9,6 +9,7 @@ class BatchPromoteStudentsRequest(BaseModel):
     new_academic_year_id: uuid.UUID
     new_class_id: uuid.UUID
     new_section_id: Optional[uuid.UUID] = None
+    dry_run: bool = False
 
 
 class BatchTransferStudentsRequest(BaseModel):
@@ -0,0 +1,27 @@
+import uuid
+from datetime import datetime
+from typing import Any, Optional
+
+from pydantic import BaseModel, Field
+
+
+class JobCreate(BaseModel):
+    kind: str = Field(min_length=1, max_length=64)
+    params: dict[str, Any] = Field(default_factory=dict)
+
+
+class JobOut(BaseModel):
+    id: uuid.UUID
+    school_id: uuid.UUID
+    created_by_user_id: Optional[uuid.UUID]
+    kind: str
+    status: str
+    progress: int
+    result: Optional[Any]
+    error: Optional[str]
+    attempts: int
+    max_attempts: int
+    cancel_requested: bool
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
@@ -0,0 +1,27 @@
+"""
+Run queued background jobs in a separate process.
+Run: python -m app.scripts.job_worker  (set JOBS_MODE=external on the API so it only enqueues)
+"""
+import logging
+import signal
+import threading
+
+import app.db.base
+import app.api.v1.api  # registers the job handlers
+from app.core.jobs import job_runner
+
+
+def main() -> int:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    stop = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    job_runner.start()
+    logging.getLogger(__name__).info("Job worker %s started with %d threads", job_runner.worker_id, job_runner.concurrency)
+    stop.wait()
+    job_runner.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,136 @@
+import random
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.orm import Session, sessionmaker
+
+import app.db.base  # noqa: F401
+from app.api.v1.endpoints.analytics import _academic_statistics, _attendance_statistics, _enrollment_trends, _performance_trends
+from app.core.attendance import refresh_attendance_summary
+from app.db.session import Base
+from app.models.academic_year import AcademicYear
+from app.models.enrollment import Enrollment
+from app.models.exam import Exam
+from app.models.result import Result
+from app.models.school import School
+from app.models.school_class import SchoolClass
+from app.models.student import Student
+from app.models.teacher_assignment import StudentAttendance
+
+YEARS = 10
+CLASSES = 12
+STUDENTS_PER_CLASS = 40
+EXAMS_PER_YEAR = 4
+ATTENDANCE_DAYS = 30
+ROUNDS = 20
+
+
+def _seed(db: Session) -> uuid.UUID:
+    rng = random.Random(7)
+    now = datetime.now(timezone.utc)
+    school = School(name="Bench", code=f"A{uuid.uuid4().hex[:6]}", is_active=True, created_at=now)
+    db.add(school)
+    db.flush()
+    classes = [SchoolClass(school_id=school.id, name=f"Grade {i + 1}", is_active=True, created_at=now) for i in range(CLASSES)]
+    db.add_all(classes)
+    db.flush()
+    students = [
+        {"id": uuid.uuid4(), "school_id": school.id, "first_name": f"S{i}", "admission_status": "active", "status": "active", "created_at": now}
+        for i in range(CLASSES * STUDENTS_PER_CLASS * 2)
+    ]
+    db.execute(insert(Student), students)
+    enrollments, exams, results = [], [], []
+    for y in range(YEARS):
+        first = date(2015 + y, 1, 1)
+        year = AcademicYear(school_id=school.id, name=str(2015 + y), start_date=first, end_date=date(2015 + y, 12, 31), is_current=y == YEARS - 1, created_at=now)
+        db.add(year)
+        db.flush()
+        cohort = rng.sample(students, CLASSES * STUDENTS_PER_CLASS)
+        placed = [(s["id"], classes[i % CLASSES].id) for i, s in enumerate(cohort)]
+        enrollments += [
+            {"id": uuid.uuid4(), "student_id": sid, "academic_year_id": year.id, "class_id": cid, "status": "active", "created_at": now}
+            for sid, cid in placed
+        ]
+        for e in range(EXAMS_PER_YEAR):
+            exam_id = uuid.uuid4()
+            exams.append({"id": exam_id, "academic_year_id": year.id, "name": f"{2015 + y} exam {e}", "start_date": first + timedelta(days=90 * e), "status": "published", "included_in_final_result": True, "counts_for_gpa": True, "is_result_editable": False, "is_published": True, "created_at": now + timedelta(minutes=y * 10 + e)})
+            results += [
+                {"id": uuid.uuid4(), "exam_id": exam_id, "student_id": sid, "total_marks": 500, "obtained_marks": 0, "percentage": rng.uniform(20, 100), "created_at": now}
+                for sid, _ in placed
+            ]
+    db.execute(insert(Enrollment), enrollments)
+    db.execute(insert(Exam), exams)
+    db.execute(insert(Result), results)
+    today = date.today()
+    marked = [(s["id"], today - timedelta(days=d)) for d in range(ATTENDANCE_DAYS) for s in students[: CLASSES * STUDENTS_PER_CLASS]]
+    db.execute(
+        insert(StudentAttendance),
+        [
+            {"id": uuid.uuid4(), "attendance_date": datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc), "attendance_day": day, "school_id": school.id, "student_id": sid, "status": "present", "created_at": now}
+            for sid, day in marked
+        ],
+    )
+    refresh_attendance_summary(db, school.id, marked)
+    db.commit()
+    return school.id
+
+
+def _legacy_enrollment(db: Session, school_id: uuid.UUID, by_class: bool) -> list[dict]:
+    years = db.execute(select(AcademicYear).where(AcademicYear.school_id == school_id).order_by(AcademicYear.start_date.asc())).scalars().all()
+    class_ids = db.execute(select(SchoolClass.id).where(SchoolClass.school_id == school_id)).scalars().all() if by_class else []
+    out = []
+    for y in years:
+        count = db.scalar(select(func.count()).select_from(Enrollment).where(Enrollment.academic_year_id == y.id)) or 0
+        item = {"academic_year_id": str(y.id), "name": y.name, "enrollments": int(count)}
+        if by_class:
+            item["classes"] = [
+                {"class_id": str(cid), "enrollments": db.scalar(select(func.count()).select_from(Enrollment).where(Enrollment.academic_year_id == y.id, Enrollment.class_id == cid)) or 0}
+                for cid in class_ids
+            ]
+        out.append(item)
+    return out
+
+
+def _legacy_academic(db: Session, school_id: uuid.UUID) -> dict:
+    year = db.scalar(select(AcademicYear).where(AcademicYear.school_id == school_id, AcademicYear.is_current.is_(True)))
+    exams = db.scalar(select(func.count()).select_from(Exam).where(Exam.academic_year_id == year.id)) or 0
+    results_count = db.scalar(select(func.count()).select_from(Result).join(Exam, Exam.id == Result.exam_id).where(Exam.academic_year_id == year.id)) or 0
+    return {"current_year_exams": int(exams), "results_count": int(results_count)}
+
+
+def _ms(fn) -> float:
+    fn()
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        fn()
+    return (time.perf_counter() - started) / ROUNDS * 1000
+
+
+def test_analytics_latency_ten_years(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'analytics.db'}")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as db:
+        school_id = _seed(db)
+    today = date.today()
+    cases = [
+        ("enrollment trends (old loop)", lambda db: _legacy_enrollment(db, school_id, False)),
+        ("enrollment trends", lambda db: _enrollment_trends(db, school_id)),
+        ("enrollment by class (old loop)", lambda db: _legacy_enrollment(db, school_id, True)),
+        ("enrollment by class", lambda db: _enrollment_trends(db, school_id, by_class=True)),
+        ("enrollment 2019-2021", lambda db: _enrollment_trends(db, school_id, start_date=date(2019, 1, 1), end_date=date(2021, 12, 31))),
+        ("performance trends", lambda db: _performance_trends(db, school_id)),
+        ("performance by class", lambda db: _performance_trends(db, school_id, by_class=True)),
+        ("academic stats (old)", lambda db: _legacy_academic(db, school_id)),
+        ("academic stats", lambda db: _academic_statistics(db, school_id)),
+        ("attendance stats 7d", lambda db: _attendance_statistics(db, school_id, today - timedelta(days=7), today)),
+    ]
+    print()
+    with factory() as db:
+        for name, fn in cases:
+            print(f"{name:<32} {_ms(lambda: fn(db)):8.2f} ms")
+        assert [r["enrollments"] for r in _enrollment_trends(db, school_id)] == [r["enrollments"] for r in _legacy_enrollment(db, school_id, False)]
+        assert _academic_statistics(db, school_id) == _legacy_academic(db, school_id)
+    engine.dispose()
@@ -0,0 +1,70 @@
+import time
+import uuid
+from datetime import date, datetime, timezone
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+import app.db.base  # noqa: F401
+from app.core.attendance import upsert_student_attendance
+from app.core.attendance_alerts import dispatch_attendance_alerts
+from app.core.messaging import FakeTransport
+from app.db.session import Base
+from app.models.guardian import Guardian
+from app.models.school import School
+from app.models.student import Student
+from app.models.student_guardian import StudentGuardian
+from app.models.user import User
+
+DAY = date(2025, 5, 6)
+
+
+def _seed(factory, count: int):
+    now = datetime.now(timezone.utc)
+    with factory() as db:
+        school = School(name="Bench", code=f"C{uuid.uuid4().hex[:6]}", is_active=True, created_at=now)
+        user = User(email=f"{uuid.uuid4().hex}@example.com", password_hash="x", created_at=now, updated_at=now)
+        db.add_all([school, user])
+        db.flush()
+        students = [
+            {"id": uuid.uuid4(), "school_id": school.id, "first_name": f"S{i}", "status": "active", "created_at": now}
+            for i in range(count)
+        ]
+        guardians = [
+            {
+                "id": uuid.uuid4(),
+                "school_id": school.id,
+                "full_name": f"G{i}",
+                "phone": f"+1555{i:07d}",
+                "email": f"g{i}@example.com",
+                "created_at": now,
+            }
+            for i in range(count)
+        ]
+        db.execute(insert(Student), students)
+        db.execute(insert(Guardian), guardians)
+        db.execute(
+            insert(StudentGuardian),
+            [{"student_id": s["id"], "guardian_id": g["id"], "relation": "parent", "is_primary": True} for s, g in zip(students, guardians)],
+        )
+        upsert_student_attendance(db, school.id, attendance_date=DAY, statuses=[(s["id"], "absent") for s in students])
+        db.commit()
+        return school.id, user.id
+
+
+def test_attendance_alerts_for_10k_absences(tmp_path):
+    print()
+    count = 10_000
+    engine = create_engine(f"sqlite:///{tmp_path / 'alerts.db'}")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    school_id, user_id = _seed(factory, count)
+    transport = FakeTransport(delay_seconds=0.02)
+    with factory() as db:
+        started = time.perf_counter()
+        result = dispatch_attendance_alerts(db, school_id, attendance_date=DAY, sent_by_user_id=user_id, transport=transport)
+        elapsed = time.perf_counter() - started
+    print(f"{count} absences  {result['messages']} messages at 20 ms each  {elapsed:6.2f} s")
+    assert result["sent"] == 2 * count
+    assert elapsed < 60
+    engine.dispose()
@@ -0,0 +1,86 @@
+import csv
+import io
+import time
+import tracemalloc
+import uuid
+from datetime import date, datetime, timezone
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+import app.db.base  # noqa: F401
+from app.core.csv_export import iter_csv, iter_rows
+from app.db.session import Base
+from app.models.school import School
+from app.models.student import Student
+
+HEADER = ["first_name", "last_name", "admission_no", "gender", "date_of_birth", "status", "photo_url"]
+
+
+def _seed(factory, count: int) -> uuid.UUID:
+    now = datetime.now(timezone.utc)
+    with factory() as db:
+        school = School(name="Bench", code=f"C{uuid.uuid4().hex[:6]}", is_active=True, created_at=now)
+        db.add(school)
+        db.flush()
+        for start in range(0, count, 5000):
+            db.execute(
+                insert(Student),
+                [
+                    {
+                        "id": uuid.uuid4(),
+                        "school_id": school.id,
+                        "first_name": f"First{i}",
+                        "last_name": f"Last{i}",
+                        "admission_no": f"ADM-{i:06d}",
+                        "gender": "F" if i % 2 else "M",
+                        "date_of_birth": date(2010, 1 + i % 12, 1 + i % 28),
+                        "admission_status": "active",
+                        "status": "active",
+                        "photo_url": f"https://cdn.example.com/photos/{i}.jpg",
+                        "created_at": now,
+                    }
+                    for i in range(start, min(start + 5000, count))
+                ],
+            )
+        db.commit()
+        return school.id
+
+
+def _legacy(factory, school_id) -> int:
+    with factory() as db:
+        rows = db.execute(select(Student).where(Student.school_id == school_id).order_by(Student.created_at.asc())).scalars().all()
+        buf = io.StringIO()
+        w = csv.writer(buf)
+        w.writerow(HEADER)
+        for s in rows:
+            w.writerow([s.first_name, s.last_name or "", s.admission_no or "", s.gender or "", s.date_of_birth or "", s.status, s.photo_url or ""])
+        return sum(len(c) for c in iter([buf.getvalue().encode("utf-8")]))
+
+
+def _streaming(factory, school_id) -> int:
+    statement = (
+        select(Student.first_name, Student.last_name, Student.admission_no, Student.gender, Student.date_of_birth, Student.status, Student.photo_url)
+        .where(Student.school_id == school_id)
+        .order_by(Student.created_at.asc())
+    )
+    rows = ([v if v is not None else "" for v in r] for r in iter_rows(statement, session_factory=factory))
+    return sum(len(c) for c in iter_csv(HEADER, rows))
+
+
+def test_student_export_memory(tmp_path):
+    print()
+    for count in (5_000, 20_000):
+        engine = create_engine(f"sqlite:///{tmp_path / f'export_{count}.db'}")
+        Base.metadata.create_all(engine)
+        factory = sessionmaker(bind=engine)
+        school_id = _seed(factory, count)
+        for name, fn in (("load all + StringIO (old)", _legacy), ("yield_per + chunked", _streaming)):
+            tracemalloc.start()
+            started = time.perf_counter()
+            size = fn(factory, school_id)
+            elapsed = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{count:>6} students  {name:<26} {elapsed * 1000:8.1f} ms  peak {peak / 1_048_576:6.1f} MiB  ({size / 1_048_576:.1f} MiB csv)")
+        engine.dispose()
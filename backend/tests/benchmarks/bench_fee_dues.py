@@ -0,0 +1,145 @@
+import time
+import uuid
+from datetime import date, datetime, timezone
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.orm import sessionmaker
+
+import app.db.base  # noqa: F401
+from app.core.fee_dues import calculate_fee_dues, discount_for
+from app.db.session import Base
+from app.models.academic_year import AcademicYear
+from app.models.discount import Discount
+from app.models.enrollment import Enrollment
+from app.models.fee_due import FeeDue
+from app.models.fee_payment import FeePayment
+from app.models.fee_structure import FeeStructure
+from app.models.school import School
+from app.models.school_class import SchoolClass
+from app.models.student import Student
+from app.models.student_discount import StudentDiscount
+
+
+def _seed(factory, count: int):
+    now = datetime.now(timezone.utc)
+    with factory() as db:
+        school = School(name="Bench", code=f"C{uuid.uuid4().hex[:6]}", is_active=True, created_at=now)
+        db.add(school)
+        db.flush()
+        year = AcademicYear(
+            school_id=school.id, name="2024", start_date=date(2024, 1, 1), end_date=date(2024, 12, 31), is_current=True, created_at=now
+        )
+        classes = [SchoolClass(school_id=school.id, name=f"Grade {n}", numeric_value=n, created_at=now) for n in range(1, 11)]
+        db.add_all([year, *classes])
+        db.flush()
+        db.execute(
+            insert(FeeStructure),
+            [
+                {"id": uuid.uuid4(), "academic_year_id": year.id, "class_id": c.id, "name": name, "amount": amount, "due_date": due, "created_at": now}
+                for c in classes
+                for name, amount, due in (("Tuition", 1000, date(2024, 2, 1)), ("Lab", 200, None))
+            ],
+        )
+        discounts = [
+            Discount(school_id=school.id, name="Sibling", discount_type="percent", value=10, created_at=now),
+            Discount(school_id=school.id, name="Merit", discount_type="fixed", value=50, created_at=now),
+        ]
+        db.add_all(discounts)
+        db.flush()
+        students = [
+            {"id": uuid.uuid4(), "school_id": school.id, "first_name": f"S{i}", "status": "active", "created_at": now}
+            for i in range(count)
+        ]
+        db.execute(insert(Student), students)
+        db.execute(
+            insert(Enrollment),
+            [
+                {"id": uuid.uuid4(), "student_id": s["id"], "academic_year_id": year.id, "class_id": classes[i % 10].id, "status": "active", "created_at": now}
+                for i, s in enumerate(students)
+            ],
+        )
+        db.execute(
+            insert(FeePayment),
+            [
+                {"id": uuid.uuid4(), "student_id": s["id"], "academic_year_id": year.id, "payment_date": date(2024, 1, 15), "amount": 400, "is_refund": False, "created_at": now}
+                for s in students[::2]
+            ],
+        )
+        db.execute(
+            insert(StudentDiscount),
+            [{"student_id": s["id"], "discount_id": discounts[i % 2].id, "created_at": now} for i, s in enumerate(students[::5])],
+        )
+        db.commit()
+        return school.id, year.id
+
+
+def _per_row(db, school_id, year_id):
+    """The previous calculate_dues loop, kept here as the baseline."""
+    now = datetime.now(timezone.utc)
+    today = date.today()
+    for enr in db.execute(select(Enrollment).where(Enrollment.academic_year_id == year_id, Enrollment.status == "active")).scalars().all():
+        student = db.get(Student, enr.student_id)
+        db.get(AcademicYear, year_id)
+        db.get(SchoolClass, enr.class_id)
+        total_fee = int(
+            db.scalar(
+                select(func.coalesce(func.sum(FeeStructure.amount), 0)).where(
+                    FeeStructure.academic_year_id == year_id, FeeStructure.class_id == enr.class_id
+                )
+            )
+        )
+        links = db.execute(select(StudentDiscount).where(StudentDiscount.student_id == student.id)).scalars().all()
+        found = [db.get(Discount, link.discount_id) for link in links]
+        discount_amount = discount_for(total_fee, [(d.discount_type, d.value) for d in found if d.school_id == school_id])
+        payments = db.execute(
+            select(FeePayment.amount, FeePayment.is_refund).where(FeePayment.student_id == student.id, FeePayment.academic_year_id == year_id)
+        ).all()
+        paid_amount = sum(-amount if refund else amount for amount, refund in payments)
+        due_amount = max(total_fee - discount_amount - paid_amount, 0)
+        status = "paid" if due_amount == 0 else ("partial" if paid_amount > 0 else "due")
+        if due_amount > 0 and db.scalar(
+            select(func.count())
+            .select_from(FeeStructure)
+            .where(FeeStructure.academic_year_id == year_id, FeeStructure.class_id == enr.class_id, FeeStructure.due_date < today)
+        ):
+            status = "overdue"
+        existing = db.scalar(select(FeeDue).where(FeeDue.student_id == student.id, FeeDue.academic_year_id == year_id))
+        values = dict(
+            total_fee=total_fee,
+            discount_amount=discount_amount,
+            paid_amount=paid_amount,
+            due_amount=due_amount,
+            status=status,
+            last_calculated_date=today,
+            updated_at=now,
+        )
+        if existing:
+            for key, value in values.items():
+                setattr(existing, key, value)
+        else:
+            db.add(FeeDue(student_id=student.id, academic_year_id=year_id, **values))
+    db.commit()
+
+
+def _set_based(db, school_id, year_id):
+    calculate_fee_dues(db, school_id, academic_year_id=year_id)
+    db.commit()
+
+
+def test_fee_due_calculation(tmp_path):
+    print()
+    count = 10_000
+    for label, run in (("per-row", _per_row), ("set-based", _set_based)):
+        engine = create_engine(f"sqlite:///{tmp_path / f'{label}.db'}")
+        Base.metadata.create_all(engine)
+        factory = sessionmaker(bind=engine)
+        school_id, year_id = _seed(factory, count)
+        for phase in ("first run", "recalculate"):
+            with factory() as db:
+                started = time.perf_counter()
+                run(db, school_id, year_id)
+                elapsed = time.perf_counter() - started
+            print(f"{count} students  {label:<9} {phase:<11} {elapsed:6.2f} s")
+        with factory() as db:
+            assert db.scalar(select(func.count()).select_from(FeeDue)) == count
+        engine.dispose()
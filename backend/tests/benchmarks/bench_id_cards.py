@@ -0,0 +1,47 @@
+import os
+import time
+import uuid
+
+from app.core import id_cards
+from app.core.id_cards import IdCard, IdCardContext, iter_id_card_document, render_id_card
+
+
+def _cards(count: int) -> list[IdCard]:
+    return [
+        IdCard(
+            student_id=uuid.uuid4(),
+            name=f"Student {i:04d}",
+            admission_no=f"STU{1001 + i}",
+            roll_number=str(i % 40 + 1),
+            class_name="Grade 6",
+            section_name="ABC"[i % 3],
+            date_of_birth="2014-03-01",
+            blood_group="O+",
+            photo_url="",
+            emergency_phone="01700000000",
+        )
+        for i in range(count)
+    ]
+
+
+def test_term_start_print_run():
+    print()
+    count = 1200
+    ctx = IdCardContext("Bench School", "BS", "1 Road", "0123", "bench.example", "", "2025", "2025-01-01")
+    cards = _cards(count)
+
+    started = time.perf_counter()
+    for card in cards:
+        render_id_card(ctx, card)
+    per_card = time.perf_counter() - started
+    id_cards._qr_cache.clear()
+
+    workers = min(4, os.cpu_count() or 1)
+    started = time.perf_counter()
+    size = sum(len(chunk) for chunk in iter_id_card_document(ctx, cards, title="Bench", workers=workers))
+    batch = time.perf_counter() - started
+
+    started = time.perf_counter()
+    sum(len(chunk) for chunk in iter_id_card_document(ctx, cards, title="Bench", workers=workers))
+    reprint = time.perf_counter() - started
+    print(f"{count} cards  per-card docs {per_card:6.2f} s   batch ({workers} workers) {batch:6.2f} s   reprint {reprint:6.2f} s   {size / 1e6:.1f} MB")
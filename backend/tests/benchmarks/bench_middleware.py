@@ -0,0 +1,48 @@
+import time
+
+from fastapi.testclient import TestClient
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.config import settings
+from app.main import create_app
+
+ROUNDS = 2000
+WARMUP = 100
+
+
+class _PassthroughHTTPMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        return await call_next(request)
+
+
+def _per_request_us(c: TestClient, path: str) -> float:
+    for _ in range(WARMUP):
+        c.get(path)
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        c.get(path)
+    return (time.perf_counter() - started) / ROUNDS * 1_000_000
+
+
+def test_middleware_overhead(client):
+    settings.rate_limit_enabled = False
+
+    bare = create_app()
+    bare.user_middleware = []
+
+    asgi = create_app()
+
+    legacy = create_app()
+    for _ in range(3):
+        legacy.add_middleware(_PassthroughHTTPMiddleware)
+
+    path = f"{settings.api_v1_prefix}/health"
+    results = {}
+    for name, app in (("no middleware", bare), ("pure ASGI stack", asgi), ("ASGI + 3 BaseHTTPMiddleware", legacy)):
+        with TestClient(app) as c:
+            assert c.get(path).status_code == 200
+            results[name] = _per_request_us(c, path)
+
+    print()
+    for name, us in results.items():
+        print(f"{name:<32} {us:8.1f} us/request  (+{us - results['no middleware']:6.1f} us over bare app)")
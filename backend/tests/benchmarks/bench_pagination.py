@@ -0,0 +1,54 @@
+import time
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.orm import sessionmaker
+
+import app.db.base  # noqa: F401
+from app.core.pagination import encode_cursor, keyset_page
+from app.db.session import Base
+from app.models.school import School
+from app.models.student import Student
+
+
+def _seed(factory, count: int) -> uuid.UUID:
+    now = datetime.now(timezone.utc)
+    with factory() as db:
+        school = School(name="Bench", code=f"C{uuid.uuid4().hex[:6]}", is_active=True, created_at=now)
+        db.add(school)
+        db.flush()
+        for start in range(0, count, 5000):
+            db.execute(
+                insert(Student),
+                [
+                    {"id": uuid.uuid4(), "school_id": school.id, "first_name": f"First{i:06d}", "status": "active", "created_at": now}
+                    for i in range(start, min(start + 5000, count))
+                ],
+            )
+        db.commit()
+        return school.id
+
+
+def test_deep_page_latency(tmp_path):
+    print()
+    count, limit = 100_000, 20
+    engine = create_engine(f"sqlite:///{tmp_path / 'pages.db'}")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    school_id = _seed(factory, count)
+    base = select(Student).where(Student.school_id == school_id)
+    with factory() as db:
+        for depth in (0, 10_000, 50_000, 99_000):
+            started = time.perf_counter()
+            db.scalar(select(func.count()).select_from(base.subquery()))
+            db.execute(base.order_by(Student.first_name.asc()).offset(depth).limit(limit)).scalars().all()
+            offset_ms = (time.perf_counter() - started) * 1000
+
+            anchor = db.execute(base.order_by(Student.first_name.asc(), Student.id.asc()).offset(max(depth - 1, 0)).limit(1)).scalar_one()
+            cursor = encode_cursor([anchor.first_name, anchor.id]) if depth else ""
+            started = time.perf_counter()
+            keyset_page(db, base, keys=(Student.first_name, Student.id), cursor=cursor, limit=limit)
+            keyset_ms = (time.perf_counter() - started) * 1000
+            print(f"row {depth:>6}  offset+count {offset_ms:7.1f} ms   keyset {keyset_ms:6.1f} ms")
+    engine.dispose()
@@ -0,0 +1,82 @@
+import time
+import uuid
+from datetime import date, datetime, timezone
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+import app.db.base  # noqa: F401
+from app.core.promotions import promote_enrollments
+from app.db.session import Base
+from app.models.academic_year import AcademicYear
+from app.models.enrollment import Enrollment
+from app.models.school import School
+from app.models.school_class import SchoolClass
+from app.models.student import Student
+
+
+def _seed(factory, count: int):
+    now = datetime.now(timezone.utc)
+    with factory() as db:
+        school = School(name="Bench", code=f"C{uuid.uuid4().hex[:6]}", is_active=True, created_at=now)
+        db.add(school)
+        db.flush()
+        years = []
+        for name in ("2024", "2025"):
+            start, end = date(int(name), 1, 1), date(int(name), 12, 31)
+            year = AcademicYear(school_id=school.id, name=name, start_date=start, end_date=end, is_current=name == "2024", created_at=now)
+            db.add(year)
+            years.append(year)
+        grade = SchoolClass(school_id=school.id, name="Grade 1", numeric_value=1, created_at=now)
+        db.add(grade)
+        db.flush()
+        students = [
+            {"id": uuid.uuid4(), "school_id": school.id, "first_name": f"S{i}", "status": "active", "created_at": now}
+            for i in range(count)
+        ]
+        db.execute(insert(Student), students)
+        enrollments = [
+            {
+                "id": uuid.uuid4(),
+                "student_id": s["id"],
+                "academic_year_id": years[0].id,
+                "class_id": grade.id,
+                "status": "active",
+                "created_at": now,
+            }
+            for s in students
+        ]
+        db.execute(insert(Enrollment), enrollments)
+        db.commit()
+        return school.id, years[1].id, grade.id, [e["id"] for e in enrollments]
+
+
+def _per_row(db, school_id, enrollment_ids, year_id, class_id):
+    now = datetime.now(timezone.utc)
+    for eid in enrollment_ids:
+        e = db.get(Enrollment, eid)
+        student = db.get(Student, e.student_id)
+        assert student.school_id == school_id
+        assert db.scalar(select(Enrollment).where(Enrollment.student_id == e.student_id, Enrollment.academic_year_id == year_id)) is None
+        e.status = "promoted"
+        db.add(Enrollment(student_id=e.student_id, academic_year_id=year_id, class_id=class_id, status="active", created_at=now))
+    db.commit()
+
+
+def test_year_end_promotion(tmp_path):
+    print()
+    count = 5_000
+    for label, run in (
+        ("per-row", lambda db, s, ids, y, c: _per_row(db, s, ids, y, c)),
+        ("set-based", lambda db, s, ids, y, c: promote_enrollments(db, s, enrollment_ids=ids, new_academic_year_id=y, new_class_id=c)),
+    ):
+        engine = create_engine(f"sqlite:///{tmp_path / f'{label}.db'}")
+        Base.metadata.create_all(engine)
+        factory = sessionmaker(bind=engine)
+        school_id, year_id, class_id, ids = _seed(factory, count)
+        with factory() as db:
+            started = time.perf_counter()
+            run(db, school_id, ids, year_id, class_id)
+            elapsed = time.perf_counter() - started
+        print(f"{count} promotions  {label:<9} {elapsed:6.2f} s")
+        engine.dispose()
@@ -0,0 +1,50 @@
+import time
+import tracemalloc
+from collections import defaultdict, deque
+
+from app.core.rate_limit import RateLimiter, RateLimitRule
+
+KEYS = 100_000
+ROUNDS = 5
+
+
+class _DequeRateLimiter:
+    def __init__(self) -> None:
+        self._buckets: dict[str, deque[float]] = defaultdict(deque)
+
+    def allow(self, *, key: str, rule: RateLimitRule) -> bool:
+        now = time.time()
+        bucket = self._buckets[key]
+        cutoff = now - rule.window_seconds
+        while bucket and bucket[0] < cutoff:
+            bucket.popleft()
+        if len(bucket) >= rule.max_requests:
+            return False
+        bucket.append(now)
+        return True
+
+
+def _run(factory, keys: list[str], rule: RateLimitRule) -> tuple[float, int]:
+    limiter = factory()
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        for key in keys:
+            limiter.allow(key=key, rule=rule)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    limiter = factory()
+    for key in keys:
+        limiter.allow(key=key, rule=rule)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return KEYS * ROUNDS / elapsed, peak
+
+
+def test_allow_throughput_with_100k_keys():
+    keys = [f"10.{i // 65536}.{(i // 256) % 256}.{i % 256}:api" for i in range(KEYS)]
+    rule = RateLimitRule(window_seconds=60, max_requests=100)
+    print()
+    for name, factory in (("deque per key (old)", _DequeRateLimiter), ("GCRA local backend", RateLimiter)):
+        ops, peak = _run(factory, keys, rule)
+        print(f"{name:<22} {ops:12,.0f} allow()/s  peak {peak / 1_048_576:7.1f} MiB")
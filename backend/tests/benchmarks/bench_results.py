@@ -0,0 +1,130 @@
+import time
+import uuid
+from datetime import date, datetime, timezone
+
+from sqlalchemy import create_engine, event, func, insert, select
+from sqlalchemy.orm import Session, sessionmaker
+
+import app.db.base  # noqa: F401
+from app.core.results import compute_results, refresh_student_results
+from app.db.session import Base
+from app.models.academic_year import AcademicYear
+from app.models.exam import Exam
+from app.models.exam_schedule import ExamSchedule
+from app.models.grade import Grade
+from app.models.mark import Mark
+from app.models.result import Result
+from app.models.school import School
+from app.models.school_class import SchoolClass
+from app.models.student import Student
+from app.models.subject import Subject
+
+STUDENTS = 1500
+SUBJECTS = 5
+
+
+def _seed(db: Session):
+    now = datetime.now(timezone.utc)
+    school = School(name="Bench", code=f"B{uuid.uuid4().hex[:6]}", is_active=True, created_at=now)
+    db.add(school)
+    db.flush()
+    year = AcademicYear(school_id=school.id, name="2024", start_date=date(2024, 1, 1), end_date=date(2024, 12, 31), is_current=True, created_at=now)
+    cls = SchoolClass(school_id=school.id, name="Grade 9", is_active=True, created_at=now)
+    db.add_all([year, cls])
+    db.flush()
+    exam = Exam(academic_year_id=year.id, name="Final", created_at=now)
+    db.add(exam)
+    for name, low, high in (("A", 80, 100), ("B", 60, 79.99), ("C", 40, 59.99), ("F", 0, 39.99)):
+        db.add(Grade(school_id=school.id, name=name, min_percentage=low, max_percentage=high, created_at=now))
+    db.flush()
+    schedules = []
+    for i in range(SUBJECTS):
+        subject = Subject(school_id=school.id, name=f"Subject {i}", created_at=now)
+        db.add(subject)
+        db.flush()
+        schedule = ExamSchedule(exam_id=exam.id, class_id=cls.id, subject_id=subject.id, exam_date=date(2024, 11, 1), max_marks=100, created_at=now)
+        db.add(schedule)
+        schedules.append(schedule)
+    db.flush()
+    student_rows = [
+        {"id": uuid.uuid4(), "school_id": school.id, "first_name": f"S{i}", "admission_status": "active", "status": "active", "created_at": now}
+        for i in range(STUDENTS)
+    ]
+    db.execute(insert(Student), student_rows)
+    db.execute(
+        insert(Mark),
+        [
+            {"id": uuid.uuid4(), "exam_schedule_id": s.id, "student_id": st["id"], "marks_obtained": (i * 7 + j * 13) % 101, "is_absent": False, "created_at": now}
+            for j, s in enumerate(schedules)
+            for i, st in enumerate(student_rows)
+        ],
+    )
+    db.commit()
+    return school.id, exam.id, [s.id for s in schedules], SUBJECTS * 100
+
+
+def _legacy(db: Session, school_id, exam_id, schedule_ids, total_marks_per_exam):
+    student_ids = db.execute(select(Mark.student_id).where(Mark.exam_schedule_id.in_(schedule_ids)).distinct()).scalars().all()
+    now = datetime.now(timezone.utc)
+    for student_id in student_ids:
+        student = db.get(Student, student_id)
+        if not student or student.school_id != school_id:
+            continue
+        obtained = db.scalar(
+            select(func.coalesce(func.sum(Mark.marks_obtained), 0)).where(
+                Mark.exam_schedule_id.in_(schedule_ids), Mark.student_id == student_id, Mark.is_absent.is_(False)
+            )
+        ) or 0
+        percentage = float(obtained) / float(total_marks_per_exam) * 100.0
+        grade_id = None
+        for g in db.execute(select(Grade).where(Grade.school_id == school_id)).scalars().all():
+            if g.min_percentage <= percentage <= g.max_percentage:
+                grade_id = g.id
+                break
+        existing = db.scalar(select(Result).where(Result.exam_id == exam_id, Result.student_id == student_id))
+        if existing:
+            existing.obtained_marks = int(obtained)
+            existing.percentage = percentage
+            existing.grade_id = grade_id
+        else:
+            db.add(Result(exam_id=exam_id, student_id=student_id, total_marks=total_marks_per_exam, obtained_marks=int(obtained), percentage=percentage, grade_id=grade_id, created_at=now))
+            db.flush()
+    db.commit()
+
+
+def _engine(db: Session, school_id, exam_id, schedule_ids, total_marks):
+    compute_results(db, school_id=school_id, exam_id=exam_id)
+    db.commit()
+
+
+def _incremental(db: Session, school_id, exam_id, schedule_ids, total_marks):
+    student_id = db.scalar(select(Mark.student_id).where(Mark.exam_schedule_id == schedule_ids[0]).limit(1))
+    refresh_student_results(db, school_id=school_id, exam_id=exam_id, student_ids=[student_id])
+    db.commit()
+
+
+def _measure(factory, fn, args) -> tuple[float, int]:
+    engine = factory.kw["bind"]
+    statements = []
+    listener = lambda *a: statements.append(1)
+    event.listen(engine, "before_cursor_execute", listener)
+    started = time.perf_counter()
+    with factory() as db:
+        fn(db, *args)
+    elapsed = time.perf_counter() - started
+    event.remove(engine, "before_cursor_execute", listener)
+    return elapsed * 1000, len(statements)
+
+
+def test_result_engine_vs_loop(tmp_path):
+    print()
+    for name, fn in (("per-student loop (old)", _legacy), ("set-based engine", _engine), ("one-student refresh", _incremental)):
+        engine = create_engine(f"sqlite:///{tmp_path / (fn.__name__ + '.db')}")
+        Base.metadata.create_all(engine)
+        factory = sessionmaker(bind=engine)
+        with factory() as db:
+            args = _seed(db)
+        cold_ms, cold_q = _measure(factory, fn, args)
+        warm_ms, warm_q = _measure(factory, fn, args)
+        print(f"{name:<24} insert {cold_ms:8.1f} ms / {cold_q:5d} queries   update {warm_ms:8.1f} ms / {warm_q:5d} queries")
+        engine.dispose()
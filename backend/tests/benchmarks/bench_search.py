@@ -0,0 +1,76 @@
+import random
+import time
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+import app.db.base  # noqa: F401
+from app.core.search import apply_search
+from app.db.session import Base
+from app.models.school import School
+from app.models.student import Student
+
+FIRST = ["Anna", "Bilal", "Chen", "Dara", "Emeka", "Fatima", "Goran", "Hana", "Ivan", "Jamal", "Kofi", "Lena", "Mateo", "Nadia"]
+LAST = ["Smith", "Rahman", "Okafor", "Novak", "Haddad", "Kim", "Silva", "Berg", "Costa", "Ibrahim", "Jensen", "Mensah"]
+TERMS = ["an", "ann", "fat", "okaf", "nad kim", "adm-0123", "zzz"]
+
+
+def _seed(factory, count: int) -> uuid.UUID:
+    rng = random.Random(7)
+    now = datetime.now(timezone.utc)
+    with factory() as db:
+        school = School(name="Bench", code=f"C{uuid.uuid4().hex[:6]}", is_active=True, created_at=now)
+        db.add(school)
+        db.flush()
+        for start in range(0, count, 5000):
+            db.execute(
+                insert(Student),
+                [
+                    {
+                        "id": uuid.uuid4(),
+                        "school_id": school.id,
+                        "first_name": f"{rng.choice(FIRST)}{i % 97}",
+                        "last_name": rng.choice(LAST),
+                        "admission_no": f"ADM-{i:06d}",
+                        "status": "active",
+                        "created_at": now,
+                    }
+                    for i in range(start, min(start + 5000, count))
+                ],
+            )
+        db.commit()
+        return school.id
+
+
+def _ilike(db, school_id, term):
+    pattern = f"%{term}%"
+    q = select(Student.id).where(
+        Student.school_id == school_id,
+        Student.first_name.ilike(pattern) | Student.last_name.ilike(pattern) | Student.admission_no.ilike(pattern),
+    )
+    return db.execute(q.order_by(Student.first_name.asc()).limit(20)).all()
+
+
+def _indexed(db, school_id, term):
+    q, rank = apply_search(db, select(Student.id).where(Student.school_id == school_id), "students", term)
+    return db.execute(q.order_by(rank, Student.first_name.asc()).limit(20)).all()
+
+
+def test_student_typeahead(tmp_path):
+    print()
+    for count in (20_000, 100_000):
+        engine = create_engine(f"sqlite:///{tmp_path / f'search_{count}.db'}")
+        Base.metadata.create_all(engine)
+        factory = sessionmaker(bind=engine)
+        school_id = _seed(factory, count)
+        with factory() as db:
+            for name, fn in (("ilike OR scan (old)", _ilike), ("FTS5 prefix + rank", _indexed)):
+                started = time.perf_counter()
+                for _ in range(5):
+                    for term in TERMS:
+                        fn(db, school_id, term)
+                per_query = (time.perf_counter() - started) / (5 * len(TERMS))
+                print(f"{count:>7} students  {name:<22} {per_query * 1000:7.2f} ms/query")
+        engine.dispose()
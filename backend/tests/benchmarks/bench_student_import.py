@@ -0,0 +1,75 @@
+import csv
+import io
+import time
+import uuid
+from datetime import date, datetime, timezone
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+import app.db.base  # noqa: F401
+from app.core.student_import import import_students, iter_csv_records
+from app.db.session import Base
+from app.models.school import School
+from app.models.student import Student
+
+ROWS = 50_000
+
+
+def _csv_bytes() -> bytes:
+    buf = io.StringIO()
+    w = csv.writer(buf)
+    w.writerow(["first_name", "last_name", "admission_no", "gender", "date_of_birth", "status", "photo_url"])
+    for i in range(ROWS):
+        dob = "not-a-date" if i % 1000 == 999 else date(2010, 1 + i % 12, 1 + i % 28).isoformat()
+        w.writerow([f"First{i}", f"Last{i}", "" if i % 2 else f"ADM{i}", "F", dob, "active", ""])
+    return buf.getvalue().encode("utf-8")
+
+
+def _legacy(db, school_id, raw: bytes) -> int:
+    reader = csv.DictReader(io.StringIO(raw.decode("utf-8-sig")))
+    now = datetime.now(timezone.utc)
+    created = 0
+    for r in reader:
+        if r.get("date_of_birth") == "not-a-date":
+            continue
+        db.add(
+            Student(
+                school_id=school_id,
+                first_name=r["first_name"],
+                last_name=r.get("last_name") or None,
+                admission_no=r.get("admission_no") or None,
+                gender=r.get("gender") or None,
+                date_of_birth=date.fromisoformat(r["date_of_birth"]) if r.get("date_of_birth") else None,
+                status=r.get("status") or "active",
+                created_at=now,
+            )
+        )
+        created += 1
+    db.commit()
+    return created
+
+
+def _engine(db, school_id, raw: bytes) -> int:
+    report = import_students(db, school_id=school_id, records=iter_csv_records(io.BytesIO(raw)))
+    assert report.error_count == ROWS // 1000
+    return report.created
+
+
+def test_import_50k_students(tmp_path):
+    raw = _csv_bytes()
+    print()
+    for name, fn in (("ORM add per row (old)", _legacy), ("chunked Core insert", _engine)):
+        engine = create_engine(f"sqlite:///{tmp_path / (fn.__name__ + '.db')}")
+        Base.metadata.create_all(engine)
+        factory = sessionmaker(bind=engine)
+        with factory() as db:
+            school = School(name="Bench", code=f"I{uuid.uuid4().hex[:6]}", is_active=True, created_at=datetime.now(timezone.utc))
+            db.add(school)
+            db.commit()
+            started = time.perf_counter()
+            created = fn(db, school.id, raw)
+            elapsed = time.perf_counter() - started
+            assert db.scalar(select(func.count()).select_from(Student)) == created
+        print(f"{name:<24} {created:6d} rows in {elapsed:6.2f} s ({created / elapsed:8,.0f} rows/s)")
+        engine.dispose()
@@ -1,5 +1,7 @@
 import os
 
+os.environ["DATABASE_URL"] = "sqlite+pysqlite:///:memory:"
+
 import pytest
 from fastapi.testclient import TestClient
 
@@ -9,9 +11,18 @@ def _set_test_env() -> None:
     os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key-please-change")
 
 
+@pytest.fixture(autouse=True)
+def _restore_settings():
+    from app.core.config import settings
+
+    snapshot = settings.model_dump()
+    yield
+    for key, value in snapshot.items():
+        setattr(settings, key, value)
+
+
 @pytest.fixture()
 def client() -> TestClient:
-    os.environ["DATABASE_URL"] = "sqlite+pysqlite:///:memory:"
     from app.db.session import Base, engine
     from app.main import create_app
     import app.db.base
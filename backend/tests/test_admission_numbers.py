@@ -0,0 +1,72 @@
+import uuid
+
+from app.core.admission_numbers import allocate_admission_numbers
+from app.db.session import SessionLocal
+
+
+def _bootstrap(client):
+    platform = {"X-Tenant-Subdomain": "admin"}
+    login = client.post("/api/v1/auth/login", headers=platform, json={"email": "platform@kuskul.com", "password": "password123"})
+    platform["Authorization"] = f"Bearer {login.json()['access_token']}"
+    suffix = uuid.uuid4().hex[:8]
+    provisioned = client.post(
+        "/api/v1/platform/tenants",
+        headers=platform,
+        json={
+            "name": f"Tenant {suffix}",
+            "subdomain": f"an{suffix}",
+            "admin_email": f"an_{suffix}@example.com",
+            "admin_password": "supersecure",
+            "school_name": f"School {suffix}",
+        },
+    )
+    headers = {"X-Tenant-Subdomain": f"an{suffix}"}
+    login = client.post("/api/v1/auth/login", headers=headers, json={"email": f"an_{suffix}@example.com", "password": "supersecure"})
+    return {**headers, "Authorization": f"Bearer {login.json()['access_token']}", "X-School-Id": provisioned.json()["school_id"]}
+
+
+def _create(client, headers, **extra):
+    resp = client.post("/api/v1/students", headers=headers, json={"first_name": "Kid", **extra})
+    assert resp.status_code == 200
+    return resp.json()
+
+
+def test_generated_numbers_skip_manual_ones(client):
+    headers = _bootstrap(client)
+    assert _create(client, headers)["admission_no"] == "STU1001"
+    assert _create(client, headers, admission_no="STU1005")["admission_no"] == "STU1005"
+    assert _create(client, headers, admission_no="X-9")["admission_no"] == "X-9"
+    assert _create(client, headers)["admission_no"] == "STU1006"
+
+    edited = _create(client, headers)
+    assert edited["admission_no"] == "STU1007"
+    resp = client.put(f"/api/v1/students/{edited['id']}", headers=headers, json={"admission_no": "STU1020"})
+    assert resp.status_code == 200
+    assert _create(client, headers)["admission_no"] == "STU1021"
+
+    body = "first_name,admission_no\nA,\nB,STU1030\nC,\n"
+    files = {"file": ("students.csv", body.encode("utf-8"), "text/csv")}
+    assert client.post("/api/v1/students/bulk-import", headers=headers, files=files).json()["created"] == 3
+    numbers = {s["first_name"]: s["admission_no"] for s in client.get("/api/v1/students", headers=headers).json()["items"]}
+    assert (numbers["A"], numbers["B"], numbers["C"]) == ("STU1031", "STU1030", "STU1032")
+    assert _create(client, headers)["admission_no"] == "STU1033"
+
+
+def test_blocks_are_disjoint_and_seeded_from_existing_numbers(client):
+    headers = _bootstrap(client)
+    school_id = uuid.UUID(headers["X-School-Id"])
+    body = "first_name,admission_no\nA,ADM7\nB,ADM12\nC,ADMx99\n"
+    files = {"file": ("students.csv", body.encode("utf-8"), "text/csv")}
+    assert client.post("/api/v1/students/bulk-import", headers=headers, files=files).json()["created"] == 3
+
+    db = SessionLocal()
+    try:
+        first = allocate_admission_numbers(db, school_id, prefix="ADM", start_from=1, count=3)
+        second = allocate_admission_numbers(db, school_id, prefix="ADM", start_from=1, count=2)
+        other = allocate_admission_numbers(db, school_id, prefix="NEW", start_from=500)
+        db.commit()
+    finally:
+        db.close()
+    assert first == ["ADM13", "ADM14", "ADM15"]
+    assert second == ["ADM16", "ADM17"]
+    assert other == ["NEW500"]
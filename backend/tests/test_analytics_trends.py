@@ -0,0 +1,116 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event
+
+from app.api.v1.endpoints.analytics import _performance_trends
+from app.db.session import SessionLocal, engine
+from app.models.exam import Exam
+from app.models.result import Result
+
+
+def _bootstrap(client):
+    platform = {"X-Tenant-Subdomain": "admin"}
+    login = client.post("/api/v1/auth/login", headers=platform, json={"email": "platform@kuskul.com", "password": "password123"})
+    platform["Authorization"] = f"Bearer {login.json()['access_token']}"
+    suffix = uuid.uuid4().hex[:8]
+    provisioned = client.post(
+        "/api/v1/platform/tenants",
+        headers=platform,
+        json={
+            "name": f"Tenant {suffix}",
+            "subdomain": f"at{suffix}",
+            "admin_email": f"at_{suffix}@example.com",
+            "admin_password": "supersecure",
+            "school_name": f"School {suffix}",
+        },
+    )
+    headers = {"X-Tenant-Subdomain": f"at{suffix}"}
+    login = client.post("/api/v1/auth/login", headers=headers, json={"email": f"at_{suffix}@example.com", "password": "supersecure"})
+    return {**headers, "Authorization": f"Bearer {login.json()['access_token']}", "X-School-Id": provisioned.json()["school_id"]}
+
+
+def test_enrollment_trends_grouped_with_filters(client):
+    headers = _bootstrap(client)
+    years = []
+    for y in (2022, 2023, 2024):
+        years.append(
+            client.post(
+                "/api/v1/academic-years",
+                headers=headers,
+                json={"name": str(y), "start_date": f"{y}-01-01", "end_date": f"{y}-12-31", "is_current": y == 2024},
+            ).json()["id"]
+        )
+    classes = [
+        client.post("/api/v1/classes", headers=headers, json={"name": f"Grade {n}", "numeric_value": n}).json()["id"] for n in (1, 2)
+    ]
+    for i, (year_id, class_id) in enumerate([(years[0], classes[0]), (years[1], classes[0]), (years[1], classes[1]), (years[1], classes[1])]):
+        student_id = client.post("/api/v1/students", headers=headers, json={"first_name": f"T{i}", "last_name": "Trend"}).json()["id"]
+        enrolled = client.post(
+            "/api/v1/enrollments", headers=headers, json={"student_id": student_id, "academic_year_id": year_id, "class_id": class_id}
+        )
+        assert enrolled.status_code == 200
+
+    log = []
+    listener = lambda conn, cursor, statement, *args: log.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        resp = client.get("/api/v1/analytics/trends/enrollment", headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert resp.status_code == 200
+    assert [(r["name"], r["enrollments"]) for r in resp.json()] == [("2022", 1), ("2023", 3), ("2024", 0)]
+    assert sum(1 for s in log if "enrollments" in s) == 1
+
+    by_class = client.get("/api/v1/analytics/trends/enrollment?breakdown=class&start_date=2023-01-01", headers=headers).json()
+    assert [r["name"] for r in by_class] == ["2023", "2024"]
+    assert sorted((c["class_id"], c["enrollments"]) for c in by_class[0]["classes"]) == sorted([(classes[0], 1), (classes[1], 2)])
+    assert by_class[1]["classes"] == []
+
+    filtered = client.get(f"/api/v1/analytics/trends/enrollment?class_id={classes[1]}", headers=headers).json()
+    assert [r["enrollments"] for r in filtered] == [0, 2, 0]
+
+    assert client.get("/api/v1/analytics/trends/enrollment?breakdown=section", headers=headers).status_code == 400
+    assert client.get("/api/v1/analytics/trends/performance?breakdown=class", headers=headers).json() == []
+    academic = client.get("/api/v1/analytics/statistics/academic", headers=headers).json()
+    assert academic == {"current_year_exams": 0, "results_count": 0}
+    attendance = client.get("/api/v1/analytics/statistics/attendance?start_date=2024-01-01&end_date=2024-01-31", headers=headers).json()
+    assert attendance == {"window_days": 30, "student_records": 0, "staff_records": 0}
+
+
+def test_performance_by_class_counts_each_result_once(client):
+    headers = _bootstrap(client)
+    year_id = client.post(
+        "/api/v1/academic-years",
+        headers=headers,
+        json={"name": "2025", "start_date": "2025-01-01", "end_date": "2025-12-31", "is_current": True},
+    ).json()["id"]
+    grade1, grade2 = (
+        client.post("/api/v1/classes", headers=headers, json={"name": f"Grade {n}", "numeric_value": n}).json()["id"] for n in (1, 2)
+    )
+    moved, stayed = (client.post("/api/v1/students", headers=headers, json={"first_name": n}).json()["id"] for n in ("Moved", "Stayed"))
+    first = client.post("/api/v1/enrollments", headers=headers, json={"student_id": moved, "academic_year_id": year_id, "class_id": grade1})
+    client.put(f"/api/v1/enrollments/{first.json()['id']}", headers=headers, json={"status": "transferred"})
+    client.post("/api/v1/enrollments", headers=headers, json={"student_id": moved, "academic_year_id": year_id, "class_id": grade2})
+    client.post("/api/v1/enrollments", headers=headers, json={"student_id": stayed, "academic_year_id": year_id, "class_id": grade1})
+
+    now = datetime.now(timezone.utc)
+    with SessionLocal() as db:
+        for i in range(3):
+            exam = Exam(academic_year_id=uuid.UUID(year_id), name=f"Exam {i}", exam_type="term", created_at=now + timedelta(minutes=i))
+            db.add(exam)
+            db.flush()
+            for sid, pct in ((moved, 40.0), (stayed, 80.0)):
+                db.add(Result(exam_id=exam.id, student_id=uuid.UUID(sid), total_marks=100, obtained_marks=int(pct), percentage=pct, created_at=now))
+        db.commit()
+
+    rows = client.get("/api/v1/analytics/trends/performance?breakdown=class", headers=headers).json()
+    assert [(r["exam_name"], r["avg_pct"]) for r in rows] == [("Exam 0", 60.0), ("Exam 1", 60.0), ("Exam 2", 60.0)]
+    assert sorted((c["class_id"], c["avg_pct"]) for c in rows[0]["classes"]) == sorted([(grade1, 80.0), (grade2, 40.0)])
+
+    filtered = client.get(f"/api/v1/analytics/trends/performance?class_id={grade2}", headers=headers).json()
+    assert [r["avg_pct"] for r in filtered] == [40.0, 40.0, 40.0]
+
+    with SessionLocal() as db:
+        school_id = uuid.UUID(headers["X-School-Id"])
+        assert [r["exam_name"] for r in _performance_trends(db, school_id, by_class=True, limit=2)] == ["Exam 0", "Exam 1"]
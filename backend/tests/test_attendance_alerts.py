@@ -0,0 +1,118 @@
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import event, select, update
+
+from app.core.config import settings
+from app.core.messaging import FakeTransport, register_transport
+from app.db.session import SessionLocal, engine
+from app.models.communication_log import CommunicationLog
+from app.models.guardian import Guardian
+from app.models.notification import Notification
+from app.models.user import User
+
+
+def _bootstrap(client):
+    platform = {"X-Tenant-Subdomain": "admin"}
+    login = client.post("/api/v1/auth/login", headers=platform, json={"email": "platform@kuskul.com", "password": "password123"})
+    platform["Authorization"] = f"Bearer {login.json()['access_token']}"
+    suffix = uuid.uuid4().hex[:8]
+    provisioned = client.post(
+        "/api/v1/platform/tenants",
+        headers=platform,
+        json={
+            "name": f"Tenant {suffix}",
+            "subdomain": f"al{suffix}",
+            "admin_email": f"al_{suffix}@example.com",
+            "admin_password": "supersecure",
+            "school_name": f"School {suffix}",
+        },
+    )
+    headers = {"X-Tenant-Subdomain": f"al{suffix}"}
+    login = client.post("/api/v1/auth/login", headers=headers, json={"email": f"al_{suffix}@example.com", "password": "supersecure"})
+    return {**headers, "Authorization": f"Bearer {login.json()['access_token']}", "X-School-Id": provisioned.json()["school_id"]}, suffix
+
+
+def test_alerts_reach_guardians_of_absent_students(client, monkeypatch):
+    headers, suffix = _bootstrap(client)
+    school_id = uuid.UUID(headers["X-School-Id"])
+    ann, ben, cat = (client.post("/api/v1/students", headers=headers, json={"first_name": n}).json()["id"] for n in ("Ann", "Ben", "Cat"))
+    guardians = {
+        "g1": {"full_name": "G One", "phone": "0101", "email": "g1@example.com"},
+        "g2": {"full_name": "G Two", "phone": "0102"},
+        "g3": {"full_name": "G Three", "email": "bounce@example.com"},
+    }
+    ids = {k: client.post("/api/v1/guardians", headers=headers, json=v).json()["id"] for k, v in guardians.items()}
+    for student_id, guardian in ((ann, "g1"), (ann, "g2"), (ben, "g3"), (cat, "g1")):
+        client.post(f"/api/v1/students/{student_id}/guardians", headers=headers, json={"guardian_id": ids[guardian]})
+    with SessionLocal() as db:
+        admin_id = db.scalar(select(User.id).where(User.email == f"al_{suffix}@example.com"))
+        db.execute(update(Guardian).where(Guardian.id == uuid.UUID(ids["g1"])).values(user_id=admin_id))
+        db.commit()
+    items = [{"student_id": ann, "status": "absent"}, {"student_id": ben, "status": "absent"}, {"student_id": cat, "status": "present"}]
+    client.post("/api/v1/attendance/students/mark", headers=headers, json={"attendance_date": "2025-05-06", "items": items})
+
+    fake = FakeTransport(fail_recipients=["bounce@example.com"])
+    register_transport("alerts-test", lambda: fake)
+    monkeypatch.setattr(settings, "messaging_transport", "alerts-test")
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        resp = client.post("/api/v1/attendance/students/send-alerts", headers=headers, json={"attendance_date": "2025-05-06"})
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert resp.status_code == 200
+    assert resp.json() == {"students": 2, "notifications": 1, "messages": 4, "sent": 3, "failed": 1}
+    assert sum(1 for s in statements if "JOIN guardians" in s) == 1
+    assert sum(1 for s in statements if s.startswith("INSERT INTO communication_logs")) == 1
+    assert sorted((m.channel, m.recipient) for m in fake.sent) == [("email", "g1@example.com"), ("sms", "0101"), ("sms", "0102")]
+    assert all("Ann was marked absent on 2025-05-06." == m.body for m in fake.sent)
+
+    with SessionLocal() as db:
+        logs = db.execute(
+            select(CommunicationLog.recipient, CommunicationLog.status).where(CommunicationLog.school_id == school_id)
+        ).all()
+        notes = db.scalars(select(Notification.message).where(Notification.school_id == school_id, Notification.user_id == admin_id)).all()
+    assert dict(logs) == {"0101": "sent", "0102": "sent", "g1@example.com": "sent", "bounce@example.com": "failed"}
+    assert notes == ["Ann was marked absent on 2025-05-06."]
+
+    again = client.post("/api/v1/attendance/students/send-alerts", headers=headers, json={"attendance_date": "2025-05-06"})
+    assert again.json() == {"students": 2, "notifications": 0, "messages": 0, "sent": 0, "failed": 0}
+    assert len(fake.sent) == 3
+
+
+def test_queued_alerts_are_resumed(client, monkeypatch):
+    headers, suffix = _bootstrap(client)
+    school_id = uuid.UUID(headers["X-School-Id"])
+    dan = client.post("/api/v1/students", headers=headers, json={"first_name": "Dan"}).json()["id"]
+    guardian = client.post("/api/v1/guardians", headers=headers, json={"full_name": "G", "phone": "0201"}).json()["id"]
+    client.post(f"/api/v1/students/{dan}/guardians", headers=headers, json={"guardian_id": guardian})
+    items = [{"student_id": dan, "status": "absent"}]
+    client.post("/api/v1/attendance/students/mark", headers=headers, json={"attendance_date": "2025-05-07", "items": items})
+
+    fake = FakeTransport()
+    register_transport("alerts-test", lambda: fake)
+    monkeypatch.setattr(settings, "messaging_transport", "alerts-test")
+    with SessionLocal() as db:
+        admin_id = db.scalar(select(User.id).where(User.email == f"al_{suffix}@example.com"))
+        db.add(
+            CommunicationLog(
+                school_id=school_id,
+                sent_by_user_id=admin_id,
+                communication_type="sms",
+                status="queued",
+                recipient="0299",
+                body="Eve was marked absent on 2025-05-06.",
+                dedupe_key=f"attendance:{uuid.uuid4()}:2025-05-06:sms:0299",
+                created_at=datetime.now(timezone.utc),
+            )
+        )
+        db.commit()
+
+    resp = client.post("/api/v1/attendance/students/send-alerts", headers=headers, json={"attendance_date": "2025-05-07"})
+    assert resp.json() == {"students": 1, "notifications": 0, "messages": 1, "sent": 2, "failed": 0}
+    assert sorted(m.recipient for m in fake.sent) == ["0201", "0299"]
+    with SessionLocal() as db:
+        statuses = db.scalars(select(CommunicationLog.status).where(CommunicationLog.school_id == school_id)).all()
+    assert statuses == ["sent", "sent"]
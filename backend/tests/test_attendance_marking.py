@@ -0,0 +1,116 @@
+import uuid
+from datetime import date, datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event, select, text
+from sqlalchemy.orm import sessionmaker
+
+import app.db.base  # noqa: F401
+from app.core.attendance import ensure_attendance_keys, upsert_staff_attendance
+from app.db.session import Base, engine
+from app.models.school import School
+from app.models.staff import Staff
+from app.models.teacher_assignment import StaffAttendance
+
+
+def _bootstrap(client):
+    platform = {"X-Tenant-Subdomain": "admin"}
+    login = client.post("/api/v1/auth/login", headers=platform, json={"email": "platform@kuskul.com", "password": "password123"})
+    platform["Authorization"] = f"Bearer {login.json()['access_token']}"
+    suffix = uuid.uuid4().hex[:8]
+    provisioned = client.post(
+        "/api/v1/platform/tenants",
+        headers=platform,
+        json={
+            "name": f"Tenant {suffix}",
+            "subdomain": f"am{suffix}",
+            "admin_email": f"am_{suffix}@example.com",
+            "admin_password": "supersecure",
+            "school_name": f"School {suffix}",
+        },
+    )
+    headers = {"X-Tenant-Subdomain": f"am{suffix}"}
+    login = client.post("/api/v1/auth/login", headers=headers, json={"email": f"am_{suffix}@example.com", "password": "supersecure"})
+    return {**headers, "Authorization": f"Bearer {login.json()['access_token']}", "X-School-Id": provisioned.json()["school_id"]}
+
+
+def _mark(client, headers, items):
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        resp = client.post("/api/v1/attendance/students/mark", headers=headers, json={"attendance_date": "2025-04-01", "items": items})
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return resp, statements
+
+
+def test_marking_upserts_one_row_per_student_day(client):
+    headers = _bootstrap(client)
+    ids = [client.post("/api/v1/students", headers=headers, json={"first_name": f"M{i}"}).json()["id"] for i in range(4)]
+
+    resp, statements = _mark(client, headers, [{"student_id": sid, "status": "present"} for sid in ids])
+    assert resp.json() == {"marked": 4}
+    assert sum(1 for s in statements if s.startswith("INSERT INTO student_attendance ")) == 1
+    assert sum(1 for s in statements if "FROM students" in s) == 1
+
+    again = [
+        {"student_id": ids[0], "status": "present"},
+        {"student_id": ids[1], "status": "late"},
+        {"student_id": ids[0], "status": "absent"},
+    ]
+    resp, statements = _mark(client, headers, again)
+    assert resp.status_code == 200
+    assert sum(1 for s in statements if s.startswith("INSERT INTO student_attendance ")) == 1
+    rows = client.get("/api/v1/attendance/students/date/2025-04-01", headers=headers).json()
+    assert len(rows) == 4
+    assert {r["student_id"]: r["status"] for r in rows} == {ids[0]: "absent", ids[1]: "late", ids[2]: "present", ids[3]: "present"}
+
+    stranger = {"student_id": str(uuid.uuid4()), "status": "absent"}
+    resp, _ = _mark(client, headers, [{"student_id": ids[2], "status": "absent"}, stranger])
+    assert resp.status_code == 404
+    rows = client.get("/api/v1/attendance/students/date/2025-04-01", headers=headers).json()
+    assert {r["student_id"]: r["status"] for r in rows}[ids[2]] == "present"
+
+
+def test_staff_marking_upserts(tmp_path):
+    local = create_engine(f"sqlite:///{tmp_path / 'staff.db'}")
+    Base.metadata.create_all(local)
+    now = datetime.now(timezone.utc)
+    with sessionmaker(bind=local)() as db:
+        school = School(name="S", code="S1", is_active=True, created_at=now)
+        db.add(school)
+        db.flush()
+        staff = [Staff(school_id=school.id, full_name=f"T{i}", created_at=now) for i in range(2)]
+        db.add_all(staff)
+        db.commit()
+
+        upsert_staff_attendance(db, school.id, attendance_date=date(2025, 4, 1), statuses=[(s.id, "present") for s in staff])
+        upsert_staff_attendance(db, school.id, attendance_date=date(2025, 4, 1), statuses=[(staff[1].id, "leave")])
+        db.commit()
+        rows = db.execute(select(StaffAttendance.staff_id, StaffAttendance.status)).all()
+        assert dict(rows) == {staff[0].id: "present", staff[1].id: "leave"}
+
+        with pytest.raises(HTTPException):
+            upsert_staff_attendance(db, uuid.uuid4(), attendance_date=date(2025, 4, 1), statuses=[(staff[0].id, "absent")])
+    local.dispose()
+
+
+def test_startup_key_patch_refuses_to_delete_duplicates(tmp_path):
+    legacy = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with legacy.begin() as conn:
+        conn.execute(text("CREATE TABLE staff_attendance (staff_id CHAR(32), attendance_date DATETIME)"))
+        conn.execute(text("INSERT INTO staff_attendance VALUES ('s1', '2025-01-06 00:00:00'), ('s1', '2025-01-06 00:00:00')"))
+    factory = sessionmaker(bind=legacy)
+    with factory() as db:
+        with pytest.raises(RuntimeError, match="alembic upgrade head"):
+            ensure_attendance_keys(db)
+        db.rollback()
+        assert db.scalar(text("SELECT COUNT(*) FROM staff_attendance")) == 2
+
+        db.execute(text("DELETE FROM staff_attendance WHERE rowid = 1"))
+        ensure_attendance_keys(db)
+        indexes = db.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'")).scalars().all()
+    assert "uq_staff_attendance_staff_date" in indexes
+    legacy.dispose()
@@ -0,0 +1,88 @@
+import uuid
+from datetime import date, timedelta
+
+from sqlalchemy import event
+
+from app.db.session import engine
+
+
+def _bootstrap(client):
+    platform = {"X-Tenant-Subdomain": "admin"}
+    login = client.post("/api/v1/auth/login", headers=platform, json={"email": "platform@kuskul.com", "password": "password123"})
+    platform["Authorization"] = f"Bearer {login.json()['access_token']}"
+    suffix = uuid.uuid4().hex[:8]
+    provisioned = client.post(
+        "/api/v1/platform/tenants",
+        headers=platform,
+        json={
+            "name": f"Tenant {suffix}",
+            "subdomain": f"ds{suffix}",
+            "admin_email": f"ds_{suffix}@example.com",
+            "admin_password": "supersecure",
+            "school_name": f"School {suffix}",
+        },
+    )
+    headers = {"X-Tenant-Subdomain": f"ds{suffix}"}
+    login = client.post("/api/v1/auth/login", headers=headers, json={"email": f"ds_{suffix}@example.com", "password": "supersecure"})
+    return {**headers, "Authorization": f"Bearer {login.json()['access_token']}", "X-School-Id": provisioned.json()["school_id"]}
+
+
+def _get(client, headers, path, params):
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        resp = client.get(path, headers=headers, params=params)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert resp.status_code == 200
+    return resp.json(), [s for s in statements if "status_days" in s]
+
+
+def test_defaulters_and_statistics_share_one_cached_aggregate(client):
+    headers = _bootstrap(client)
+    year = client.post(
+        "/api/v1/academic-years",
+        headers=headers,
+        json={"name": "2025", "start_date": "2025-01-01", "end_date": "2025-12-31", "is_current": True},
+    ).json()["id"]
+    grade1, grade2 = (
+        client.post("/api/v1/classes", headers=headers, json={"name": f"Grade {n}", "numeric_value": n}).json()["id"] for n in (1, 2)
+    )
+    a, b, c = (client.post("/api/v1/students", headers=headers, json={"first_name": n}).json()["id"] for n in ("A", "B", "C"))
+    for sid, class_id in ((a, grade1), (b, grade1), (c, grade2)):
+        client.post("/api/v1/enrollments", headers=headers, json={"student_id": sid, "academic_year_id": year, "class_id": class_id})
+
+    today = date.today()
+    plan = {a: ["present"] * 4, b: ["present", "absent", "absent", "late"], c: ["absent"] * 4}
+    for offset in range(4):
+        items = [{"student_id": sid, "status": statuses[offset]} for sid, statuses in plan.items()]
+        day = (today - timedelta(days=offset)).isoformat()
+        assert client.post("/api/v1/attendance/students/mark", headers=headers, json={"attendance_date": day, "items": items}).status_code == 200
+
+    path = "/api/v1/attendance/students/defaulters"
+    rows, queries = _get(client, headers, path, {"threshold": 75, "window_days": 7})
+    assert len(queries) == 1
+    assert [(r["student_id"], r["attendance_pct"], r["present"], r["total"]) for r in rows] == [(c, 0.0, 0, 4), (b, 25.0, 1, 4)]
+
+    again, queries = _get(client, headers, path, {"threshold": 50, "window_days": 7})
+    assert queries == []
+    assert [r["student_id"] for r in again] == [c, b]
+
+    by_class, _ = _get(client, headers, path, {"threshold": 75, "window_days": 7, "class_id": grade1})
+    assert [r["student_id"] for r in by_class] == [b]
+    narrow, _ = _get(client, headers, path, {"threshold": 75, "window_days": 1})
+    assert {r["student_id"]: r["total"] for r in narrow} == {b: 2, c: 2}
+
+    stats, queries = _get(client, headers, "/api/v1/attendance/students/statistics", {"window_days": 7})
+    assert queries == []
+    assert stats["students"] == 3
+    assert stats["by_status"] == {"present": 5, "absent": 6, "late": 1}
+    assert stats["below_threshold"] == 2
+
+    items = [{"student_id": c, "status": "present"}]
+    client.post("/api/v1/attendance/students/mark", headers=headers, json={"attendance_date": today.isoformat(), "items": items})
+    report, queries = _get(client, headers, "/api/v1/reports/attendance/defaulters", {"window_days": 7})
+    assert len(queries) == 1
+    assert {r["student_id"]: r["present"] for r in report} == {b: 1, c: 1}
+    assert all(type(r["attendance_pct"]) is int for r in report)
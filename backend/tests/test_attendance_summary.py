@@ -0,0 +1,115 @@
+import uuid
+from datetime import date
+
+from sqlalchemy import event, select
+
+from app.core.attendance import attendance_status_days
+from app.db.session import SessionLocal, engine
+
+
+def _bootstrap(client):
+    platform = {"X-Tenant-Subdomain": "admin"}
+    login = client.post("/api/v1/auth/login", headers=platform, json={"email": "platform@kuskul.com", "password": "password123"})
+    platform["Authorization"] = f"Bearer {login.json()['access_token']}"
+    suffix = uuid.uuid4().hex[:8]
+    provisioned = client.post(
+        "/api/v1/platform/tenants",
+        headers=platform,
+        json={
+            "name": f"Tenant {suffix}",
+            "subdomain": f"su{suffix}",
+            "admin_email": f"su_{suffix}@example.com",
+            "admin_password": "supersecure",
+            "school_name": f"School {suffix}",
+        },
+    )
+    headers = {"X-Tenant-Subdomain": f"su{suffix}"}
+    login = client.post("/api/v1/auth/login", headers=headers, json={"email": f"su_{suffix}@example.com", "password": "supersecure"})
+    return {**headers, "Authorization": f"Bearer {login.json()['access_token']}", "X-School-Id": provisioned.json()["school_id"]}
+
+
+def _mark(client, headers, day, items):
+    resp = client.post("/api/v1/attendance/students/mark", headers=headers, json={"attendance_date": day, "items": items})
+    assert resp.status_code == 200
+
+
+def _statements(call):
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        return call(), statements
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+
+def test_summary_follows_marks_updates_and_deletes(client):
+    headers = _bootstrap(client)
+    a, b = (client.post("/api/v1/students", headers=headers, json={"first_name": n}).json()["id"] for n in ("Ana", "Ben"))
+    _mark(client, headers, "2025-03-31", [{"student_id": a, "status": "present"}, {"student_id": b, "status": "absent"}])
+    for day in ("2025-04-01", "2025-04-02", "2025-04-03"):
+        _mark(client, headers, day, [{"student_id": a, "status": "present"}, {"student_id": b, "status": "present"}])
+    _mark(client, headers, "2025-04-02", [{"student_id": b, "status": "absent"}])
+
+    april = {"start_date": "2025-04-01", "end_date": "2025-04-30"}
+    rows = client.get("/api/v1/attendance/students/summary", headers=headers, params=april).json()
+    assert {r["student_id"]: r["counts"] for r in rows} == {a: {"present": 3}, b: {"present": 2, "absent": 1}}
+
+    record = next(r for r in client.get("/api/v1/attendance/students/date/2025-04-03", headers=headers).json() if r["student_id"] == b)
+    assert client.put(f"/api/v1/attendance/students/{record['id']}", headers=headers, params={"status": "late"}).status_code == 200
+    record = next(r for r in client.get("/api/v1/attendance/students/date/2025-04-01", headers=headers).json() if r["student_id"] == a)
+    assert client.delete(f"/api/v1/attendance/students/{record['id']}", headers=headers).status_code == 200
+
+    rows = client.get("/api/v1/attendance/students/summary", headers=headers, params=april).json()
+    assert {r["student_id"]: r["counts"] for r in rows} == {a: {"present": 2}, b: {"present": 1, "absent": 1, "late": 1}}
+
+    stats = client.get(
+        "/api/v1/attendance/students/statistics", headers=headers, params={"start_date": "2025-03-31", "end_date": "2025-04-30"}
+    ).json()
+    assert stats["students"] == 2
+    assert stats["by_status"] == {"present": 4, "absent": 2, "late": 1}
+    assert stats["total_records"] == 7
+    assert stats["attendance_pct"] == 57.14
+
+    monthly, statements = _statements(
+        lambda: client.get("/api/v1/reports/attendance/monthly", headers=headers, params={"month": 4, "year": 2025}).json()
+    )
+    assert monthly["students"] == {"present": 3, "absent": 1, "late": 1}
+    assert not any("FROM student_attendance " in s or "FROM student_attendance\n" in s for s in statements)
+
+    daily = client.get("/api/v1/reports/attendance/daily", headers=headers, params={"report_date": "2025-03-31"}).json()
+    assert daily["students"] == {"present": 1, "absent": 1}
+
+
+def test_status_days_combine_months_and_edge_days(client):
+    headers = _bootstrap(client)
+    sid = client.post("/api/v1/students", headers=headers, json={"first_name": "Edge"}).json()["id"]
+    for day in ("2025-01-31", "2025-02-10", "2025-03-01", "2025-03-02"):
+        _mark(client, headers, day, [{"student_id": sid, "status": "present"}])
+    school_id = uuid.UUID(headers["X-School-Id"])
+
+    with SessionLocal() as db:
+        for start, end, expected in [
+            (date(2025, 1, 31), date(2025, 3, 1), 3),
+            (date(2025, 2, 1), date(2025, 2, 28), 1),
+            (date(2025, 2, 11), date(2025, 2, 27), 0),
+            (date(2025, 1, 1), date(2025, 3, 31), 4),
+        ]:
+            days = attendance_status_days(school_id, start, end)
+            assert sum(n for (n,) in db.execute(select(days.c.days))) == expected
+
+
+def test_summary_rows_are_upserted(client):
+    headers = _bootstrap(client)
+    a, b = (client.post("/api/v1/students", headers=headers, json={"first_name": n}).json()["id"] for n in ("Uma", "Ugo"))
+    _mark(client, headers, "2025-06-02", [{"student_id": a, "status": "present"}, {"student_id": b, "status": "excused"}])
+    _, statements = _statements(
+        lambda: _mark(client, headers, "2025-06-03", [{"student_id": a, "status": "present"}, {"student_id": b, "status": "absent"}])
+    )
+    summary_writes = [s for s in statements if "student_attendance_monthly" in s and not s.startswith("SELECT")]
+    assert summary_writes and all("ON CONFLICT" in s or s.startswith("DELETE") for s in summary_writes)
+    _mark(client, headers, "2025-06-02", [{"student_id": b, "status": "absent"}])
+
+    june = {"start_date": "2025-06-01", "end_date": "2025-06-30"}
+    rows = client.get("/api/v1/attendance/students/summary", headers=headers, params=june).json()
+    assert {r["student_id"]: r["counts"] for r in rows} == {a: {"present": 2}, b: {"absent": 2}}
@@ -0,0 +1,57 @@
+import time
+import uuid
+
+from sqlalchemy import func, select
+
+from app.core.audit import AuditSink
+from app.db.session import SessionLocal
+from app.models.audit_log import AuditLog
+
+
+def _count(school_id: uuid.UUID) -> int:
+    db = SessionLocal()
+    try:
+        return db.scalar(select(func.count()).select_from(AuditLog).where(AuditLog.school_id == school_id)) or 0
+    finally:
+        db.close()
+
+
+def test_audit_sink_flushes_on_batch_size_and_drains_on_stop(client):
+    school_id = uuid.uuid4()
+    sink = AuditSink(batch_size=3, flush_interval_seconds=60)
+    sink.start()
+    try:
+        for i in range(3):
+            sink.enqueue(school_id=school_id, action=f"test.batch.{i}", user_id=None)
+        deadline = time.monotonic() + 5
+        while sink.written < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert sink.written == 3
+
+        sink.enqueue(school_id=school_id, action="test.tail", user_id=None, details="x" * 5000)
+    finally:
+        sink.stop()
+    assert not sink.running
+    assert sink.written == 4
+    assert _count(school_id) == 4
+
+
+def test_audit_sink_flushes_on_interval(client):
+    school_id = uuid.uuid4()
+    sink = AuditSink(batch_size=100, flush_interval_seconds=0.05)
+    sink.start()
+    try:
+        sink.enqueue(school_id=school_id, action="test.interval", user_id=None)
+        deadline = time.monotonic() + 5
+        while sink.written < 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert sink.written == 1
+    finally:
+        sink.stop()
+    assert _count(school_id) == 1
+
+
+def test_audit_sink_writes_inline_when_not_running(client):
+    school_id = uuid.uuid4()
+    AuditSink().enqueue(school_id=school_id, action="test.inline", user_id=None)
+    assert _count(school_id) == 1
@@ -0,0 +1,114 @@
+import uuid
+
+from sqlalchemy import event
+
+from app.core.cache_versions import DatabaseVersionStore
+from app.db.session import engine
+
+
+def _bootstrap(client):
+    platform = {"X-Tenant-Subdomain": "admin"}
+    login = client.post("/api/v1/auth/login", headers=platform, json={"email": "platform@kuskul.com", "password": "password123"})
+    platform["Authorization"] = f"Bearer {login.json()['access_token']}"
+    suffix = uuid.uuid4().hex[:8]
+    provisioned = client.post(
+        "/api/v1/platform/tenants",
+        headers=platform,
+        json={
+            "name": f"Tenant {suffix}",
+            "subdomain": f"ac{suffix}",
+            "admin_email": f"ac_{suffix}@example.com",
+            "admin_password": "supersecure",
+            "school_name": f"School {suffix}",
+        },
+    )
+    headers = {"X-Tenant-Subdomain": f"ac{suffix}"}
+    login = client.post("/api/v1/auth/login", headers=headers, json={"email": f"ac_{suffix}@example.com", "password": "supersecure"})
+    headers = {**headers, "Authorization": f"Bearer {login.json()['access_token']}", "X-School-Id": provisioned.json()["school_id"]}
+    return headers, provisioned.json()["admin_user_id"]
+
+
+class _StatementLog:
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.statements.append(statement)
+
+    def count(self, needle: str) -> int:
+        return sum(1 for s in self.statements if needle in s)
+
+
+def test_permission_checks_resolve_principal_once(client):
+    headers, _ = _bootstrap(client)
+    log = _StatementLog()
+    event.listen(engine, "before_cursor_execute", log)
+    try:
+        created = client.post("/api/v1/students", headers=headers, json={"first_name": "Pia", "last_name": "Principal"})
+    finally:
+        event.remove(engine, "before_cursor_execute", log)
+    assert created.status_code == 200
+    assert log.count("FROM memberships") + log.count("JOIN memberships") == 1
+    assert log.count("FROM users") == 1
+
+
+def test_permission_errors_preserved(client):
+    headers, _ = _bootstrap(client)
+    no_school = {k: v for k, v in headers.items() if k != "X-School-Id"}
+    resp = client.get("/api/v1/students", headers=no_school)
+    assert resp.status_code == 403
+    assert resp.json()["detail"] == "X-School-Id header is required for this endpoint"
+
+    resp = client.get("/api/v1/students", headers={**headers, "X-School-Id": "not-a-uuid"})
+    assert resp.json()["detail"] == "Invalid X-School-Id"
+
+    resp = client.get("/api/v1/students", headers={**headers, "X-School-Id": str(uuid.uuid4())})
+    assert resp.json()["detail"] == "Invalid school for tenant"
+
+
+def test_permission_cache_reused_across_requests(client):
+    headers, _ = _bootstrap(client)
+    assert client.get("/api/v1/students", headers=headers).status_code == 200
+    log = _StatementLog()
+    event.listen(engine, "before_cursor_execute", log)
+    try:
+        resp = client.get("/api/v1/students", headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", log)
+    assert resp.status_code == 200
+    assert log.count("JOIN memberships") == 0
+
+
+def test_permission_cache_invalidated_on_role_changes(client):
+    headers, user_id = _bootstrap(client)
+    suffix = uuid.uuid4().hex[:8]
+    admin_perms = ["users:read", "users:write", "roles:read", "roles:write"]
+    role = client.post(
+        "/api/v1/roles",
+        headers=headers,
+        json={"name": f"custom_{suffix}", "permissions": {"allow": admin_perms + ["students:read"]}},
+    )
+    assert role.status_code == 200
+    role_id = role.json()["id"]
+    assert client.get("/api/v1/students", headers=headers).status_code == 200
+
+    moved = client.patch(f"/api/v1/users/{user_id}", headers=headers, json={"role_name": f"custom_{suffix}"})
+    assert moved.status_code == 200
+    assert client.get("/api/v1/students", headers=headers).status_code == 200
+
+    narrowed = client.put(f"/api/v1/roles/{role_id}/permissions", headers=headers, json={"permissions": {"allow": admin_perms}})
+    assert narrowed.status_code == 200
+    denied = client.get("/api/v1/students", headers=headers)
+    assert denied.status_code == 403
+    assert denied.json()["detail"] == "Missing required permission"
+
+
+def test_database_version_store_shares_bumps(client):
+    key = f"test:{uuid.uuid4().hex}"
+    writer = DatabaseVersionStore(poll_interval_seconds=0)
+    reader = DatabaseVersionStore(poll_interval_seconds=60)
+    assert reader.get(key) == 0
+    assert writer.bump(key) == 1
+    assert writer.bump(key) == 2
+    assert reader.get(key) == 0
+    assert DatabaseVersionStore(poll_interval_seconds=60).get(key) == 2
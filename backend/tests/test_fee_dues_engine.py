@@ -0,0 +1,93 @@
+import uuid
+
+from sqlalchemy import event
+
+from app.db.session import engine
+
+
+def _bootstrap(client):
+    platform = {"X-Tenant-Subdomain": "admin"}
+    login = client.post("/api/v1/auth/login", headers=platform, json={"email": "platform@kuskul.com", "password": "password123"})
+    platform["Authorization"] = f"Bearer {login.json()['access_token']}"
+    suffix = uuid.uuid4().hex[:8]
+    provisioned = client.post(
+        "/api/v1/platform/tenants",
+        headers=platform,
+        json={
+            "name": f"Tenant {suffix}",
+            "subdomain": f"fd{suffix}",
+            "admin_email": f"fd_{suffix}@example.com",
+            "admin_password": "supersecure",
+            "school_name": f"School {suffix}",
+        },
+    )
+    headers = {"X-Tenant-Subdomain": f"fd{suffix}"}
+    login = client.post("/api/v1/auth/login", headers=headers, json={"email": f"fd_{suffix}@example.com", "password": "supersecure"})
+    return {**headers, "Authorization": f"Bearer {login.json()['access_token']}", "X-School-Id": provisioned.json()["school_id"]}
+
+
+def _calculate(client, headers, year_id):
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        resp = client.post(f"/api/v1/fee-dues/calculate?academic_year_id={year_id}", headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert resp.status_code == 200
+    return resp.json(), statements
+
+
+def test_dues_are_calculated_set_based(client):
+    headers = _bootstrap(client)
+    year_id = client.post(
+        "/api/v1/academic-years",
+        headers=headers,
+        json={"name": "2024", "start_date": "2024-01-01", "end_date": "2024-12-31", "is_current": True},
+    ).json()["id"]
+    grade1, grade2 = (
+        client.post("/api/v1/classes", headers=headers, json={"name": f"Grade {n}", "numeric_value": n}).json()["id"] for n in (1, 2)
+    )
+    fees = [
+        (grade1, "Tuition", 1000, "2024-02-01"),
+        (grade1, "Lab", 200, None),
+        (grade2, "Tuition", 800, "2999-01-01"),
+    ]
+    for class_id, name, amount, due_date in fees:
+        body = {"academic_year_id": year_id, "class_id": class_id, "name": name, "amount": amount, "due_date": due_date}
+        assert client.post("/api/v1/fee-structures", headers=headers, json=body).status_code == 200
+    a, b, c = (client.post("/api/v1/students", headers=headers, json={"first_name": n}).json()["id"] for n in ("A", "B", "C"))
+    for sid, class_id in ((a, grade1), (b, grade1), (c, grade2)):
+        client.post("/api/v1/enrollments", headers=headers, json={"student_id": sid, "academic_year_id": year_id, "class_id": class_id})
+
+    percent = client.post("/api/v1/discounts", headers=headers, json={"name": "Sibling", "discount_type": "percent", "value": 10}).json()["id"]
+    fixed = client.post("/api/v1/discounts", headers=headers, json={"name": "Merit", "discount_type": "fixed", "value": 50}).json()["id"]
+    for sid, discount_id in ((a, percent), (a, fixed), (c, fixed)):
+        client.post("/api/v1/discounts/apply", headers=headers, json={"student_id": sid, "discount_id": discount_id})
+    payment = {"academic_year_id": year_id, "payment_date": "2024-01-15", "payment_method": "cash"}
+    client.post("/api/v1/fee-payments/collect", headers=headers, json={**payment, "student_id": b, "amount": 1200})
+    refunded = client.post("/api/v1/fee-payments/collect", headers=headers, json={**payment, "student_id": c, "amount": 300}).json()["id"]
+    client.post("/api/v1/fee-payments/collect", headers=headers, json={**payment, "student_id": c, "amount": 100})
+
+    result, statements = _calculate(client, headers, year_id)
+    assert result == {"updated": 3}
+    assert sum(1 for s in statements if s.startswith("INSERT INTO fee_dues")) == 1
+    assert not any(s.startswith("UPDATE fee_dues") for s in statements)
+
+    def dues():
+        rows = client.get(f"/api/v1/fee-dues?academic_year_id={year_id}", headers=headers).json()
+        return {r["student_id"]: (r["total_fee"], r["discount_amount"], r["paid_amount"], r["due_amount"], r["status"]) for r in rows}
+
+    assert dues() == {
+        a: (1200, 170, 0, 1030, "overdue"),
+        b: (1200, 0, 1200, 0, "paid"),
+        c: (800, 50, 400, 350, "partial"),
+    }
+
+    assert client.post(f"/api/v1/fee-payments/refund/{refunded}", headers=headers).status_code == 200
+    result, statements = _calculate(client, headers, year_id)
+    assert result == {"updated": 3}
+    assert sum(1 for s in statements if s.startswith("UPDATE fee_dues")) == 1
+    assert not any(s.startswith("INSERT INTO fee_dues") for s in statements)
+    assert dues()[c] == (800, 50, 100, 650, "partial")
+    assert len(dues()) == 3
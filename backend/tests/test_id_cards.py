@@ -0,0 +1,105 @@
+import uuid
+
+from sqlalchemy import event
+
+from app.core import id_cards
+from app.db.session import engine
+
+
+def _bootstrap(client):
+    platform = {"X-Tenant-Subdomain": "admin"}
+    login = client.post("/api/v1/auth/login", headers=platform, json={"email": "platform@kuskul.com", "password": "password123"})
+    platform["Authorization"] = f"Bearer {login.json()['access_token']}"
+    suffix = uuid.uuid4().hex[:8]
+    provisioned = client.post(
+        "/api/v1/platform/tenants",
+        headers=platform,
+        json={
+            "name": f"Tenant {suffix}",
+            "subdomain": f"ic{suffix}",
+            "admin_email": f"ic_{suffix}@example.com",
+            "admin_password": "supersecure",
+            "school_name": f"School {suffix}",
+        },
+    )
+    headers = {"X-Tenant-Subdomain": f"ic{suffix}"}
+    login = client.post("/api/v1/auth/login", headers=headers, json={"email": f"ic_{suffix}@example.com", "password": "supersecure"})
+    return {**headers, "Authorization": f"Bearer {login.json()['access_token']}", "X-School-Id": provisioned.json()["school_id"]}
+
+
+def _seed(client, headers):
+    year_id = client.post(
+        "/api/v1/academic-years",
+        headers=headers,
+        json={"name": "2025", "start_date": "2025-01-01", "end_date": "2025-12-31", "is_current": True},
+    ).json()["id"]
+    class_id = client.post("/api/v1/classes", headers=headers, json={"name": "Grade 4", "numeric_value": 4}).json()["id"]
+    other_id = client.post("/api/v1/classes", headers=headers, json={"name": "Grade 5", "numeric_value": 5}).json()["id"]
+    sections = {
+        name: client.post("/api/v1/sections", headers=headers, json={"class_id": class_id, "name": name, "capacity": 30}).json()["id"]
+        for name in ("Rose", "Lily")
+    }
+    placements = [("Ana", class_id, "Rose", 1), ("Ben", class_id, "Rose", 2), ("Cy", class_id, "Rose", 3)]
+    placements += [("Dee", class_id, "Lily", 1), ("Eli", class_id, "Lily", 2), ("Fay", other_id, None, 1)]
+    for name, cls, section, roll in placements:
+        student_id = client.post("/api/v1/students", headers=headers, json={"first_name": name}).json()["id"]
+        enrolled = client.post(
+            "/api/v1/enrollments",
+            headers=headers,
+            json={
+                "student_id": student_id,
+                "academic_year_id": year_id,
+                "class_id": cls,
+                "section_id": sections.get(section),
+                "roll_number": roll,
+            },
+        )
+        assert enrolled.status_code == 200
+    return class_id, sections
+
+
+def test_class_id_cards_render_in_one_document(client, monkeypatch):
+    headers = _bootstrap(client)
+    class_id, sections = _seed(client, headers)
+    encoded = []
+    make = id_cards._make_qr_svg
+    monkeypatch.setattr(id_cards, "_make_qr_svg", lambda payload: encoded.append(payload) or make(payload))
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        resp = client.get("/api/v1/students/id-cards", headers=headers, params={"class_id": class_id, "per_page": 2})
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert resp.status_code == 200
+    doc = resp.text
+    assert doc.count('<div class="page">') == 3
+    assert doc.count('<div class="card front">') == 5
+    assert doc.count("<svg") == 5
+    assert "Fay" not in doc
+    assert doc.index("Dee") < doc.index("Eli") and doc.index("Ana") < doc.index("Cy")
+    assert sum(1 for s in statements if "JOIN enrollments" in s) == 1
+    assert sum(1 for s in statements if "FROM sections" in s) == 1
+    assert len(encoded) == 5
+
+    section_only = client.get(
+        "/api/v1/students/id-cards", headers=headers, params={"class_id": class_id, "section_id": sections["Lily"]}
+    )
+    assert section_only.text.count('<div class="card front">') == 2
+    assert len(encoded) == 5
+
+    student_id = client.get("/api/v1/students?search=ben", headers=headers).json()["items"][0]["id"]
+    single = client.get(f"/api/v1/students/{student_id}/id-card", headers=headers).text
+    assert "Grade 4" in single and "Rose" in single and "<svg" in single
+    assert len(encoded) == 5
+
+    missing = client.get("/api/v1/students/id-cards", headers=headers, params={"class_id": str(uuid.uuid4())})
+    assert missing.status_code == 404
+
+
+def test_qr_codes_rendered_in_process_pool_match_serial(monkeypatch):
+    monkeypatch.setattr(id_cards.settings, "id_card_parallel_threshold", 2)
+    payloads = [f"KUSKUL|T|{uuid.uuid4()}" for _ in range(4)]
+    pooled = id_cards.qr_svgs(payloads, workers=2)
+    assert [pooled[p] for p in payloads] == [id_cards._make_qr_svg(p) for p in payloads]
@@ -0,0 +1,139 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import update
+
+from app.core.jobs import JobContext, job_runner
+from app.db.session import SessionLocal
+from app.models.job import Job
+
+
+def _bootstrap(client):
+    platform = {"X-Tenant-Subdomain": "admin"}
+    login = client.post("/api/v1/auth/login", headers=platform, json={"email": "platform@kuskul.com", "password": "password123"})
+    platform["Authorization"] = f"Bearer {login.json()['access_token']}"
+    suffix = uuid.uuid4().hex[:8]
+    provisioned = client.post(
+        "/api/v1/platform/tenants",
+        headers=platform,
+        json={
+            "name": f"Tenant {suffix}",
+            "subdomain": f"jb{suffix}",
+            "admin_email": f"jb_{suffix}@example.com",
+            "admin_password": "supersecure",
+            "school_name": f"School {suffix}",
+        },
+    )
+    headers = {"X-Tenant-Subdomain": f"jb{suffix}"}
+    login = client.post("/api/v1/auth/login", headers=headers, json={"email": f"jb_{suffix}@example.com", "password": "supersecure"})
+    return {**headers, "Authorization": f"Bearer {login.json()['access_token']}", "X-School-Id": provisioned.json()["school_id"]}
+
+
+def test_background_import_runs_as_job(client):
+    headers = _bootstrap(client)
+    body = "first_name,last_name\nAna,One\nBen,Two\n"
+    resp = client.post(
+        "/api/v1/import-export/import/students?background=true",
+        headers=headers,
+        files={"file": ("students.csv", body.encode("utf-8"), "text/csv")},
+    )
+    assert resp.status_code == 202
+    job = resp.json()
+    assert job["kind"] == "import_export.students"
+
+    fetched = client.get(f"/api/v1/jobs/{job['id']}", headers=headers).json()
+    assert fetched["status"] == "succeeded"
+    assert fetched["progress"] == 100
+    assert fetched["result"]["created"] == 2
+    assert len(client.get("/api/v1/students", headers=headers).json()["items"]) == 2
+
+    upload_only = client.post("/api/v1/jobs", headers=headers, json={"kind": "import_export.students"})
+    assert upload_only.status_code == 400
+    unknown = client.post("/api/v1/jobs", headers=headers, json={"kind": "nope"})
+    assert unknown.status_code == 400
+
+
+def test_failed_job_records_error_and_can_be_retried(client):
+    headers = _bootstrap(client)
+    resp = client.post("/api/v1/jobs", headers=headers, json={"kind": "backup.restore", "params": {"backup_id": str(uuid.uuid4())}})
+    assert resp.status_code == 202
+    job = resp.json()
+    assert job["status"] == "failed"
+    assert job["error"] == "Backup not found"
+    assert job["attempts"] == 1
+
+    assert client.post(f"/api/v1/jobs/{job['id']}/cancel", headers=headers).status_code == 409
+    retried = client.post(f"/api/v1/jobs/{job['id']}/retry", headers=headers)
+    assert retried.status_code == 202
+    assert retried.json()["status"] == "failed"
+    assert retried.json()["attempts"] == 1
+
+
+def test_queued_jobs_are_cancelled_or_claimed_by_worker(client, monkeypatch):
+    headers = _bootstrap(client)
+    monkeypatch.setattr(job_runner, "inline_fallback", False)
+
+    def upload(name):
+        files = {"file": ("students.csv", f"first_name\n{name}\n".encode("utf-8"), "text/csv")}
+        return client.post("/api/v1/import-export/import/students?background=true", headers=headers, files=files).json()
+
+    first, second = upload("Kept"), upload("Dropped")
+    assert first["status"] == second["status"] == "queued"
+
+    cancelled = client.post(f"/api/v1/jobs/{second['id']}/cancel", headers=headers)
+    assert cancelled.status_code == 200
+    assert cancelled.json()["status"] == "cancelled"
+
+    assert job_runner.run_pending() == 1
+    done = client.get(f"/api/v1/jobs/{first['id']}", headers=headers).json()
+    assert done["status"] == "succeeded"
+    assert done["attempts"] == 1
+    names = [s["first_name"] for s in client.get("/api/v1/students", headers=headers).json()["items"]]
+    assert names == ["Kept"]
+
+    listed = client.get("/api/v1/jobs?kind=import_export.students", headers=headers).json()
+    assert {j["status"] for j in listed} == {"succeeded", "cancelled"}
+
+
+def test_running_job_stops_at_progress_checkpoint_once_cancelled(client, monkeypatch):
+    headers = _bootstrap(client)
+    reported = []
+    original = JobContext.progress
+
+    def cancel_midway(ctx, percent):
+        reported.append(percent)
+        if len(reported) == 3:
+            ctx.db.execute(update(Job).where(Job.id == ctx.job_id).values(cancel_requested=True))
+        original(ctx, percent)
+
+    monkeypatch.setattr(JobContext, "progress", cancel_midway)
+    job = client.post("/api/v1/jobs", headers=headers, json={"kind": "backup.create", "params": {"notes": "nightly"}}).json()
+    assert job["status"] == "cancelled"
+    assert len(reported) == 3 and reported == sorted(reported)
+    assert client.get("/api/v1/backup/list", headers=headers).json() == []
+
+
+def test_stale_running_jobs_are_reclaimed_or_retried(client, monkeypatch):
+    headers = _bootstrap(client)
+    monkeypatch.setattr(job_runner, "inline_fallback", False)
+    files = {"file": ("students.csv", b"first_name\nLost\n", "text/csv")}
+    job_id = client.post("/api/v1/import-export/import/students?background=true", headers=headers, files=files).json()["id"]
+
+    def crash_while_running():
+        assert job_runner._claim(uuid.UUID(job_id)) is not None
+        with SessionLocal() as db:
+            db.execute(update(Job).where(Job.id == uuid.UUID(job_id)).values(updated_at=datetime.now(timezone.utc) - timedelta(hours=1)))
+            db.commit()
+
+    crash_while_running()
+    monkeypatch.setattr(job_runner, "_next_reclaim", 0.0)
+    assert job_runner.run_pending() == 0
+    reclaimed = client.get(f"/api/v1/jobs/{job_id}", headers=headers).json()
+    assert (reclaimed["status"], reclaimed["error"]) == ("failed", "Worker stopped responding")
+
+    retried = client.post(f"/api/v1/jobs/{job_id}/retry", headers=headers)
+    assert retried.json()["status"] == "queued"
+    crash_while_running()
+    assert client.post(f"/api/v1/jobs/{job_id}/retry", headers=headers).status_code == 202
+    assert job_runner.run_pending() == 1
+    assert client.get(f"/api/v1/jobs/{job_id}", headers=headers).json()["status"] == "succeeded"
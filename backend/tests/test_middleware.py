@@ -0,0 +1,51 @@
+import uuid
+
+from sqlalchemy import select
+
+from app.db.session import SessionLocal
+from app.models.audit_log import AuditLog
+
+
+def _bootstrap(client):
+    platform = {"X-Tenant-Subdomain": "admin"}
+    login = client.post("/api/v1/auth/login", headers=platform, json={"email": "platform@kuskul.com", "password": "password123"})
+    platform["Authorization"] = f"Bearer {login.json()['access_token']}"
+    suffix = uuid.uuid4().hex[:8]
+    provisioned = client.post(
+        "/api/v1/platform/tenants",
+        headers=platform,
+        json={
+            "name": f"Tenant {suffix}",
+            "subdomain": f"mw{suffix}",
+            "admin_email": f"mw_{suffix}@example.com",
+            "admin_password": "supersecure",
+            "school_name": f"School {suffix}",
+        },
+    )
+    headers = {"X-Tenant-Subdomain": f"mw{suffix}"}
+    login = client.post("/api/v1/auth/login", headers=headers, json={"email": f"mw_{suffix}@example.com", "password": "supersecure"})
+    return {**headers, "Authorization": f"Bearer {login.json()['access_token']}", "X-School-Id": provisioned.json()["school_id"]}
+
+
+def test_security_headers_applied(client):
+    resp = client.get("/api/v1/health")
+    assert resp.status_code == 200
+    assert resp.headers["X-Content-Type-Options"] == "nosniff"
+    assert resp.headers["X-Frame-Options"] == "DENY"
+    assert resp.headers["Content-Security-Policy"] == "default-src 'self'"
+    assert "Content-Security-Policy" not in client.get("/docs").headers
+
+
+def test_audit_entry_written_for_mutation(client):
+    headers = _bootstrap(client)
+    created = client.post("/api/v1/students", headers=headers, json={"first_name": "Ada", "last_name": "Audit"})
+    assert created.status_code == 200
+
+    db = SessionLocal()
+    try:
+        actions = db.execute(
+            select(AuditLog.action).where(AuditLog.school_id == uuid.UUID(headers["X-School-Id"]))
+        ).scalars().all()
+    finally:
+        db.close()
+    assert "POST /api/v1/students" in actions
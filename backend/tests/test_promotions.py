@@ -0,0 +1,81 @@
+import uuid
+
+from sqlalchemy import event
+
+from app.db.session import engine
+
+
+def _bootstrap(client):
+    platform = {"X-Tenant-Subdomain": "admin"}
+    login = client.post("/api/v1/auth/login", headers=platform, json={"email": "platform@kuskul.com", "password": "password123"})
+    platform["Authorization"] = f"Bearer {login.json()['access_token']}"
+    suffix = uuid.uuid4().hex[:8]
+    provisioned = client.post(
+        "/api/v1/platform/tenants",
+        headers=platform,
+        json={
+            "name": f"Tenant {suffix}",
+            "subdomain": f"pm{suffix}",
+            "admin_email": f"pm_{suffix}@example.com",
+            "admin_password": "supersecure",
+            "school_name": f"School {suffix}",
+        },
+    )
+    headers = {"X-Tenant-Subdomain": f"pm{suffix}"}
+    login = client.post("/api/v1/auth/login", headers=headers, json={"email": f"pm_{suffix}@example.com", "password": "supersecure"})
+    return {**headers, "Authorization": f"Bearer {login.json()['access_token']}", "X-School-Id": provisioned.json()["school_id"]}
+
+
+def _enroll(client, headers, student_id, year_id, class_id):
+    resp = client.post(
+        "/api/v1/enrollments", headers=headers, json={"student_id": student_id, "academic_year_id": year_id, "class_id": class_id}
+    )
+    assert resp.status_code == 200
+    return resp.json()["id"]
+
+
+def test_promotion_is_set_based_with_dry_run(client):
+    headers = _bootstrap(client)
+    years = [
+        client.post(
+            "/api/v1/academic-years",
+            headers=headers,
+            json={"name": name, "start_date": f"{name}-01-01", "end_date": f"{name}-12-31", "is_current": name == "2024"},
+        ).json()["id"]
+        for name in ("2024", "2025")
+    ]
+    grade1, grade2 = (
+        client.post("/api/v1/classes", headers=headers, json={"name": f"Grade {n}", "numeric_value": n}).json()["id"] for n in (1, 2)
+    )
+    students = [client.post("/api/v1/students", headers=headers, json={"first_name": n}).json()["id"] for n in ("A", "B", "C")]
+    enrollments = [_enroll(client, headers, sid, years[0], grade1) for sid in students]
+    _enroll(client, headers, students[2], years[1], grade2)
+    request = {"enrollment_ids": enrollments, "new_academic_year_id": years[1], "new_class_id": grade2}
+
+    preview = client.post("/api/v1/students/bulk-promote", headers=headers, json={**request, "dry_run": True})
+    assert preview.status_code == 200
+    body = preview.json()
+    assert (body["created"], body["would_create"], body["conflicts"]) == (0, 2, [students[2]])
+    assert [c["conflict"] for c in body["changes"] if c["student_id"] == students[2]] == [True]
+    assert {c["to_class_id"] for c in body["changes"]} == {grade2}
+
+    refused = client.post("/api/v1/students/bulk-promote", headers=headers, json=request)
+    assert refused.status_code == 409
+    assert {e["status"] for e in client.get(f"/api/v1/enrollments?academic_year_id={years[0]}", headers=headers).json()} == {"active"}
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        done = client.post("/api/v1/batch/students/promote", headers=headers, json={**request, "enrollment_ids": enrollments[:2]})
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert done.json() == {"created": 2}
+    assert sum(1 for s in statements if s.startswith("INSERT INTO enrollments")) == 1
+    assert sum(1 for s in statements if s.startswith("UPDATE enrollments")) == 1
+    old = {e["id"]: e["status"] for e in client.get(f"/api/v1/enrollments?academic_year_id={years[0]}", headers=headers).json()}
+    assert [old[e] for e in enrollments] == ["promoted", "promoted", "active"]
+    assert len(client.get(f"/api/v1/enrollments?academic_year_id={years[1]}", headers=headers).json()) == 3
+
+    missing = client.post("/api/v1/students/bulk-promote", headers=headers, json={**request, "enrollment_ids": [str(uuid.uuid4())]})
+    assert missing.status_code == 404
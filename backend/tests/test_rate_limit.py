@@ -0,0 +1,55 @@
+from app.core.rate_limit import LocalRateLimitBackend, RateLimiter, RateLimitRule
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_burst_then_steady_rate():
+    clock = _Clock()
+    limiter = RateLimiter(clock=clock)
+    rule = RateLimitRule(window_seconds=60, max_requests=3)
+
+    assert [limiter.allow(key="ip:api", rule=rule) for _ in range(4)] == [True, True, True, False]
+    clock.now += 19
+    assert limiter.allow(key="ip:api", rule=rule) is False
+    clock.now += 1
+    assert limiter.allow(key="ip:api", rule=rule) is True
+    assert limiter.allow(key="ip:api", rule=rule) is False
+    assert limiter.allow(key="other:api", rule=rule) is True
+
+
+def test_idle_keys_are_evicted_and_size_is_bounded():
+    clock = _Clock()
+    backend = LocalRateLimitBackend(max_keys=100, sweep_interval_seconds=10)
+    limiter = RateLimiter(backend, clock=clock)
+    rule = RateLimitRule(window_seconds=60, max_requests=100)
+
+    for i in range(50):
+        assert limiter.allow(key=f"client-{i}", rule=rule)
+    assert len(backend) == 50
+
+    clock.now += 11
+    limiter.allow(key="fresh", rule=rule)
+    assert len(backend) == 1
+
+    for i in range(500):
+        limiter.allow(key=f"burst-{i}", rule=rule)
+    assert len(backend) <= 100
+
+
+def test_limiters_sharing_a_backend_share_budgets():
+    clock = _Clock()
+    shared = LocalRateLimitBackend()
+    worker_a = RateLimiter(shared, clock=clock)
+    worker_b = RateLimiter(shared, clock=clock)
+    rule = RateLimitRule(window_seconds=60, max_requests=2)
+
+    assert worker_a.allow(key="ip:auth", rule=rule)
+    assert worker_b.allow(key="ip:auth", rule=rule)
+    assert not worker_a.allow(key="ip:auth", rule=rule)
+    assert not worker_b.allow(key="ip:auth", rule=rule)
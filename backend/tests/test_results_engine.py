@@ -0,0 +1,143 @@
+import uuid
+
+from sqlalchemy import event, func, select
+
+from app.db.session import SessionLocal, engine
+from app.models.result import Result
+
+
+def _bootstrap(client):
+    platform = {"X-Tenant-Subdomain": "admin"}
+    login = client.post("/api/v1/auth/login", headers=platform, json={"email": "platform@kuskul.com", "password": "password123"})
+    platform["Authorization"] = f"Bearer {login.json()['access_token']}"
+    suffix = uuid.uuid4().hex[:8]
+    provisioned = client.post(
+        "/api/v1/platform/tenants",
+        headers=platform,
+        json={
+            "name": f"Tenant {suffix}",
+            "subdomain": f"rs{suffix}",
+            "admin_email": f"rs_{suffix}@example.com",
+            "admin_password": "supersecure",
+            "school_name": f"School {suffix}",
+        },
+    )
+    headers = {"X-Tenant-Subdomain": f"rs{suffix}"}
+    login = client.post("/api/v1/auth/login", headers=headers, json={"email": f"rs_{suffix}@example.com", "password": "supersecure"})
+    return {**headers, "Authorization": f"Bearer {login.json()['access_token']}", "X-School-Id": provisioned.json()["school_id"]}
+
+
+def _seed_exam(client, headers, student_count):
+    year_id = client.post(
+        "/api/v1/academic-years",
+        headers=headers,
+        json={"name": "2024", "start_date": "2024-01-01", "end_date": "2024-12-31", "is_current": True},
+    ).json()["id"]
+    class_id = client.post("/api/v1/classes", headers=headers, json={"name": "Grade 6", "numeric_value": 6}).json()["id"]
+    grades = {}
+    for name, low, high in (("A", 80, 100), ("B", 50, 79.99), ("F", 0, 49.99)):
+        grades[name] = client.post(
+            "/api/v1/grades", headers=headers, json={"name": name, "min_percentage": low, "max_percentage": high}
+        ).json()["id"]
+    exam_id = client.post(
+        "/api/v1/exams",
+        headers=headers,
+        json={"academic_year_id": year_id, "name": "Term 1", "exam_type": "term", "start_date": "2024-05-01", "end_date": "2024-05-10"},
+    ).json()["id"]
+    schedule_ids = []
+    for code in ("MTH", "SCI"):
+        subject_id = client.post("/api/v1/subjects", headers=headers, json={"name": code, "code": code}).json()["id"]
+        schedule_ids.append(
+            client.post(
+                "/api/v1/exam-schedules",
+                headers=headers,
+                json={"exam_id": exam_id, "class_id": class_id, "subject_id": subject_id, "exam_date": "2024-05-02", "max_marks": 50},
+            ).json()["id"]
+        )
+    student_ids = [
+        client.post("/api/v1/students", headers=headers, json={"first_name": f"S{i}", "last_name": "Result"}).json()["id"]
+        for i in range(student_count)
+    ]
+    return exam_id, schedule_ids, student_ids, grades
+
+
+def _results(client, headers, exam_id):
+    log = []
+    listener = lambda conn, cursor, statement, *args: log.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        resp = client.get(f"/api/v1/results?exam_id={exam_id}", headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert resp.status_code == 200
+    return {r["student_id"]: r for r in resp.json()}, log
+
+
+def test_results_maintained_on_mark_entry(client):
+    headers = _bootstrap(client)
+    exam_id, schedule_ids, student_ids, grades = _seed_exam(client, headers, 12)
+    for schedule_id, marks in zip(schedule_ids, (45, 20)):
+        items = [{"student_id": sid, "marks_obtained": marks, "is_absent": False} for sid in student_ids]
+        items[-1] = {"student_id": student_ids[-1], "marks_obtained": None, "is_absent": True}
+        assert client.post("/api/v1/marks/enter", headers=headers, json={"exam_schedule_id": schedule_id, "items": items}).status_code == 200
+
+    first, log = _results(client, headers, exam_id)
+    assert len(first) == 12
+    assert first[student_ids[0]]["obtained_marks"] == 65
+    assert first[student_ids[0]]["total_marks"] == 100
+    assert first[student_ids[0]]["grade_id"] == grades["B"]
+    assert first[student_ids[-1]]["obtained_marks"] == 0
+    assert first[student_ids[-1]]["grade_id"] == grades["F"]
+    assert not [s for s in log if s.lstrip().upper().startswith(("INSERT", "UPDATE", "DELETE"))]
+
+    items = [{"student_id": student_ids[0], "marks_obtained": 50, "is_absent": False}]
+    assert client.post("/api/v1/marks/enter", headers=headers, json={"exam_schedule_id": schedule_ids[1], "items": items}).status_code == 200
+    second, _ = _results(client, headers, exam_id)
+    assert second[student_ids[0]]["id"] == first[student_ids[0]]["id"]
+    assert second[student_ids[0]]["obtained_marks"] == 95
+    assert second[student_ids[0]]["grade_id"] == grades["A"]
+
+    with SessionLocal() as db:
+        assert db.scalar(select(func.count()).select_from(Result).where(Result.exam_id == uuid.UUID(exam_id))) == 12
+
+
+def test_recompute_results_backfills(client):
+    headers = _bootstrap(client)
+    exam_id, schedule_ids, student_ids, _ = _seed_exam(client, headers, 3)
+    items = [{"student_id": sid, "marks_obtained": 40, "is_absent": False} for sid in student_ids]
+    assert client.post("/api/v1/marks/enter", headers=headers, json={"exam_schedule_id": schedule_ids[0], "items": items}).status_code == 200
+    with SessionLocal() as db:
+        db.query(Result).filter(Result.exam_id == uuid.UUID(exam_id)).delete()
+        db.commit()
+    assert _results(client, headers, exam_id)[0] == {}
+
+    resp = client.post(f"/api/v1/results/recompute?exam_id={exam_id}", headers=headers)
+    assert resp.status_code == 200
+    assert sorted(r["obtained_marks"] for r in resp.json()) == [40, 40, 40]
+    assert len(_results(client, headers, exam_id)[0]) == 3
+
+
+def test_results_follow_schedule_and_grade_edits(client):
+    headers = _bootstrap(client)
+    exam_id, schedule_ids, student_ids, grades = _seed_exam(client, headers, 2)
+    for schedule_id in schedule_ids:
+        items = [{"student_id": sid, "marks_obtained": 40, "is_absent": False} for sid in student_ids]
+        assert client.post("/api/v1/marks/enter", headers=headers, json={"exam_schedule_id": schedule_id, "items": items}).status_code == 200
+    results, _ = _results(client, headers, exam_id)
+    assert (results[student_ids[0]]["percentage"], results[student_ids[0]]["grade_id"]) == (80.0, grades["A"])
+
+    assert client.put(f"/api/v1/exam-schedules/{schedule_ids[1]}", headers=headers, json={"max_marks": 100}).status_code == 200
+    results, _ = _results(client, headers, exam_id)
+    assert (results[student_ids[0]]["total_marks"], results[student_ids[0]]["grade_id"]) == (150, grades["B"])
+
+    assert client.put(f"/api/v1/grades/{grades['B']}", headers=headers, json={"min_percentage": 55}).status_code == 200
+    results, _ = _results(client, headers, exam_id)
+    assert results[student_ids[0]]["grade_id"] is None
+
+    assert client.delete(f"/api/v1/exam-schedules/{schedule_ids[1]}", headers=headers).status_code == 200
+    results, _ = _results(client, headers, exam_id)
+    assert (results[student_ids[0]]["total_marks"], results[student_ids[0]]["obtained_marks"]) == (50, 40)
+
+    assert client.delete(f"/api/v1/grades/{grades['A']}", headers=headers).status_code == 200
+    results, _ = _results(client, headers, exam_id)
+    assert results[student_ids[0]]["grade_id"] is None
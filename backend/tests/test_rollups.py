@@ -0,0 +1,93 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, event, update
+
+from app.db.session import SessionLocal, engine
+from app.models.school_rollup import SchoolRollup
+
+
+def _bootstrap(client):
+    platform = {"X-Tenant-Subdomain": "admin"}
+    login = client.post("/api/v1/auth/login", headers=platform, json={"email": "platform@kuskul.com", "password": "password123"})
+    platform["Authorization"] = f"Bearer {login.json()['access_token']}"
+    suffix = uuid.uuid4().hex[:8]
+    provisioned = client.post(
+        "/api/v1/platform/tenants",
+        headers=platform,
+        json={
+            "name": f"Tenant {suffix}",
+            "subdomain": f"ru{suffix}",
+            "admin_email": f"ru_{suffix}@example.com",
+            "admin_password": "supersecure",
+            "school_name": f"School {suffix}",
+        },
+    )
+    headers = {"X-Tenant-Subdomain": f"ru{suffix}"}
+    login = client.post("/api/v1/auth/login", headers=headers, json={"email": f"ru_{suffix}@example.com", "password": "supersecure"})
+    return {**headers, "Authorization": f"Bearer {login.json()['access_token']}", "X-School-Id": provisioned.json()["school_id"]}
+
+
+def _dashboard(client, headers):
+    log = []
+    listener = lambda conn, cursor, statement, *args: log.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        resp = client.get("/api/v1/analytics/dashboard/admin", headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert resp.status_code == 200
+    return resp.json(), log
+
+
+def test_dashboard_reads_rollup_kept_current_by_writes(client):
+    headers = _bootstrap(client)
+    first, _ = _dashboard(client, headers)
+    assert first["students"] == 0 and first["staff"] == 0
+
+    student_ids = [
+        client.post("/api/v1/students", headers=headers, json={"first_name": f"R{i}", "last_name": "Rollup"}).json()["id"]
+        for i in range(3)
+    ]
+    imported = client.post(
+        "/api/v1/import-export/import/students",
+        headers=headers,
+        files={"file": ("students.csv", b"first_name,last_name\nIma,Port\nIvo,Port\n", "text/csv")},
+    )
+    assert imported.json()["created"] == 2
+    assert client.delete(f"/api/v1/students/{student_ids[0]}", headers=headers).status_code == 200
+
+    data, log = _dashboard(client, headers)
+    assert data["students"] == 4
+    assert data["staff"] == 0
+    assert data["my_unread_notifications"] == 0
+    assert not [s for s in log if "FROM students" in s or "FROM staff" in s or "FROM memberships" in s]
+
+
+def test_dashboard_reads_never_write_and_jobs_reconcile(client):
+    headers = _bootstrap(client)
+    school_id = uuid.UUID(headers["X-School-Id"])
+    with SessionLocal() as db:
+        db.execute(delete(SchoolRollup).where(SchoolRollup.school_id == school_id))
+        db.commit()
+    client.post("/api/v1/students", headers=headers, json={"first_name": "Sam", "last_name": "Stale"})
+
+    data, log = _dashboard(client, headers)
+    assert data["students"] == 1
+    assert not [s for s in log if s.startswith(("INSERT", "UPDATE", "DELETE"))]
+
+    with SessionLocal() as db:
+        db.execute(
+            update(SchoolRollup)
+            .where(SchoolRollup.school_id == school_id)
+            .values(student_count=99, refreshed_at=datetime.now(timezone.utc) - timedelta(days=1))
+        )
+        db.commit()
+    data, log = _dashboard(client, headers)
+    assert data["students"] == 99
+    assert not [s for s in log if s.startswith(("INSERT", "UPDATE", "DELETE"))]
+
+    job = client.post("/api/v1/jobs", headers=headers, json={"kind": "analytics.refresh_rollup"})
+    assert job.status_code == 202
+    assert client.get(f"/api/v1/jobs/{job.json()['id']}", headers=headers).json()["status"] == "succeeded"
+    assert _dashboard(client, headers)[0]["students"] == 1
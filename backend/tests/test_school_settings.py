@@ -0,0 +1,62 @@
+import json
+import uuid
+
+from sqlalchemy import event
+
+from app.db.session import engine
+
+
+def _bootstrap(client):
+    platform = {"X-Tenant-Subdomain": "admin"}
+    login = client.post("/api/v1/auth/login", headers=platform, json={"email": "platform@kuskul.com", "password": "password123"})
+    platform["Authorization"] = f"Bearer {login.json()['access_token']}"
+    suffix = uuid.uuid4().hex[:8]
+    provisioned = client.post(
+        "/api/v1/platform/tenants",
+        headers=platform,
+        json={
+            "name": f"Tenant {suffix}",
+            "subdomain": f"ss{suffix}",
+            "admin_email": f"ss_{suffix}@example.com",
+            "admin_password": "supersecure",
+            "school_name": f"School {suffix}",
+        },
+    )
+    headers = {"X-Tenant-Subdomain": f"ss{suffix}"}
+    login = client.post("/api/v1/auth/login", headers=headers, json={"email": f"ss_{suffix}@example.com", "password": "supersecure"})
+    return {**headers, "Authorization": f"Bearer {login.json()['access_token']}", "X-School-Id": provisioned.json()["school_id"]}
+
+
+def _settings_reads(client, headers, payload):
+    statements: list[str] = []
+
+    def log(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", log)
+    try:
+        resp = client.post("/api/v1/students", headers=headers, json=payload)
+    finally:
+        event.remove(engine, "before_cursor_execute", log)
+    assert resp.status_code == 200
+    return resp.json(), sum(1 for s in statements if "FROM settings" in s)
+
+
+def test_student_settings_cached_until_updated(client):
+    headers = _bootstrap(client)
+    config = {"admission_no_prefix": "ADM", "admission_no_start_from": 1, "default_fee_category": "scholar"}
+    assert client.put("/api/v1/settings/students.settings", headers=headers, json={"value": json.dumps(config)}).status_code == 200
+
+    first, reads = _settings_reads(client, headers, {"first_name": "One"})
+    assert (first["admission_no"], first["fee_category"], reads) == ("ADM1", "scholar", 1)
+    second, reads = _settings_reads(client, headers, {"first_name": "Two"})
+    assert (second["admission_no"], reads) == ("ADM2", 0)
+
+    config = {"admission_no_prefix": "NEW", "admission_no_start_from": 50}
+    assert client.put("/api/v1/settings/students.settings", headers=headers, json={"value": json.dumps(config)}).status_code == 200
+    third, reads = _settings_reads(client, headers, {"first_name": "Three"})
+    assert (third["admission_no"], third["fee_category"], reads) == ("NEW50", "general", 1)
+
+    assert client.put("/api/v1/settings/students.settings", headers=headers, json={"value": "{not json"}).status_code == 200
+    fourth, _ = _settings_reads(client, headers, {"first_name": "Four"})
+    assert fourth["admission_no"] == "STU1001"
@@ -0,0 +1,77 @@
+import uuid
+
+
+def _bootstrap(client):
+    platform = {"X-Tenant-Subdomain": "admin"}
+    login = client.post("/api/v1/auth/login", headers=platform, json={"email": "platform@kuskul.com", "password": "password123"})
+    platform["Authorization"] = f"Bearer {login.json()['access_token']}"
+    suffix = uuid.uuid4().hex[:8]
+    provisioned = client.post(
+        "/api/v1/platform/tenants",
+        headers=platform,
+        json={
+            "name": f"Tenant {suffix}",
+            "subdomain": f"sr{suffix}",
+            "admin_email": f"sr_{suffix}@example.com",
+            "admin_password": "supersecure",
+            "school_name": f"School {suffix}",
+        },
+    )
+    headers = {"X-Tenant-Subdomain": f"sr{suffix}"}
+    login = client.post("/api/v1/auth/login", headers=headers, json={"email": f"sr_{suffix}@example.com", "password": "supersecure"})
+    return {**headers, "Authorization": f"Bearer {login.json()['access_token']}", "X-School-Id": provisioned.json()["school_id"]}
+
+
+def _names(resp, key="first_name"):
+    assert resp.status_code == 200
+    return [item[key] for item in resp.json()["items"]]
+
+
+def test_student_search_matches_word_prefixes_and_follows_edits(client):
+    headers = _bootstrap(client)
+    body = "first_name,last_name,admission_no\nAnna,Smith,A-100\nÁnnika,Jones,A-200\nBob,Annan,A-300\nZed,Quinn,A-400\n"
+    files = {"file": ("students.csv", body.encode("utf-8"), "text/csv")}
+    assert client.post("/api/v1/students/bulk-import", headers=headers, files=files).json()["created"] == 4
+
+    assert set(_names(client.get("/api/v1/students?search=ann", headers=headers))) == {"Anna", "Ánnika", "Bob"}
+    assert _names(client.get("/api/v1/students?search=annika", headers=headers)) == ["Ánnika"]
+    assert _names(client.get("/api/v1/students?search=smi%20an", headers=headers)) == ["Anna"]
+    assert _names(client.get("/api/v1/students?search=200", headers=headers)) == ["Ánnika"]
+
+    zed = next(s for s in client.get("/api/v1/students", headers=headers).json()["items"] if s["first_name"] == "Zed")
+    assert client.put(f"/api/v1/students/{zed['id']}", headers=headers, json={"first_name": "Zeta"}).status_code == 200
+    assert _names(client.get("/api/v1/students?search=zed", headers=headers)) == []
+    assert _names(client.get("/api/v1/students?search=zet", headers=headers)) == ["Zeta"]
+    assert client.delete(f"/api/v1/students/{zed['id']}", headers=headers).status_code == 200
+    assert client.get("/api/v1/students?search=zet", headers=headers).json()["total"] == 0
+
+
+def test_guardian_and_library_search(client):
+    headers = _bootstrap(client)
+    for name, phone in (("Maria Lopez", "01711-223344"), ("Mario Rossi", "01822-000000")):
+        assert client.post("/api/v1/guardians", headers=headers, json={"full_name": name, "phone": phone}).status_code == 200
+    assert _names(client.get("/api/v1/guardians?search=lop", headers=headers), "full_name") == ["Maria Lopez"]
+    assert _names(client.get("/api/v1/guardians?search=0171", headers=headers), "full_name") == ["Maria Lopez"]
+    assert _names(client.get("/api/v1/guardians?search=mari", headers=headers), "full_name") == ["Maria Lopez", "Mario Rossi"]
+
+    for title, author in (("Deep Learning", "Goodfellow"), ("Learning Python", "Lutz"), ("Dune", "Herbert")):
+        assert client.post("/api/v1/library/books", headers=headers, json={"title": title, "author": author}).status_code == 200
+    found = client.get("/api/v1/library/books/search?query=learn", headers=headers).json()
+    assert {b["title"] for b in found} == {"Deep Learning", "Learning Python"}
+    assert _names(client.get("/api/v1/library/books?search=herb", headers=headers), "title") == ["Dune"]
+
+
+def test_search_keeps_substring_matches(client):
+    headers = _bootstrap(client)
+    body = "first_name,last_name,admission_no\nJohn,Doe,STU1001\nJane,Roe,STU2002\n"
+    files = {"file": ("students.csv", body.encode("utf-8"), "text/csv")}
+    assert client.post("/api/v1/students/bulk-import", headers=headers, files=files).json()["created"] == 2
+    assert _names(client.get("/api/v1/students?search=1001", headers=headers)) == ["John"]
+    assert _names(client.get("/api/v1/students?search=ohn", headers=headers)) == ["John"]
+    assert _names(client.get("/api/v1/students?search=stu", headers=headers)) == ["Jane", "John"]
+
+    for name, email in (("Maria Lopez", "maria.lopez@example.com"), ("Mario Rossi", "m.rossi@school.org")):
+        assert client.post("/api/v1/staff", headers=headers, json={"full_name": name, "email": email}).status_code == 200
+    assert _names(client.get("/api/v1/staff?search=lopez@exa", headers=headers), "full_name") == ["Maria Lopez"]
+    assert _names(client.get("/api/v1/staff?search=school.org", headers=headers), "full_name") == ["Mario Rossi"]
+    assert _names(client.get("/api/v1/staff?search=ossi", headers=headers), "full_name") == ["Mario Rossi"]
@@ -0,0 +1,70 @@
+import csv
+import io
+import uuid
+
+
+def _bootstrap(client):
+    platform = {"X-Tenant-Subdomain": "admin"}
+    login = client.post("/api/v1/auth/login", headers=platform, json={"email": "platform@kuskul.com", "password": "password123"})
+    platform["Authorization"] = f"Bearer {login.json()['access_token']}"
+    suffix = uuid.uuid4().hex[:8]
+    provisioned = client.post(
+        "/api/v1/platform/tenants",
+        headers=platform,
+        json={
+            "name": f"Tenant {suffix}",
+            "subdomain": f"si{suffix}",
+            "admin_email": f"si_{suffix}@example.com",
+            "admin_password": "supersecure",
+            "school_name": f"School {suffix}",
+        },
+    )
+    headers = {"X-Tenant-Subdomain": f"si{suffix}"}
+    login = client.post("/api/v1/auth/login", headers=headers, json={"email": f"si_{suffix}@example.com", "password": "supersecure"})
+    return {**headers, "Authorization": f"Bearer {login.json()['access_token']}", "X-School-Id": provisioned.json()["school_id"]}
+
+
+def _upload(client, headers, path, text):
+    return client.post(path, headers=headers, files={"file": ("students.csv", text.encode("utf-8"), "text/csv")})
+
+
+def test_bulk_import_reports_bad_rows_and_keeps_good_ones(client):
+    headers = _bootstrap(client)
+    existing = client.post("/api/v1/students", headers=headers, json={"first_name": "Old", "admission_no": "ADM-1"})
+    assert existing.status_code == 200
+
+    body = "\n".join(
+        [
+            "first_name,last_name,admission_no,date_of_birth",
+            "Ana,One,,2014-02-03",
+            "Ben,Two,ADM-1,",
+            "Cy,Three,,03/02/2014",
+            ",Nobody,,",
+            "Dee,Four,ADM-9,",
+            "Eve,Five,ADM-9,",
+        ]
+    )
+    resp = _upload(client, headers, "/api/v1/students/bulk-import", body)
+    assert resp.status_code == 200
+    report = resp.json()
+    assert report["created"] == 2
+    assert report["skipped"] == 1
+    assert report["error_count"] == 3
+    assert [(e["row"], e["field"]) for e in report["errors"]] == [(3, "admission_no"), (4, "date_of_birth"), (7, "admission_no")]
+
+    export = client.get("/api/v1/students/export", headers=headers)
+    rows = {r["first_name"]: r for r in csv.DictReader(io.StringIO(export.text))}
+    assert set(rows) == {"Old", "Ana", "Dee"}
+    assert rows["Ana"]["admission_no"].startswith("STU")
+    assert rows["Ana"]["date_of_birth"] == "2014-02-03"
+
+
+def test_import_export_import_uses_same_engine(client):
+    headers = _bootstrap(client)
+    body = "firstName,lastName\n" + "".join(f"N{i},Camel\n" for i in range(25))
+    resp = _upload(client, headers, "/api/v1/import-export/import/students", body)
+    assert resp.status_code == 200
+    assert resp.json()["created"] == 25
+    export = client.get("/api/v1/import-export/export/students", headers=headers)
+    numbers = [r["admission_no"] for r in csv.DictReader(io.StringIO(export.text))]
+    assert len(set(numbers)) == 25
@@ -0,0 +1,97 @@
+import re
+import uuid
+
+from sqlalchemy import event
+
+from app.db.session import engine
+
+
+def _bootstrap(client):
+    platform = {"X-Tenant-Subdomain": "admin"}
+    login = client.post("/api/v1/auth/login", headers=platform, json={"email": "platform@kuskul.com", "password": "password123"})
+    platform["Authorization"] = f"Bearer {login.json()['access_token']}"
+    suffix = uuid.uuid4().hex[:8]
+    provisioned = client.post(
+        "/api/v1/platform/tenants",
+        headers=platform,
+        json={
+            "name": f"Tenant {suffix}",
+            "subdomain": f"ov{suffix}",
+            "admin_email": f"ov_{suffix}@example.com",
+            "admin_password": "supersecure",
+            "school_name": f"School {suffix}",
+        },
+    )
+    headers = {"X-Tenant-Subdomain": f"ov{suffix}"}
+    login = client.post("/api/v1/auth/login", headers=headers, json={"email": f"ov_{suffix}@example.com", "password": "supersecure"})
+    return {**headers, "Authorization": f"Bearer {login.json()['access_token']}", "X-School-Id": provisioned.json()["school_id"]}
+
+
+def _seed(client, headers):
+    year_id = client.post(
+        "/api/v1/academic-years",
+        headers=headers,
+        json={"name": "2025", "start_date": "2025-01-01", "end_date": "2025-12-31", "is_current": True},
+    ).json()["id"]
+    class_id = client.post("/api/v1/classes", headers=headers, json={"name": "Grade 3", "numeric_value": 3}).json()["id"]
+    student_id = client.post("/api/v1/students", headers=headers, json={"first_name": "Olga"}).json()["id"]
+    enrolled = client.post(
+        "/api/v1/enrollments", headers=headers, json={"student_id": student_id, "academic_year_id": year_id, "class_id": class_id}
+    )
+    assert enrolled.status_code == 200
+    guardian_id = client.post("/api/v1/guardians", headers=headers, json={"full_name": "Oleg", "phone": "0100"}).json()["id"]
+    linked = client.post(
+        f"/api/v1/students/{student_id}/guardians",
+        headers=headers,
+        json={"guardian_id": guardian_id, "relation": "father", "is_primary": True},
+    )
+    assert linked.status_code == 200
+    for day, status in (("2025-03-02", "present"), ("2025-03-03", "absent"), ("2025-03-04", "present")):
+        marked = client.post(
+            "/api/v1/attendance/students/mark",
+            headers=headers,
+            json={"attendance_date": day, "class_id": class_id, "items": [{"student_id": student_id, "status": status}]},
+        )
+        assert marked.status_code == 200
+    files = {"file": ("birth.pdf", b"%PDF-1.4", "application/pdf")}
+    assert client.post(f"/api/v1/students/{student_id}/documents", headers=headers, files=files).status_code == 200
+    return student_id
+
+
+def test_overview_returns_every_section_in_one_request(client):
+    headers = _bootstrap(client)
+    student_id = _seed(client, headers)
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        resp = client.get(f"/api/v1/students/{student_id}/overview", headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["student"]["first_name"] == "Olga"
+    assert [(g["full_name"], g["relation"]) for g in body["guardians"]] == [("Oleg", "father")]
+    assert body["attendance"] == {"present": 2, "absent": 1, "total": 3}
+    assert [p["class_name"] for p in body["promotions"]] == ["Grade 3"]
+    assert [d["filename"] for d in body["documents"]] == ["birth.pdf"]
+    assert body["results"] == body["discipline"] == body["timetable"] == []
+    assert sum(1 for s in statements if "FROM students" in s) == 1
+    assert not any(re.search(r"documents\.content\b", s) for s in statements)
+
+    separate = client.get(f"/api/v1/students/{student_id}/attendance/summary?end_date=2025-03-03", headers=headers).json()
+    assert separate == {"present": 1, "absent": 1, "total": 2}
+
+
+def test_overview_include_selects_sections(client):
+    headers = _bootstrap(client)
+    student_id = client.post("/api/v1/students", headers=headers, json={"first_name": "Ina"}).json()["id"]
+    picked = client.get(f"/api/v1/students/{student_id}/overview?include=results, attendance", headers=headers).json()
+    assert set(picked) == {"student", "results", "attendance"}
+    assert picked["attendance"] == {"total": 0}
+
+    bad = client.get(f"/api/v1/students/{student_id}/overview?include=results,grades", headers=headers)
+    assert bad.status_code == 400
+    assert bad.json()["detail"] == "Unknown include: grades"
+    assert client.get(f"/api/v1/students/{uuid.uuid4()}/overview", headers=headers).status_code == 404
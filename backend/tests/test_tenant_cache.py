@@ -0,0 +1,66 @@
+import uuid
+
+from app.core.cache import MISSING, TTLCache
+
+
+def _platform_headers(client):
+    headers = {"X-Tenant-Subdomain": "admin"}
+    login = client.post("/api/v1/auth/login", headers=headers, json={"email": "platform@kuskul.com", "password": "password123"})
+    assert login.status_code == 200
+    return {**headers, "Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+def test_ttl_cache_evicts_oldest_and_expires():
+    cache = TTLCache(ttl_seconds=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    cache.set("d", None, ttl_seconds=0)
+    assert cache.get("d") is MISSING
+    assert len(cache) <= 2
+
+
+def test_tenant_status_change_invalidates_cached_lookup(client):
+    platform = _platform_headers(client)
+    suffix = uuid.uuid4().hex[:8]
+    subdomain = f"tc{suffix}"
+    tenant_headers = {"X-Tenant-Subdomain": subdomain}
+
+    unknown = client.get("/api/v1/schools", headers=tenant_headers)
+    assert unknown.status_code == 403
+
+    provisioned = client.post(
+        "/api/v1/platform/tenants",
+        headers=platform,
+        json={
+            "name": f"Tenant {suffix}",
+            "subdomain": subdomain,
+            "admin_email": f"a{suffix}@example.com",
+            "admin_password": "supersecure",
+            "school_name": f"School {suffix}",
+        },
+    )
+    assert provisioned.status_code == 200
+    tenant_id = provisioned.json()["tenant"]["id"]
+
+    resolved = client.get("/api/v1/schools", headers=tenant_headers)
+    assert resolved.status_code == 401
+
+    login = client.post("/api/v1/auth/login", headers=tenant_headers, json={"email": f"a{suffix}@example.com", "password": "supersecure"})
+    assert login.status_code == 200
+
+    suspended = client.patch(f"/api/v1/platform/tenants/{tenant_id}/status", headers=platform, json={"status": "inactive"})
+    assert suspended.status_code == 200
+
+    blocked = client.get("/api/v1/auth/me", headers=tenant_headers)
+    assert blocked.status_code == 403
+    blocked_by_id = client.get("/api/v1/auth/me", headers={"X-Tenant-ID": tenant_id})
+    assert blocked_by_id.status_code == 403
+
+    reactivated = client.patch(f"/api/v1/platform/tenants/{tenant_id}/status", headers=platform, json={"status": "active"})
+    assert reactivated.status_code == 200
+    login = client.post("/api/v1/auth/login", headers=tenant_headers, json={"email": f"a{suffix}@example.com", "password": "supersecure"})
+    assert login.status_code == 200